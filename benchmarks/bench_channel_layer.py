@@ -0,0 +1,81 @@
+"""
+Fan-out latency benchmark: DatabaseChannelLayer against InMemoryChannelLayer.
+
+Adds MEMBERS receiver channels to one group, then group_sends MESSAGES
+messages one at a time and measures how long it takes until every member
+has received each one. Runs against a throwaway test database; with
+DATABASE_URL pointing at PostgreSQL the LISTEN/NOTIFY path is measured,
+otherwise SQLite polling.
+
+    python benchmarks/bench_channel_layer.py [--members 50] [--messages 100]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'skillswap_project.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from channels.layers import InMemoryChannelLayer  # noqa: E402
+from django.test.utils import setup_test_environment, teardown_test_environment  # noqa: E402
+from django.test.utils import setup_databases, teardown_databases  # noqa: E402
+
+from core.channel_layers import DatabaseChannelLayer  # noqa: E402
+
+
+async def fan_out(layer, members, messages):
+    channels = [await layer.new_channel() for _ in range(members)]
+    for channel in channels:
+        await layer.group_add('bench', channel)
+
+    latencies = []
+    for i in range(messages):
+        started = time.perf_counter()
+        receivers = [asyncio.create_task(layer.receive(channel)) for channel in channels]
+        await layer.group_send('bench', {'type': 'bench.message', 'n': i})
+        received = await asyncio.gather(*receivers)
+        latencies.append(time.perf_counter() - started)
+        assert all(message['n'] == i for message in received)
+
+    await layer.flush()
+    await layer.close()
+    return sorted(latencies)
+
+
+def report(name, latencies, members):
+    total = sum(latencies)
+    print(
+        f'{name:>10}: p50={statistics.median(latencies) * 1000:.1f}ms '
+        f'p95={latencies[int(len(latencies) * 0.95) - 1] * 1000:.1f}ms '
+        f'max={latencies[-1] * 1000:.1f}ms '
+        f'({len(latencies) * members / total:.0f} deliveries/s)'
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--members', type=int, default=50)
+    parser.add_argument('--messages', type=int, default=100)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False)
+    try:
+        for name, layer in [('in-memory', InMemoryChannelLayer()), ('database', DatabaseChannelLayer())]:
+            latencies = asyncio.run(fan_out(layer, args.members, args.messages))
+            report(name, latencies, args.members)
+    finally:
+        teardown_databases(old_config, verbosity=0)
+        teardown_test_environment()
+
+
+if __name__ == '__main__':
+    main()
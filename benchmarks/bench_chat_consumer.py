@@ -0,0 +1,110 @@
+"""
+Throughput benchmark for ChatConsumer's persisting message path.
+
+Opens ROOMS rooms with two WebsocketCommunicator clients each, has every
+sender fire MESSAGES messages as fast as acks come back, and reports
+messages/second plus ack latency percentiles. Runs against a throwaway test
+database, so it never touches real data.
+
+    python benchmarks/bench_chat_consumer.py [--rooms 20] [--messages 100]
+
+channels.testing imports daphne, so install it alongside the requirements.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'skillswap_project.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from channels.db import database_sync_to_async  # noqa: E402
+from channels.routing import URLRouter  # noqa: E402
+from channels.testing import WebsocketCommunicator  # noqa: E402
+from django.contrib.auth.models import User  # noqa: E402
+from django.test.utils import setup_test_environment, teardown_test_environment  # noqa: E402
+from django.test.utils import setup_databases, teardown_databases  # noqa: E402
+
+from core.models import Message  # noqa: E402
+from core.routing import websocket_urlpatterns  # noqa: E402
+
+
+def make_users(rooms):
+    pairs = []
+    for i in range(rooms):
+        a = User.objects.create(username=f'bench_a{i}')
+        b = User.objects.create(username=f'bench_b{i}')
+        pairs.append((a, b))
+    return pairs
+
+
+async def connect(app, user, room):
+    communicator = WebsocketCommunicator(app, f'/ws/chat/{room}/')
+    communicator.scope['user'] = user
+    connected, _ = await communicator.connect()
+    assert connected, f'{user.username} could not join {room}'
+    return communicator
+
+
+async def run_room(app, sender, receiver, messages, latencies):
+    room = f'chat_{min(sender.id, receiver.id)}_{max(sender.id, receiver.id)}'
+    tx = await connect(app, sender, room)
+    rx = await connect(app, receiver, room)
+    for i in range(messages):
+        started = time.perf_counter()
+        await tx.send_json_to({'message': f'bench {i}', 'client_id': str(i)})
+        while True:
+            reply = await tx.receive_json_from(timeout=10)
+            if reply.get('type') == 'ack':
+                break
+        latencies.append(time.perf_counter() - started)
+    # Drain the receiver so every broadcast is accounted for
+    for _ in range(messages):
+        await rx.receive_json_from(timeout=10)
+    await tx.disconnect()
+    await rx.disconnect()
+
+
+async def bench(rooms, messages):
+    app = URLRouter(websocket_urlpatterns)
+    pairs = await database_sync_to_async(make_users)(rooms)
+    latencies = []
+    started = time.perf_counter()
+    await asyncio.gather(*(run_room(app, a, b, messages, latencies) for a, b in pairs))
+    elapsed = time.perf_counter() - started
+    stored = await database_sync_to_async(Message.objects.count)()
+    return elapsed, stored, sorted(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rooms', type=int, default=20)
+    parser.add_argument('--messages', type=int, default=100)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False)
+    try:
+        elapsed, stored, latencies = asyncio.run(bench(args.rooms, args.messages))
+    finally:
+        teardown_databases(old_config, verbosity=0)
+        teardown_test_environment()
+
+    total = args.rooms * args.messages
+    print(f'{total} messages in {elapsed:.2f}s -> {total / elapsed:.0f} msg/s ({stored} rows stored)')
+    print(
+        f'ack latency p50={statistics.median(latencies) * 1000:.1f}ms '
+        f'p95={latencies[int(len(latencies) * 0.95) - 1] * 1000:.1f}ms '
+        f'max={latencies[-1] * 1000:.1f}ms'
+    )
+
+
+if __name__ == '__main__':
+    main()
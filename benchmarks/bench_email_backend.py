@@ -0,0 +1,148 @@
+"""
+End-to-end benchmark for QueuedEmailBackend against a stand-in SMTP server.
+
+Starts a tiny in-process SMTP server (optionally slow to greet, to mimic a
+TLS handshake, and optionally answering 451 to every Nth message), then
+sends MESSAGES emails two ways:
+
+* the old path: Django's SMTP backend with one connection per message
+* QueuedEmailBackend: enqueue in the "request", deliver with run_worker
+
+and reports request-side time, delivery time and SMTP connections opened.
+Runs against a throwaway test database.
+
+    python benchmarks/bench_email_backend.py [--messages 200] [--handshake-ms 50] [--fail-every 0]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'skillswap_project.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.mail import get_connection, send_mail  # noqa: E402
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment  # noqa: E402
+from django.test.utils import setup_databases, teardown_databases  # noqa: E402
+
+from core import jobs  # noqa: E402
+from core.models import Job  # noqa: E402
+
+
+class StubSMTPServer:
+    """Just enough SMTP for smtplib: counts connections and accepted messages."""
+
+    def __init__(self, handshake=0.0, fail_every=0):
+        self.handshake = handshake
+        self.fail_every = fail_every
+        self.connections = 0
+        self.data_commands = 0
+        self.delivered = 0
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        await asyncio.sleep(self.handshake)
+        writer.write(b'220 stub ESMTP\r\n')
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            command = line[:4].upper()
+            if command == b'EHLO':
+                writer.write(b'250-stub\r\n250 8BITMIME\r\n')
+            elif command == b'DATA':
+                writer.write(b'354 End data with <CR><LF>.<CR><LF>\r\n')
+                await writer.drain()
+                while (await reader.readline()) not in (b'.\r\n', b''):
+                    pass
+                self.data_commands += 1
+                if self.fail_every and self.data_commands % self.fail_every == 0:
+                    writer.write(b'451 Try again later\r\n')
+                else:
+                    self.delivered += 1
+                    writer.write(b'250 OK\r\n')
+            elif command == b'QUIT':
+                writer.write(b'221 Bye\r\n')
+                await writer.drain()
+                break
+            else:  # HELO, MAIL, RCPT, RSET, NOOP
+                writer.write(b'250 OK\r\n')
+            await writer.drain()
+        writer.close()
+
+    def start(self):
+        loop = asyncio.new_event_loop()
+        server = loop.run_until_complete(asyncio.start_server(self.handle, '127.0.0.1', 0))
+        threading.Thread(target=loop.run_forever, daemon=True).start()
+        return server.sockets[0].getsockname()[1]
+
+    def reset(self):
+        self.connections = self.data_commands = self.delivered = 0
+
+
+def send_all(count, connection=None):
+    for i in range(count):
+        send_mail(f'Reminder {i}', 'Your session starts soon.', 'bench@example.com',
+                  [f'user{i}@example.com'], connection=connection)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--messages', type=int, default=200)
+    parser.add_argument('--handshake-ms', type=float, default=50)
+    parser.add_argument('--fail-every', type=int, default=0)
+    args = parser.parse_args()
+
+    stub = StubSMTPServer(args.handshake_ms / 1000, args.fail_every)
+    port = stub.start()
+
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False)
+    smtp_settings = override_settings(
+        EMAIL_HOST='127.0.0.1', EMAIL_PORT=port, EMAIL_USE_SSL=False, EMAIL_USE_TLS=False,
+        EMAIL_HOST_USER='', EMAIL_HOST_PASSWORD='', EMAIL_MAX_PER_MINUTE=0,
+        EMAIL_BACKEND='core.mail.QueuedEmailBackend',
+    )
+    smtp_settings.enable()
+    jobs.BACKOFF_BASE = 0  # retry requeued batches immediately
+    try:
+        started = time.perf_counter()
+        failed = 0
+        for i in range(args.messages):
+            # One connection per message, as the old synchronous path did
+            try:
+                send_all(1, get_connection('django.core.mail.backends.smtp.EmailBackend'))
+            except Exception:
+                failed += 1
+        direct = time.perf_counter() - started
+        print(f'per-message SMTP: {args.messages} sent in {direct:.2f}s, '
+              f'{stub.connections} connections, {stub.delivered} delivered, {failed} failed')
+
+        stub.reset()
+        started = time.perf_counter()
+        send_all(args.messages)
+        queued = time.perf_counter() - started
+        started = time.perf_counter()
+        # One job thread: the in-memory SQLite test database doesn't wait on table locks
+        worker = jobs.Worker(concurrency=1, poll_interval=0.01)
+        while Job.objects.filter(status='queued').exists():
+            worker.run(burst=True)
+        delivered = time.perf_counter() - started
+        print(f'queued backend:   enqueued in {queued:.2f}s, delivered in {delivered:.2f}s, '
+              f'{stub.connections} connections, {stub.delivered} delivered, '
+              f'{stub.data_commands - stub.delivered} transient failures retried')
+    finally:
+        smtp_settings.disable()
+        teardown_databases(old_config, verbosity=0)
+        teardown_test_environment()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""
+Free-slot search benchmark: bitmap intersection against a per-slot scan.
+
+Creates USERS users with random weekly availability and MEETINGS meetings
+each over the next month, then finds the first common one-hour slots for
+the whole group with core.availability.free_slots and with a naive loop
+over every 15-minute start, user and meeting. Both read the same rows;
+the naive version is only timed after its queries. Runs against a
+throwaway test database.
+
+    python benchmarks/bench_free_slots.py [--users 25] [--meetings 20] [--days 30]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'skillswap_project.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.test.utils import setup_test_environment, teardown_test_environment  # noqa: E402
+from django.test.utils import setup_databases, teardown_databases  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from core import availability  # noqa: E402
+from core.models import Meeting, WeeklyAvailability  # noqa: E402
+
+
+def populate(users, meetings, days):
+    start = timezone.now()
+    User.objects.bulk_create([User(username=f'bench{i}') for i in range(users)])
+    people = list(User.objects.filter(username__startswith='bench'))
+    grids = []
+    for person in people:
+        # Weekday office hours with a random gap, plus the odd weekend morning
+        masks = []
+        for weekday in range(7):
+            if weekday < 5:
+                gap = random.choice(['10:00', '12:00', '14:00'])
+                masks.append(availability.parse_day(f'08:00-{gap}, {gap[:2]}:30-18:00'))
+            else:
+                masks.append(availability.parse_day('09:00-12:00') if random.random() < 0.3 else 0)
+        grids.append(WeeklyAvailability(user=person))
+        grids[-1].bitmap = availability.week_bitmap(masks)
+    WeeklyAvailability.objects.bulk_create(grids)
+
+    for person in people:
+        for _ in range(meetings):
+            meeting = Meeting.objects.create(
+                title='Bench', organizer=person, duration_minutes=random.choice([30, 60, 90]),
+                scheduled_date=start + timedelta(minutes=15 * random.randrange(days * 96)),
+            )
+            meeting.participants.add(*random.sample(people, 2))
+    return people
+
+
+def naive_free_slots(user_ids, start, end, duration, limit):
+    start = availability._align(start)
+    grids = {
+        user_id: int.from_bytes(slots, 'little')
+        for user_id, slots in WeeklyAvailability.objects.filter(user_id__in=user_ids).values_list('user_id', 'slots')
+    }
+    meetings = []
+    for meeting in Meeting.objects.filter(status__in=['scheduled', 'confirmed']).prefetch_related('participants'):
+        attendees = {meeting.organizer_id} | {p.pk for p in meeting.participants.all()}
+        if attendees & user_ids:
+            meetings.append((meeting.scheduled_date, meeting.end_time))
+
+    began = time.perf_counter()
+    found = []
+    length = duration // availability.SLOT_MINUTES
+    candidate = start
+    previous_fit = False
+    # No early exit: when common time is scarce the scan has to cover the whole window anyway
+    while candidate + timedelta(minutes=duration) <= end:
+        fits = True
+        for offset in range(length):
+            moment = timezone.localtime(candidate + offset * availability.SLOT)
+            slot = moment.weekday() * availability.SLOTS_PER_DAY + (moment.hour * 60 + moment.minute) // 15
+            if any(not (grid >> slot) & 1 for grid in grids.values()):
+                fits = False
+                break
+        if fits:
+            finish = candidate + timedelta(minutes=duration)
+            fits = not any(s < finish and e > candidate for s, e in meetings)
+        if fits and not previous_fit:
+            found.append(candidate)
+        previous_fit = fits
+        candidate += availability.SLOT
+    return found[:limit], time.perf_counter() - began
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--users', type=int, default=25)
+    parser.add_argument('--meetings', type=int, default=20)
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--limit', type=int, default=5)
+    args = parser.parse_args()
+    random.seed(13)
+
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False)
+    try:
+        people = populate(args.users, args.meetings, args.days)
+        user_ids = {person.pk for person in people}
+        start = timezone.now()
+        end = start + timedelta(days=args.days)
+
+        started = time.perf_counter()
+        for _ in range(20):
+            fast = availability.free_slots(user_ids, start, end, 60, limit=args.limit)
+        bitmap = (time.perf_counter() - started) / 20
+
+        slow, scan = naive_free_slots(user_ids, start, end, 60, args.limit)
+        print(f'{args.users} users, {args.users * args.meetings} meetings, {args.days}-day window')
+        print(f'bitmap search:  {bitmap * 1000:.2f}ms per search, including queries')
+        print(f'per-slot scan:  {scan * 1000:.2f}ms per full-window search, excluding queries')
+        print('same result' if fast == slow else f'MISMATCH: {fast} != {slow}')
+        for slot in fast:
+            print(' ', timezone.localtime(slot).strftime('%a %d %b %H:%M'))
+    finally:
+        teardown_databases(old_config, verbosity=0)
+        teardown_test_environment()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,7 @@
 from django.contrib import admin
 from .models import (
-    StudentProfile, Skill, SkillRequest, Review, Message,
-    Notification, Meeting
+    StudentProfile, Skill, SkillRequest, SkillStats, Review, Message,
+    Notification, Meeting, Job
 )
 
 # ------------------- STUDENT PROFILE -------------------
@@ -28,6 +28,13 @@ class SkillRequestAdmin(admin.ModelAdmin):
     search_fields = ('skill__title', 'requester__username', 'owner__username')
     date_hierarchy = 'created_at'
 
+# ------------------- SKILL STATS -------------------
+@admin.register(SkillStats)
+class SkillStatsAdmin(admin.ModelAdmin):
+    list_display = ('skill', 'total_requests', 'pending_requests', 'completed_requests', 'review_count', 'average_rating', 'last_activity_at')
+    search_fields = ('skill__title',)
+    readonly_fields = [field.name for field in SkillStats._meta.fields]
+
 # ------------------- REVIEW -------------------
 @admin.register(Review)
 class ReviewAdmin(admin.ModelAdmin):
@@ -59,3 +66,11 @@ class NotificationAdmin(admin.ModelAdmin):
     list_filter = ('is_read', 'notification_type')
     search_fields = ('user__username', 'message')
     date_hierarchy = 'created_at'
+
+# ------------------- BACKGROUND JOBS -------------------
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'task', 'status', 'priority', 'attempts', 'run_at', 'locked_by')
+    list_filter = ('status', 'task')
+    search_fields = ('task', 'last_error')
+    readonly_fields = ('locked_by', 'locked_until', 'last_error', 'created_at')
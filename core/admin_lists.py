@@ -0,0 +1,218 @@
+# core/admin_lists.py
+"""
+The list engine behind the staff management screens.
+
+Each screen is a ManagementList: a base queryset with its
+``select_related``/``only()`` projection, the sort orders it offers (each
+backed by an index ending in the primary key), the column filters and a
+search. ``ManagementList.page(request)`` reads ``sort``, ``q``, the filter
+parameters and a cursor from the query string and returns a ListPage.
+
+Pages are cut with keyset conditions on (sort column, id), like the
+message history in core.pagination, so page 500 costs the same index range
+scan as page 1. The total is estimated rather than counted: the planner's
+row estimate for an unfiltered PostgreSQL table, otherwise a COUNT capped
+at COUNT_CAP rows. A page is therefore always two queries.
+"""
+import base64
+import json
+from dataclasses import dataclass, field
+from urllib.parse import urlencode
+
+from django.db import connection
+from django.db.models import Q
+
+PAGE_SIZE = 25
+COUNT_CAP = 1000
+
+
+@dataclass
+class Filter:
+    """
+    A column filter: ``?<param>=<value>`` becomes ``filter(<lookup>=value)``.
+    With ``choices`` only those values are accepted (and offered as a
+    select); without, any non-empty value is (a text input).
+    """
+    param: str
+    label: str
+    lookup: str
+    choices: list = None  # [(value, label)]; values are query-string strings
+
+    def value(self, raw):
+        """The lookup value for a query-string value, or None when it isn't accepted."""
+        if self.choices is None:
+            return raw.strip() or None
+        for value, _ in self.choices:
+            if raw == value:
+                return {'true': True, 'false': False}.get(value, value)
+        return None
+
+
+@dataclass
+class ListPage:
+    rows: list
+    total: int
+    total_kind: str  # 'exact', 'estimate' (planner statistics) or 'capped' (at least COUNT_CAP)
+    has_next: bool
+    has_previous: bool
+    next_cursor: str = None
+    previous_cursor: str = None
+    sort: str = ''
+    query: str = ''
+    filters: list = field(default_factory=list)  # [(Filter, current value)]
+    sorts: list = field(default_factory=list)  # [(key, label)]
+    params: dict = field(default_factory=dict)  # sort/search/filter params to keep across pages
+
+    @property
+    def total_label(self):
+        if self.total_kind == 'estimate':
+            return f'about {self.total}'
+        if self.total_kind == 'capped':
+            return f'{self.total}+'
+        return str(self.total)
+
+    @property
+    def next_url(self):
+        return '?' + urlencode({**self.params, 'after': self.next_cursor}) if self.has_next else None
+
+    @property
+    def previous_url(self):
+        return '?' + urlencode({**self.params, 'before': self.previous_cursor}) if self.has_previous else None
+
+
+def encode_cursor(value, pk):
+    raw = json.dumps([value.isoformat() if hasattr(value, 'isoformat') else value, pk])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, model_field):
+    """Return (value, pk) for a cursor over ``model_field``, or raise ValueError if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        value, pk = json.loads(raw)
+        return model_field.to_python(value), int(pk)
+    except Exception as exc:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from exc
+
+
+def estimate_count(queryset, filtered):
+    """``(count, kind)``: planner statistics when nothing is filtered on PostgreSQL, else a COUNT capped at COUNT_CAP."""
+    if not filtered and connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass', [queryset.model._meta.db_table]
+            )
+            row = cursor.fetchone()
+        if row and row[0] >= 0:
+            return int(row[0]), 'estimate'
+    count = queryset.order_by().values('pk')[:COUNT_CAP + 1].count()
+    if count > COUNT_CAP:
+        return COUNT_CAP, 'capped'
+    return count, 'exact'
+
+
+class ManagementList:
+    """
+    ``sorts`` maps a sort key to ``(label, column)`` where ``column`` is a
+    model field name, prefixed with '-' for descending; the id breaks ties.
+    ``search`` is a function ``(queryset, text) -> queryset``.
+    """
+
+    def __init__(self, queryset, sorts, default_sort, filters=(), search=None, only=None, page_size=PAGE_SIZE):
+        self.queryset = queryset
+        self.sorts = sorts
+        self.default_sort = default_sort
+        self.filters = list(filters)
+        self.search = search
+        self.only = only
+        self.page_size = page_size
+
+    def _ordering(self, sort, reverse=False):
+        column = self.sorts[sort][1]
+        descending = column.startswith('-') != reverse
+        name = column.lstrip('-')
+        prefix = '-' if descending else ''
+        return name, descending, [f'{prefix}{name}', f'{prefix}pk']
+
+    @staticmethod
+    def _after(name, descending, value, pk):
+        op = 'lt' if descending else 'gt'
+        return Q(**{f'{name}__{op}': value}) | Q(**{name: value, f'pk__{op}': pk})
+
+    def page(self, request):
+        params = {}
+        queryset = self.queryset
+        filtered = False
+
+        sort = request.GET.get('sort', '')
+        if sort not in self.sorts:
+            sort = self.default_sort
+        else:
+            params['sort'] = sort
+
+        query = request.GET.get('q', '').strip()
+        if query and self.search is not None:
+            queryset = self.search(queryset, query)
+            params['q'] = query
+            filtered = True
+
+        current = []
+        for column_filter in self.filters:
+            raw = request.GET.get(column_filter.param, '')
+            value = column_filter.value(raw)
+            if value is None:
+                raw = ''
+            else:
+                raw = raw.strip()
+                queryset = queryset.filter(**{column_filter.lookup: value})
+                params[column_filter.param] = raw
+                filtered = True
+            current.append((column_filter, raw))
+
+        total, total_kind = estimate_count(queryset, filtered)
+
+        name, descending, ordering = self._ordering(sort)
+        model_field = queryset.model._meta.get_field(name)
+        rows_queryset = queryset.only(*self.only) if self.only else queryset
+        after, before = request.GET.get('after'), request.GET.get('before')
+        try:
+            after = decode_cursor(after, model_field) if after else None
+            before = decode_cursor(before, model_field) if before else None
+        except ValueError:
+            after = before = None
+
+        if before:
+            # Walk backwards from the cursor, then flip the page back into display order
+            name, reversed_descending, reversed_ordering = self._ordering(sort, reverse=True)
+            rows = list(
+                rows_queryset.filter(self._after(name, reversed_descending, *before))
+                .order_by(*reversed_ordering)[:self.page_size + 1]
+            )
+            has_previous = len(rows) > self.page_size
+            rows = rows[:self.page_size][::-1]
+            has_next = True
+        else:
+            if after:
+                rows_queryset = rows_queryset.filter(self._after(name, descending, *after))
+            rows = list(rows_queryset.order_by(*ordering)[:self.page_size + 1])
+            has_next = len(rows) > self.page_size
+            rows = rows[:self.page_size]
+            has_previous = after is not None
+
+        def cursor(row):
+            return encode_cursor(getattr(row, name), row.pk)
+
+        return ListPage(
+            rows=rows,
+            total=total,
+            total_kind=total_kind,
+            has_next=has_next and bool(rows),
+            has_previous=has_previous and bool(rows),
+            next_cursor=cursor(rows[-1]) if rows else None,
+            previous_cursor=cursor(rows[0]) if rows else None,
+            sort=sort,
+            query=query,
+            filters=current,
+            sorts=[(key, label) for key, (label, _) in self.sorts.items()],
+            params=params,
+        )
@@ -0,0 +1,184 @@
+# core/analytics.py
+"""
+Daily rollups behind the admin dashboard.
+
+``rollup_days`` fills DailyStats from the last rolled-up day (which is
+recomputed, since it may have been rolled up part way through) to today:
+one grouped COUNT per source table buckets the whole range by local day,
+and one bulk upsert writes the rows, however many days are missing. Today's
+row also gets a snapshot of platform totals (users, skills, meetings,
+requests by status, average rating, top categories).
+
+The dashboard then reads two small queries, the latest row and the last
+90 rows, instead of counting the User, Skill, SkillRequest, Review and
+Meeting tables on every load.
+
+The rollup runs every ROLLUP_INTERVAL as a background job (core.jobs)
+that queues its own next run; ``manage.py run_worker`` starts the chain
+when none is queued. ``manage.py rollup_stats`` runs it by hand.
+"""
+from datetime import datetime, time, timedelta
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Avg, Count, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .jobs import enqueue
+from .models import DailyStats, Job, Meeting, Review, Skill, SkillRequest
+
+SERIES_DAYS = 90
+TOP_CATEGORIES = 5
+ROLLUP_INTERVAL = timedelta(hours=1)
+ROLLUP_TASK = 'core.analytics.rollup_job'
+
+# (DailyStats field, queryset, timestamp field, aggregates); Count('pk') unless given
+DAILY_SOURCES = [
+    ('new_users', User.objects.all(), 'date_joined', None),
+    ('new_skills', Skill.objects.all(), 'created_at', None),
+    ('new_requests', SkillRequest.objects.all(), 'created_at', None),
+    ('completed_swaps', SkillRequest.objects.filter(status='COMPLETED'), 'completed_at', None),
+    ('new_reviews', Review.objects.all(), 'created_at', {'rating_count': Count('rating'), 'rating_sum': Sum('rating')}),
+    ('new_meetings', Meeting.objects.all(), 'created_at', None),
+    # Series rows are left out; their occurrences count once materialized
+    ('meetings_held', Meeting.objects.exclude(status='cancelled').filter(recurrence=''), 'scheduled_date', None),
+]
+
+COUNTER_FIELDS = [
+    'new_users', 'new_skills', 'new_requests', 'completed_swaps', 'new_reviews', 'rating_count', 'rating_sum',
+    'new_meetings', 'meetings_held',
+]
+
+
+def _midnight(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def first_day():
+    """The day to roll up from: the last rolled-up day, or the first day with any users."""
+    last = DailyStats.objects.order_by('-date').values_list('date', flat=True).first()
+    if last is not None:
+        return last
+    joined = User.objects.order_by('date_joined').values_list('date_joined', flat=True).first()
+    return timezone.localdate(joined) if joined else timezone.localdate()
+
+
+def daily_counts(start, end):
+    """``{day: {field: value}}`` for the days in ``[start, end]``, one grouped query per source."""
+    since, until = _midnight(start), _midnight(end + timedelta(days=1))
+    days = {}
+    for field, queryset, stamp, aggregates in DAILY_SOURCES:
+        rows = (
+            queryset.filter(**{f'{stamp}__gte': since, f'{stamp}__lt': until})
+            .annotate(day=TruncDate(stamp))
+            .values('day')
+            .annotate(**{field: Count('pk')}, **(aggregates or {}))
+            .order_by()
+        )
+        for row in rows:
+            days.setdefault(row.pop('day'), {}).update({name: value or 0 for name, value in row.items()})
+    return days
+
+
+def snapshot():
+    """Platform totals as of now, for the latest DailyStats row."""
+    ratings = Review.objects.aggregate(average=Avg('rating'))
+    categories = (
+        Skill.objects.exclude(category='').values_list('category')
+        .annotate(total=Count('pk')).order_by('-total')[:TOP_CATEGORIES]
+    )
+    return {
+        'total_users': User.objects.count(),
+        'total_skills': Skill.objects.count(),
+        'total_meetings': Meeting.objects.count(),
+        'average_rating': ratings['average'],
+        'requests_by_status': dict(
+            SkillRequest.objects.values_list('status').annotate(total=Count('pk')).order_by()
+        ),
+        'top_categories': [list(row) for row in categories],
+    }
+
+
+def rollup_days(start=None, end=None):
+    """
+    Write DailyStats rows for ``[start, end]`` (default: from the last
+    rolled-up day through today). Returns the number of rows written.
+    """
+    start = start or first_day()
+    end = end or timezone.localdate()
+    if start > end:
+        return 0
+    counts = daily_counts(start, end)
+    now = timezone.now()
+
+    rows = []
+    day = start
+    while day <= end:
+        rows.append(DailyStats(date=day, rolled_up_at=now, **counts.get(day, {})))
+        day += timedelta(days=1)
+    DailyStats.objects.bulk_create(
+        rows,
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=['date'],
+        update_fields=[*COUNTER_FIELDS, 'rolled_up_at'],
+    )
+    if end == timezone.localdate():
+        DailyStats.objects.filter(date=end).update(**snapshot())
+    return len(rows)
+
+
+def schedule_rollup(run_at=None):
+    """Queue the next rollup job unless one is already queued."""
+    if not Job.objects.filter(task=ROLLUP_TASK, status='queued').exists():
+        enqueue(ROLLUP_TASK, run_at=run_at)
+
+
+def rollup_job():
+    """Roll up through today and queue the next run. Runs as a job."""
+    # Queued first, so a failing rollup doesn't end the chain (its retries find it queued)
+    schedule_rollup(run_at=timezone.now() + ROLLUP_INTERVAL)
+    with transaction.atomic():
+        rollup_days()
+
+
+# ------------------ DASHBOARD ------------------
+# (DailyStats field or property, label) for the dashboard's 90-day charts
+CHARTS = [
+    ('new_users', 'New users'),
+    ('new_skills', 'New skills'),
+    ('new_requests', 'Swap requests'),
+    ('completed_swaps', 'Completed swaps'),
+    ('meetings_held', 'Meetings held'),
+    ('day_average_rating', 'Average rating'),
+]
+
+
+def dashboard(days=SERIES_DAYS):
+    """
+    Everything admin_dashboard shows, from two queries on DailyStats: the
+    latest snapshot, and the last ``days`` days as bar charts (days the
+    rollup hasn't written count as zero).
+    """
+    latest = DailyStats.objects.exclude(total_users=None).order_by('-date').first()
+    since = timezone.localdate() - timedelta(days=days - 1)
+    rows = {row.date: row for row in DailyStats.objects.filter(date__gte=since)}
+    series = []
+    for offset in range(days):
+        day = since + timedelta(days=offset)
+        series.append(rows.get(day) or DailyStats(date=day))
+
+    charts = []
+    for field, label in CHARTS:
+        values = [getattr(row, field) for row in series]
+        peak = max(filter(None, values), default=0)
+        charts.append({
+            'label': label,
+            'total': sum(filter(None, values)) if field != 'day_average_rating' else None,
+            'bars': [
+                {'date': row.date, 'value': value, 'height': round(100 * value / peak) if value and peak else 0}
+                for row, value in zip(series, values)
+            ],
+        })
+    return {'latest': latest, 'charts': charts, 'since': since}
@@ -0,0 +1,287 @@
+# core/availability.py
+"""
+Weekly availability grids and multi-user free-slot search.
+
+A user's availability is one bitmap of 15-minute slots covering a week in
+TIME_ZONE wall-clock time: bit ``weekday * 96 + slot_of_day`` is set when
+they are usually free then (stored in ``WeeklyAvailability.slots``).
+
+``free_slots`` ANDs the participants' weekly grids, lays the result over
+the search window as a single Python int (one bit per slot, placed day by
+day so DST shifts land in the right place), clears everything covered by a
+scheduled or confirmed meeting of any participant, and keeps the slots
+where the meeting fits. Every step is a whole-window big-int operation, so
+20+ participants over a month cost two queries and a few hundred bit
+operations rather than a loop over slots, users and meetings.
+
+``conflicts`` and ``busy_intervals`` answer "who is already booked" for
+scheduling and the busy-time API. Both read ``Meeting.ends_at``, so
+overlaps are found by one range query on (scheduled_date, ends_at);
+recurring series in the result are expanded to their occurrences with
+``core.recurrence.expand_rows``.
+
+Both reveal when people are busy, so the views only ask about users
+``schedule_contacts`` allows: people the requester shares a meeting, a
+skill request or a conversation with.
+"""
+import bisect
+import re
+from datetime import datetime, time, timedelta
+
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from .models import Conversation, Meeting, SkillRequest, WeeklyAvailability
+from .recurrence import ROW_FIELDS, expand_rows
+
+SLOT_MINUTES = 15
+SLOT = timedelta(minutes=SLOT_MINUTES)
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+SLOTS_PER_WEEK = 7 * SLOTS_PER_DAY
+DAY_MASK = (1 << SLOTS_PER_DAY) - 1
+ACTIVE_STATUSES = ['scheduled', 'confirmed']  # meetings that take up time
+
+WEEKDAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+_RANGE_RE = re.compile(r'^\s*(\d{1,2}):(\d{2})\s*-\s*(\d{1,2}):(\d{2})\s*$')
+
+
+# ------------------ GRIDS ------------------
+def parse_day(text):
+    """
+    Turn "09:00-12:00, 14:00-17:30" into a 96-bit day mask. Times must fall
+    on 15-minute boundaries; "24:00" ends a range at midnight.
+    """
+    mask = 0
+    for part in filter(None, (p.strip() for p in text.split(','))):
+        match = _RANGE_RE.match(part)
+        if not match:
+            raise ValueError(f"'{part}' is not a range like 09:00-12:00")
+        h1, m1, h2, m2 = map(int, match.groups())
+        start, end = h1 * 60 + m1, h2 * 60 + m2
+        if m1 > 59 or m2 > 59 or end > 24 * 60 or start >= end:
+            raise ValueError(f"'{part}' is not a valid time range")
+        if start % SLOT_MINUTES or end % SLOT_MINUTES:
+            raise ValueError(f"'{part}' must start and end on a quarter hour")
+        mask |= ((1 << (end - start) // SLOT_MINUTES) - 1) << start // SLOT_MINUTES
+    return mask
+
+
+def format_day(mask):
+    """The inverse of ``parse_day``: a day mask as comma-separated ranges."""
+    ranges = []
+    slot = 0
+    while mask >> slot:
+        if not (mask >> slot) & 1:
+            slot += 1
+            continue
+        end = slot
+        while (mask >> end) & 1:
+            end += 1
+        ranges.append(f"{_clock(slot)}-{_clock(end)}")
+        slot = end
+    return ', '.join(ranges)
+
+
+def _clock(slot):
+    minutes = slot * SLOT_MINUTES
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def day_mask(bitmap, weekday):
+    return (bitmap >> weekday * SLOTS_PER_DAY) & DAY_MASK
+
+
+def week_bitmap(day_masks):
+    """Combine seven day masks (Monday first) into a weekly bitmap."""
+    bitmap = 0
+    for weekday, mask in enumerate(day_masks):
+        bitmap |= (mask & DAY_MASK) << weekday * SLOTS_PER_DAY
+    return bitmap
+
+
+# ------------------ SEARCH ------------------
+def _align(moment):
+    """Round an aware datetime up to the next slot boundary."""
+    seconds = SLOT_MINUTES * 60
+    stamp = -(-int(moment.timestamp()) // seconds) * seconds
+    return datetime.fromtimestamp(stamp, tz=moment.tzinfo)
+
+
+def window_mask(bitmap, start, slots):
+    """Lay a weekly bitmap over ``slots`` slots starting at ``start`` (slot-aligned)."""
+    tz = timezone.get_current_timezone()
+    day = timezone.localtime(start, tz).date()
+    end = start + slots * SLOT
+    mask = 0
+    while True:
+        midnight = timezone.make_aware(datetime.combine(day, time.min), tz)
+        if midnight >= end:
+            break
+        offset = (midnight - start) // SLOT
+        row = day_mask(bitmap, day.weekday())
+        mask |= row << offset if offset >= 0 else row >> -offset
+        day += timedelta(days=1)
+    return mask & ((1 << slots) - 1)
+
+
+def busy_mask(user_ids, start, slots):
+    """Slots covered by an active meeting that any of ``user_ids`` attends or organizes."""
+    end = start + slots * SLOT
+    attending = Meeting.participants.through.objects.filter(meeting_id=OuterRef('pk'), user_id__in=user_ids)
+    meetings = Meeting.objects.filter(
+        Q(organizer_id__in=user_ids) | Exists(attending),
+        status__in=ACTIVE_STATUSES,
+        scheduled_date__lt=end,
+        ends_at__gt=start,
+    ).values_list(*ROW_FIELDS)
+
+    mask = 0
+    for _, meeting_start, meeting_end, _ in expand_rows(meetings, start, end):
+        first = max((meeting_start - start) // SLOT, 0)
+        last = min(-(-(meeting_end - start) // SLOT), slots)
+        if last > first:
+            mask |= ((1 << last - first) - 1) << first
+    return mask
+
+
+def _fits(free, length):
+    """Bits of ``free`` that start a run of at least ``length`` set bits."""
+    span = 1
+    while span < length:
+        step = min(span, length - span)
+        free &= free >> step
+        span += step
+    return free
+
+
+def free_slots(users, start, end, duration_minutes, limit=5):
+    """
+    Earliest start times between ``start`` and ``end`` when every user in
+    ``users`` (users or ids) is available for ``duration_minutes`` and has no
+    meeting. Returns at most ``limit`` aware datetimes, one per free block,
+    so the suggestions don't crowd into a single morning.
+    """
+    user_ids = {getattr(user, 'pk', user) for user in users}
+    start = _align(max(start, timezone.now()))
+    slots = (end - start) // SLOT
+    length = -(-duration_minutes // SLOT_MINUTES)
+    if slots < length or length < 1:
+        return []
+
+    # Intersect the weekly grids first; laying out the result once is the same as laying out each
+    common = (1 << SLOTS_PER_WEEK) - 1
+    for grid in WeeklyAvailability.objects.filter(user_id__in=user_ids).values_list('slots', flat=True):
+        common &= int.from_bytes(grid, 'little')
+    if not common:
+        return []
+    free = window_mask(common, start, slots) & ~busy_mask(user_ids, start, slots)
+
+    fits = _fits(free, length)
+    block_starts = fits & ~(fits << 1)
+    found = []
+    while block_starts and len(found) < limit:
+        lowest = block_starts & -block_starts
+        found.append(start + (lowest.bit_length() - 1) * SLOT)
+        block_starts ^= lowest
+    return found
+
+
+# ------------------ BUSY TIME ------------------
+def attendance(user_ids, start, end, exclude=None):
+    """
+    ``(user_id, meeting_id, title, starts, ends)`` for every active meeting
+    or occurrence overlapping ``[start, end)`` that one of ``user_ids``
+    organizes or attends. One UNION query, both halves range scans on
+    meeting_time_range_idx, plus one for the exceptions of any series it
+    returns. ``exclude`` drops a meeting and, for a series, its exceptions.
+    """
+    overlapping = Q(status__in=ACTIVE_STATUSES, scheduled_date__lt=end, ends_at__gt=start)
+    organized = Meeting.objects.filter(overlapping, organizer_id__in=user_ids)
+    attended = Meeting.participants.through.objects.filter(
+        user_id__in=user_ids,
+        meeting__status__in=ACTIVE_STATUSES,
+        meeting__scheduled_date__lt=end,
+        meeting__ends_at__gt=start,
+    )
+    if exclude is not None:
+        organized = organized.exclude(Q(pk=exclude) | Q(series_id=exclude))
+        attended = attended.exclude(Q(meeting_id=exclude) | Q(meeting__series_id=exclude))
+    rows = organized.order_by().values_list('organizer_id', 'title', *ROW_FIELDS).union(
+        attended.order_by().values_list(
+            'user_id', 'meeting__title', *(f'meeting__{field}' for field in ROW_FIELDS)
+        ),
+        all=True,
+    )
+    return [
+        (user_id, meeting_id, title, starts, ends)
+        for user_id, title, meeting_id, starts, ends, _ in expand_rows(rows, start, end)
+    ]
+
+
+def conflicts(users, intervals, exclude=None):
+    """
+    Meetings that would clash with one held over each ``(start, end)`` in
+    ``intervals`` (several for a recurring meeting), as ``{user_id:
+    [(meeting_id, title, starts, ends), ...]}`` for the users that are
+    double-booked. ``exclude`` is the id of a meeting being edited.
+    """
+    intervals = sorted(intervals)
+    if not intervals:
+        return {}
+    user_ids = {getattr(user, 'pk', user) for user in users}
+    span_end = max(interval_end for _, interval_end in intervals)
+    interval_starts = [interval_start for interval_start, _ in intervals]
+    clashes = {}
+    for user_id, meeting_id, title, starts, ends in attendance(user_ids, intervals[0][0], span_end, exclude):
+        # Only the intervals starting before this meeting ends can overlap it
+        candidates = intervals[:bisect.bisect_left(interval_starts, ends)]
+        if any(interval_end > starts for _, interval_end in candidates):
+            clashes.setdefault(user_id, []).append((meeting_id, title, starts, ends))
+    for meetings in clashes.values():
+        meetings.sort(key=lambda meeting: meeting[2])
+    return clashes
+
+
+def busy_intervals(users, start, end):
+    """
+    Merged busy blocks per user within ``[start, end)``:
+    ``{user_id: [(block_start, block_end), ...]}`` in time order, with an
+    empty list for users who are free throughout.
+    """
+    user_ids = {getattr(user, 'pk', user) for user in users}
+    meetings = {user_id: [] for user_id in user_ids}
+    for user_id, _, _, starts, ends in attendance(user_ids, start, end):
+        meetings[user_id].append((max(starts, start), min(ends, end)))
+
+    blocks = {}
+    for user_id, intervals in meetings.items():
+        merged = []
+        for block_start, block_end in sorted(intervals):
+            if merged and block_start <= merged[-1][1]:
+                if block_end > merged[-1][1]:
+                    merged[-1] = (merged[-1][0], block_end)
+            else:
+                merged.append((block_start, block_end))
+        blocks[user_id] = merged
+    return blocks
+
+
+# ------------------ ACCESS ------------------
+def schedule_contacts(user, user_ids):
+    """
+    The ``user_ids`` whose busy times ``user`` may see: their own, and
+    those of people they share a meeting, a skill request or a conversation
+    with. One UNION query.
+    """
+    user_ids = set(user_ids)
+    meetings = Meeting.objects.for_user(user).order_by()
+    shared = Meeting.participants.through.objects.filter(
+        meeting__in=meetings, user_id__in=user_ids
+    ).values_list('user_id', flat=True).union(
+        meetings.filter(organizer_id__in=user_ids).values_list('organizer_id', flat=True),
+        SkillRequest.objects.filter(requester=user, owner_id__in=user_ids).order_by().values_list('owner_id', flat=True),
+        SkillRequest.objects.filter(owner=user, requester_id__in=user_ids).order_by().values_list('requester_id', flat=True),
+        Conversation.objects.filter(user_a=user, user_b_id__in=user_ids).order_by().values_list('user_b_id', flat=True),
+        Conversation.objects.filter(user_b=user, user_a_id__in=user_ids).order_by().values_list('user_a_id', flat=True),
+    )
+    return set(shared) | ({user.pk} & user_ids)
@@ -0,0 +1,187 @@
+# core/calendar_feed.py
+"""
+Calendar data for the meetings calendar and ICS subscriptions.
+
+``events_between`` backs ``/meetings/events.json``: the calendar page asks
+for the range it is showing and gets back only those meetings, read with
+one query on meeting_time_range_idx that selects just the columns an
+event needs. Recurring series are expanded to the occurrences in the
+range (``core.recurrence``).
+
+``ics_feed`` streams a user's meetings as an iCalendar (RFC 5545) feed
+for ``/meetings/feed/<token>.ics``. Calendar apps can't log in, so the
+feed URL carries a signed token naming the user. ``feed_state`` is a
+single aggregate query whose result drives the ETag and Last-Modified
+headers, so a poll that finds nothing new costs one small query and a
+304. A series is written once with an RRULE, and its materialized
+exceptions as overrides carrying its UID and a RECURRENCE-ID.
+"""
+import hashlib
+from datetime import datetime, timedelta, timezone as dt_timezone
+from urllib.parse import urlencode
+
+from django.core import signing
+from django.db.models import Count, Max
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import Meeting
+from .recurrence import ROW_FIELDS, expand_rows
+
+FEED_SALT = 'core.calendar_feed'
+FEED_HISTORY = timedelta(days=90)  # past meetings kept in the ICS feed
+EMPTY_FEED_MODIFIED = datetime(2000, 1, 1, tzinfo=dt_timezone.utc)
+
+EVENT_FIELDS = ('title', 'meeting_type', 'location', 'status', 'organizer_id', *ROW_FIELDS)
+EVENT_COLORS = {'organizer': '#6366f1', 'participant': '#10b981', 'cancelled': '#9ca3af'}
+
+
+# ------------------ JSON EVENTS ------------------
+def events_between(user, start, end):
+    """The user's meetings overlapping ``[start, end)`` as calendar event dicts."""
+    meetings = (
+        Meeting.objects.for_user(user)
+        .filter(scheduled_date__lt=end, ends_at__gt=start)
+        .order_by('scheduled_date')
+        .values_list(*EVENT_FIELDS)
+    )
+    occurrences = sorted(expand_rows(meetings, start, end), key=lambda row: row[6])
+    events = []
+    for title, meeting_type, location, status, organizer_id, meeting_id, starts, ends, occurrence in occurrences:
+        role = 'organizer' if organizer_id == user.pk else 'participant'
+        url = reverse('core:meeting_detail', args=[meeting_id])
+        if occurrence is not None:
+            url += '?' + urlencode({'occurrence': occurrence.isoformat()})
+        events.append({
+            'id': meeting_id,
+            'title': title,
+            'start': timezone.localtime(starts).isoformat(),
+            'end': timezone.localtime(ends).isoformat(),
+            'url': url,
+            'meeting_type': meeting_type,
+            'location': location,
+            'status': status,
+            'role': role,
+            'color': EVENT_COLORS['cancelled' if status == 'cancelled' else role],
+        })
+    return events
+
+
+# ------------------ ICS FEED ------------------
+def feed_token(user):
+    return signing.Signer(salt=FEED_SALT).sign(str(user.pk))
+
+
+def user_id_for_token(token):
+    """The user id a feed token was issued for, or None if it doesn't verify."""
+    try:
+        return int(signing.Signer(salt=FEED_SALT).unsign(token))
+    except (signing.BadSignature, ValueError):
+        return None
+
+
+def _feed_meetings(user):
+    return Meeting.objects.for_user(user).filter(ends_at__gte=timezone.now() - FEED_HISTORY)
+
+
+def feed_state(user):
+    """``(etag, last_modified)`` for a user's feed from one aggregate query."""
+    state = _feed_meetings(user).order_by().aggregate(count=Count('pk'), modified=Max('updated_at'))
+    modified = state['modified'] or EMPTY_FEED_MODIFIED
+    # The count notices deletions and removed participants, which leave updated_at alone
+    key = f"{user.pk}:{state['count']}:{modified.isoformat()}"
+    return hashlib.md5(key.encode()).hexdigest(), modified
+
+
+def _escape(text):
+    return (
+        text.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+        .replace('\r\n', '\\n').replace('\n', '\\n')
+    )
+
+
+def _stamp(moment):
+    return moment.astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def _local_stamp(moment):
+    """``;TZID=...:<local time>`` so recurrences follow the local clock across DST changes."""
+    local = timezone.localtime(moment)
+    return f';TZID={timezone.get_current_timezone_name()}:{local:%Y%m%dT%H%M%S}'
+
+
+def _rrule(recurrence, interval, until, count):
+    parts = [f'FREQ={recurrence.upper()}', f'INTERVAL={interval}']
+    if count is not None:
+        parts.append(f'COUNT={count}')
+    if until is not None:
+        parts.append(f'UNTIL={_stamp(until)}')
+    return 'RRULE:' + ';'.join(parts)
+
+
+def _fold(line):
+    """Fold a content line at 75 octets, as RFC 5545 requires."""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line + '\r\n'
+    parts = []
+    while len(encoded) > 75:
+        cut = 75 if not parts else 74  # continuation lines start with a space
+        # Don't split a multi-byte character
+        while cut and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode('utf-8'))
+        encoded = encoded[cut:]
+    parts.append(encoded.decode('utf-8'))
+    return '\r\n '.join(parts) + '\r\n'
+
+
+def ics_feed(user, host):
+    """Yield the user's feed one event at a time; meetings are read in chunks, never all at once."""
+    now = _stamp(timezone.now())
+    yield ''.join(map(_fold, [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//SkillSwap//Meetings//EN',
+        'CALSCALE:GREGORIAN',
+        f'X-WR-CALNAME:{_escape(f"SkillSwap meetings for {user.username}")}',
+    ]))
+
+    meetings = (
+        _feed_meetings(user)
+        .order_by('scheduled_date')
+        .values_list(
+            'id', 'title', 'description', 'location', 'scheduled_date', 'ends_at', 'duration_minutes', 'status',
+            'updated_at', 'series_id', 'original_start', *Meeting.RULE_FIELDS,
+        )
+    )
+    for (
+        meeting_id, title, description, location, starts, ends, duration, status,
+        updated_at, series_id, original_start, recurrence, interval, until, count,
+    ) in meetings.iterator(chunk_size=500):
+        lines = [
+            'BEGIN:VEVENT',
+            f'UID:meeting-{series_id or meeting_id}@{host}',
+            f'DTSTAMP:{now}',
+            f'LAST-MODIFIED:{_stamp(updated_at)}',
+        ]
+        if recurrence:
+            # ends_at spans the whole series; each occurrence lasts duration minutes
+            lines += [
+                f'DTSTART{_local_stamp(starts)}',
+                f'DTEND{_local_stamp(starts + timedelta(minutes=duration))}',
+                _rrule(recurrence, interval, until, count),
+            ]
+        else:
+            lines += [f'DTSTART:{_stamp(starts)}', f'DTEND:{_stamp(ends)}']
+        if series_id:
+            lines.append(f'RECURRENCE-ID{_local_stamp(original_start)}')
+        lines.append(f'SUMMARY:{_escape(title)}')
+        if description:
+            lines.append(f'DESCRIPTION:{_escape(description)}')
+        if location:
+            lines.append(f'LOCATION:{_escape(location)}')
+        lines.append(f"STATUS:{'CANCELLED' if status == 'cancelled' else 'CONFIRMED'}")
+        lines.append('END:VEVENT')
+        yield ''.join(map(_fold, lines))
+    yield _fold('END:VCALENDAR')
@@ -0,0 +1,362 @@
+# core/channel_layers.py
+"""
+Database-backed channel layer that works across worker processes and hosts.
+
+``InMemoryChannelLayer`` only delivers within one process, so with several
+gunicorn/uvicorn workers a ``group_send`` from one worker never reaches the
+sockets held by another. This layer keeps channel queues and group
+membership in the default database (ChannelLayerMessage and
+ChannelLayerGroup), which every worker already shares:
+
+* Each channel is a bounded queue (``capacity``/``channel_capacity``).
+  ``send`` raises ChannelFull when it is full; ``group_send`` skips full
+  members, like the Redis layer does.
+* Messages expire after ``expiry`` seconds and group memberships after
+  ``group_expiry`` seconds. A channel whose messages expire unread is
+  assumed dead and dropped from its groups.
+* On PostgreSQL every insert is followed by ``pg_notify`` and each process
+  LISTENs on one dedicated connection, so waiting receivers wake at once.
+  Other databases (SQLite in development) are polled every
+  ``poll_interval`` seconds with one query covering all waiting channels.
+
+Messages are stored as JSON, so they must be JSON-serializable.
+"""
+import asyncio
+import json
+import logging
+import random
+import string
+import time
+import uuid
+import weakref
+from datetime import timedelta
+
+from channels.db import database_sync_to_async
+from channels.exceptions import ChannelFull
+from channels.layers import BaseChannelLayer
+from django.db import connections
+from django.db.models import Count
+from django.utils import timezone
+
+from .models import ChannelLayerGroup, ChannelLayerMessage
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = 'core_channel_layer'
+CHUNK_SIZE = 500  # stays well under SQLite's bound-parameter limit
+
+
+def _chunks(items):
+    for start in range(0, len(items), CHUNK_SIZE):
+        yield items[start:start + CHUNK_SIZE]
+
+
+class _LoopState:
+    """Receivers waiting in one event loop, and the task that wakes them."""
+
+    def __init__(self):
+        self.events = {}   # channel -> asyncio.Event shared by its receivers
+        self.waiting = {}  # channel -> number of receive() calls waiting on it
+        self.task = None
+        self.listener = None  # psycopg2 connection LISTENing for pg_notify
+
+
+class DatabaseChannelLayer(BaseChannelLayer):
+    extensions = ['groups', 'flush']
+
+    def __init__(
+        self,
+        expiry=60,
+        group_expiry=86400,
+        capacity=100,
+        channel_capacity=None,
+        poll_interval=0.05,
+        notify_poll_interval=5,
+        database='default',
+        **kwargs,
+    ):
+        super().__init__(expiry=expiry, capacity=capacity, **kwargs)
+        self.channel_capacity = self.compile_capacities(channel_capacity or {})
+        self.group_expiry = group_expiry
+        self.poll_interval = poll_interval
+        # With LISTEN/NOTIFY polling is only a safety net for missed wakeups
+        self.notify_poll_interval = notify_poll_interval
+        self.database = database
+        self.client_prefix = uuid.uuid4().hex[:12]
+        self._states = weakref.WeakKeyDictionary()
+        self._last_cleanup = time.monotonic()
+
+    @property
+    def _uses_notify(self):
+        return connections[self.database].vendor == 'postgresql'
+
+    # ------------------ CHANNEL LAYER API ------------------
+    async def send(self, channel, message):
+        """Send a message onto a (general or specific) channel."""
+        assert isinstance(message, dict), "message is not a dict"
+        self.require_valid_channel_name(channel)
+        assert "__asgi_channel__" not in message
+
+        if not await database_sync_to_async(self._enqueue)([channel], message):
+            raise ChannelFull(channel)
+
+    async def receive(self, channel):
+        """
+        Receive the first message that arrives on the channel. If several
+        receivers wait on the same channel, each message goes to one of them.
+        """
+        self.require_valid_channel_name(channel)
+        state = self._state()
+        event = state.events.setdefault(channel, asyncio.Event())
+        state.waiting[channel] = state.waiting.get(channel, 0) + 1
+        try:
+            while True:
+                # Clear before looking so a wakeup during the query isn't lost
+                event.clear()
+                message = await database_sync_to_async(self._pop)(channel)
+                if message is not None:
+                    return message
+                await event.wait()
+        finally:
+            state.waiting[channel] -= 1
+            if not state.waiting[channel]:
+                del state.waiting[channel]
+                state.events.pop(channel, None)
+
+    async def new_channel(self, prefix='specific.'):
+        """Return a new channel name that only this process will receive on."""
+        return "%s.%s!%s" % (
+            prefix,
+            self.client_prefix,
+            ''.join(random.choice(string.ascii_letters) for i in range(12)),
+        )
+
+    async def flush(self):
+        await database_sync_to_async(self._flush)()
+
+    async def close(self):
+        state = self._states.get(asyncio.get_running_loop())
+        if state is None:
+            return
+        if state.task is not None:
+            state.task.cancel()
+        self._close_listener(state)
+
+    # ------------------ GROUPS EXTENSION ------------------
+    async def group_add(self, group, channel):
+        """Add the channel to a group, or refresh its membership TTL."""
+        self.require_valid_group_name(group)
+        self.require_valid_channel_name(channel)
+        await database_sync_to_async(self._group_add)(group, channel)
+
+    async def group_discard(self, group, channel):
+        self.require_valid_group_name(group)
+        self.require_valid_channel_name(channel)
+        await database_sync_to_async(
+            ChannelLayerGroup.objects.using(self.database).filter(group=group, channel=channel).delete
+        )()
+
+    async def group_send(self, group, message):
+        assert isinstance(message, dict), "Message is not a dict"
+        self.require_valid_group_name(group)
+        await database_sync_to_async(self._group_send)(group, message)
+
+    # ------------------ DATABASE ACCESS (sync) ------------------
+    def _enqueue(self, channels, message):
+        """
+        Queue ``message`` on every channel in ``channels`` that has room and
+        wake their receivers. Returns the channels it was queued on.
+        """
+        if not channels:
+            return []
+        now = timezone.now()
+        queued = {}
+        for chunk in _chunks(channels):
+            queued.update(
+                ChannelLayerMessage.objects.using(self.database)
+                .filter(channel__in=chunk, expires_at__gt=now)
+                .values('channel')
+                .annotate(n=Count('pk'))
+                .order_by()
+                .values_list('channel', 'n')
+            )
+        accepted = [channel for channel in channels if queued.get(channel, 0) < self.get_capacity(channel)]
+        if len(accepted) < len(channels):
+            logger.debug("Channel layer dropped a message for %d full channel(s)", len(channels) - len(accepted))
+
+        payload = json.dumps(message)
+        expires_at = now + timedelta(seconds=self.expiry)
+        ChannelLayerMessage.objects.using(self.database).bulk_create(
+            [ChannelLayerMessage(channel=channel, payload=payload, expires_at=expires_at) for channel in accepted],
+            batch_size=CHUNK_SIZE,
+        )
+        if accepted and self._uses_notify:
+            with connections[self.database].cursor() as cursor:
+                cursor.execute(
+                    "SELECT pg_notify(%s, channel) FROM unnest(%s::text[]) AS channel",
+                    [NOTIFY_CHANNEL, accepted],
+                )
+        return accepted
+
+    def _pop(self, channel):
+        """Claim and delete the oldest live message on ``channel``; None if there is none."""
+        table = ChannelLayerMessage._meta.db_table
+        now = timezone.now()
+        if self._uses_notify:
+            # One statement; SKIP LOCKED lets concurrent receivers take different rows
+            with connections[self.database].cursor() as cursor:
+                cursor.execute(
+                    f"""
+                    DELETE FROM {table} WHERE id = (
+                        SELECT id FROM {table}
+                        WHERE channel = %s AND expires_at > %s
+                        ORDER BY id LIMIT 1
+                        FOR UPDATE SKIP LOCKED
+                    )
+                    RETURNING payload
+                    """,
+                    [channel, now],
+                )
+                row = cursor.fetchone()
+            return json.loads(row[0]) if row else None
+
+        messages = ChannelLayerMessage.objects.using(self.database)
+        while True:
+            row = messages.filter(channel=channel, expires_at__gt=now).order_by('id').values_list('id', 'payload').first()
+            if row is None:
+                return None
+            # Whoever deletes the row owns the message; on a lost race try the next one
+            deleted, _ = messages.filter(pk=row[0]).delete()
+            if deleted:
+                return json.loads(row[1])
+
+    def _ready_channels(self, channels):
+        """The subset of ``channels`` that currently have messages waiting."""
+        now = timezone.now()
+        ready = set()
+        for chunk in _chunks(channels):
+            ready.update(
+                ChannelLayerMessage.objects.using(self.database)
+                .filter(channel__in=chunk, expires_at__gt=now)
+                .values_list('channel', flat=True)
+                .distinct()
+            )
+        return ready
+
+    def _group_add(self, group, channel):
+        ChannelLayerGroup.objects.using(self.database).bulk_create(
+            [ChannelLayerGroup(
+                group=group,
+                channel=channel,
+                expires_at=timezone.now() + timedelta(seconds=self.group_expiry),
+            )],
+            update_conflicts=True,
+            unique_fields=['group', 'channel'],
+            update_fields=['expires_at'],
+        )
+
+    def _group_send(self, group, message):
+        channels = list(
+            ChannelLayerGroup.objects.using(self.database)
+            .filter(group=group, expires_at__gt=timezone.now())
+            .values_list('channel', flat=True)
+        )
+        self._enqueue(channels, message)
+
+    def _clean_expired(self):
+        """Delete expired messages and memberships; channels that let messages expire leave their groups."""
+        now = timezone.now()
+        expired = ChannelLayerMessage.objects.using(self.database).filter(expires_at__lte=now)
+        dead = list(expired.values_list('channel', flat=True).distinct())
+        expired.delete()
+        groups = ChannelLayerGroup.objects.using(self.database)
+        for chunk in _chunks(dead):
+            groups.filter(channel__in=chunk).delete()
+        groups.filter(expires_at__lte=now).delete()
+
+    def _flush(self):
+        ChannelLayerMessage.objects.using(self.database).all().delete()
+        ChannelLayerGroup.objects.using(self.database).all().delete()
+
+    # ------------------ WAKEUPS ------------------
+    def _state(self):
+        """Return this event loop's state, starting its watcher task if needed."""
+        loop = asyncio.get_running_loop()
+        state = self._states.get(loop)
+        if state is None:
+            state = self._states[loop] = _LoopState()
+        if state.task is None or state.task.done():
+            state.task = loop.create_task(self._watch(state))
+        return state
+
+    async def _watch(self, state):
+        """
+        Wake receivers whose channels have messages: instantly via NOTIFY
+        where available, otherwise by polling. Also expires old rows.
+        """
+        while True:
+            try:
+                if state.listener is None and self._uses_notify:
+                    await self._listen(state)
+                await asyncio.sleep(self.notify_poll_interval if state.listener else self.poll_interval)
+
+                if state.events:
+                    ready = await database_sync_to_async(self._ready_channels)(list(state.events))
+                    for channel in ready:
+                        event = state.events.get(channel)
+                        if event is not None:
+                            event.set()
+
+                if time.monotonic() - self._last_cleanup > self.expiry:
+                    self._last_cleanup = time.monotonic()
+                    await database_sync_to_async(self._clean_expired)()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Channel layer watcher failed; retrying")
+                self._close_listener(state)
+                await asyncio.sleep(self.poll_interval)
+
+    async def _listen(self, state):
+        loop = asyncio.get_running_loop()
+        try:
+            listener = await loop.run_in_executor(None, self._open_listener)
+        except Exception:
+            logger.exception("Could not LISTEN for channel layer notifications; polling instead")
+            return
+        loop.add_reader(listener.fileno(), self._drain_notifications, state)
+        state.listener = listener
+        # Anything sent while nobody was listening was missed, so recheck every channel
+        for event in state.events.values():
+            event.set()
+
+    def _open_listener(self):
+        wrapper = connections[self.database]
+        listener = wrapper.get_new_connection(wrapper.get_connection_params())
+        listener.autocommit = True
+        with listener.cursor() as cursor:
+            cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+        return listener
+
+    def _drain_notifications(self, state):
+        listener = state.listener
+        try:
+            listener.poll()
+        except Exception:
+            logger.exception("Channel layer LISTEN connection lost")
+            self._close_listener(state)
+            return
+        while listener.notifies:
+            event = state.events.get(listener.notifies.pop(0).payload)
+            if event is not None:
+                event.set()
+
+    def _close_listener(self, state):
+        listener, state.listener = state.listener, None
+        if listener is None:
+            return
+        try:
+            asyncio.get_running_loop().remove_reader(listener.fileno())
+        except Exception:
+            pass
+        listener.close()
@@ -1,13 +1,30 @@
 import json
+import re
 from channels.generic.websocket import AsyncWebsocketConsumer
-from django.contrib.auth.models import User
-from .models import Message
+from . import realtime
+from .message_writer import get_writer
+
+# Room names are built by views.chat_room as chat_<lower user id>_<higher user id>
+ROOM_RE = re.compile(r'^chat_(\d+)_(\d+)$')
+
 
 class ChatConsumer(AsyncWebsocketConsumer):
     async def connect(self):
         self.room_name = self.scope['url_route']['kwargs']['room_name']
         self.room_group_name = f'chat_{self.room_name}'
 
+        # Only the two participants of the room may join
+        user = self.scope.get('user')
+        match = ROOM_RE.match(self.room_name)
+        if not match or user is None or not user.is_authenticated:
+            await self.close(code=4403)
+            return
+        participants = {int(match.group(1)), int(match.group(2))}
+        if user.id not in participants:
+            await self.close(code=4403)
+            return
+        self.recipient_id = (participants - {user.id} or {user.id}).pop()
+
         await self.channel_layer.group_add(self.room_group_name, self.channel_name)
         await self.accept()
 
@@ -17,19 +34,74 @@ class ChatConsumer(AsyncWebsocketConsumer):
     async def receive(self, text_data):
         data = json.loads(text_data)
         message = data['message']
-        sender = self.scope['user'].username
+        client_id = data.get('client_id')
+        user = self.scope['user']
+
+        # Persist first so the broadcast can carry the server id and timestamp
+        try:
+            saved = await get_writer().submit(user.id, self.recipient_id, message)
+        except Exception:
+            await self.send(text_data=json.dumps({
+                'type': 'error',
+                'client_id': client_id,
+                'error': 'Message could not be saved.',
+            }))
+            return
+
+        await self.send(text_data=json.dumps({
+            'type': 'ack',
+            'client_id': client_id,
+            'id': saved.pk,
+            'sequence': saved.sequence,
+            'sent_at': saved.sent_at.isoformat(),
+        }))
 
         await self.channel_layer.group_send(
             self.room_group_name,
             {
                 'type': 'chat_message',
                 'message': message,
-                'sender': sender
+                'sender': user.username,
+                'id': saved.pk,
+                'sequence': saved.sequence,
+                'sent_at': saved.sent_at.isoformat(),
+                'client_id': client_id,
             }
         )
+        # The writer uses bulk_create, which skips the post_save push
+        await realtime.apush([realtime.message_event(saved, sender_name=user.username)])
 
     async def chat_message(self, event):
         await self.send(text_data=json.dumps({
+            'type': 'message',
             'message': event['message'],
-            'sender': event['sender']
+            'sender': event['sender'],
+            'id': event['id'],
+            'sequence': event['sequence'],
+            'sent_at': event['sent_at'],
+            'client_id': event['client_id'],
         }))
+
+
+class NotificationConsumer(AsyncWebsocketConsumer):
+    """Pushes the signed-in user's events from core.realtime to every open tab."""
+
+    async def connect(self):
+        user = self.scope.get('user')
+        if user is None or not user.is_authenticated:
+            await self.close(code=4403)
+            return
+        self.group_name = realtime.user_group(user.id)
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+
+    async def disconnect(self, close_code):
+        if hasattr(self, 'group_name'):
+            await self.channel_layer.group_discard(self.group_name, self.channel_name)
+
+    async def receive(self, text_data):
+        # Server-to-client only
+        pass
+
+    async def notify(self, event):
+        await self.send(text_data=json.dumps(event['data']))
@@ -0,0 +1,122 @@
+# core/counters.py
+"""
+Navbar badge counters.
+
+All badge numbers for a user are computed in a single SELECT (one scalar
+subquery per counter) and cached per user. Signal handlers on Skill,
+SkillRequest and Message drop the affected cache entries so pages where
+nothing changed render their badges without touching the database.
+"""
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models import Func, IntegerField, Subquery
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Message, Skill, SkillRequest
+
+COUNTS_TIMEOUT = 60 * 10
+SKILLS_VERSION_KEY = 'badge_counts:skills_version'
+
+EMPTY_COUNTS = {
+    'new_skills_count': 0,
+    'meeting_notifications_count': 0,
+    'skill_requests_count': 0,
+    'unread_count': 0,
+    'total_notifications': 0,
+}
+
+
+def _cache_key(user_id):
+    # The date is part of the key so "new skills today" resets at midnight
+    return f"badge_counts:{user_id}:{timezone.localdate().isoformat()}"
+
+
+def _count(queryset):
+    """Wrap a queryset as a scalar COUNT(*) subquery."""
+    counted = queryset.order_by().annotate(
+        c=Func('pk', function='COUNT', output_field=IntegerField())
+    ).values('c')
+    return Coalesce(Subquery(counted), 0)
+
+
+def _query_counts(user):
+    """Compute every badge counter for ``user`` in one round trip."""
+    row = User.objects.filter(pk=user.pk).annotate(
+        # New skills added today by other users
+        new_skills_count=_count(
+            Skill.objects.filter(created_at__date=timezone.localdate()).exclude(owner=user)
+        ),
+        # Pending requests received for the user's skills
+        meeting_notifications_count=_count(
+            SkillRequest.objects.filter(owner=user, status='PENDING')
+        ),
+        # Pending requests the user has made
+        skill_requests_count=_count(
+            SkillRequest.objects.filter(requester=user, status='PENDING')
+        ),
+        unread_count=_count(
+            Message.objects.filter(to_user=user, is_read=False)
+        ),
+    ).values(
+        'new_skills_count',
+        'meeting_notifications_count',
+        'skill_requests_count',
+        'unread_count',
+    ).first()
+
+    if row is None:
+        return dict(EMPTY_COUNTS)
+
+    row['total_notifications'] = sum(row.values())
+    return row
+
+
+def get_badge_counts(user):
+    """Return the cached badge counters for ``user``, recomputing on a miss."""
+    key = _cache_key(user.pk)
+    cached = cache.get_many([key, SKILLS_VERSION_KEY])
+    skills_version = cached.get(SKILLS_VERSION_KEY, 0)
+    entry = cached.get(key)
+
+    # New skills are global, so a per-user entry is only valid for the
+    # skills version it was computed against.
+    if entry is not None and entry['skills_version'] == skills_version:
+        return entry['counts']
+
+    counts = _query_counts(user)
+    cache.set(key, {'skills_version': skills_version, 'counts': counts}, COUNTS_TIMEOUT)
+    return counts
+
+
+def invalidate_badge_counts(*user_ids):
+    """Drop the cached counters for the given users."""
+    cache.delete_many([_cache_key(user_id) for user_id in user_ids if user_id])
+
+
+def bump_skills_version():
+    """Invalidate the "new skills" counter for every user at once."""
+    try:
+        cache.incr(SKILLS_VERSION_KEY)
+    except ValueError:
+        cache.set(SKILLS_VERSION_KEY, 1, None)
+
+
+# ------------------ SIGNAL HANDLERS ------------------
+@receiver([post_save, post_delete], sender=Skill)
+def skill_changed(sender, instance, created=True, **kwargs):
+    # Edits don't change created_at, only inserts and deletes move the count
+    if created:
+        bump_skills_version()
+
+
+@receiver([post_save, post_delete], sender=SkillRequest)
+def skill_request_changed(sender, instance, **kwargs):
+    invalidate_badge_counts(instance.owner_id, instance.requester_id)
+
+
+@receiver([post_save, post_delete], sender=Message)
+def message_changed(sender, instance, **kwargs):
+    invalidate_badge_counts(instance.to_user_id)
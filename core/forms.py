@@ -1,7 +1,10 @@
+from datetime import datetime, time
+
 from django import forms
 from django.contrib.auth.models import User
-from .models import Skill, StudentProfile, Meeting
+from .models import Skill, StudentProfile, Meeting, WeeklyAvailability
 from django.utils import timezone
+from . import availability
 
 class UserRegistrationForm(forms.ModelForm):
     password = forms.CharField(label='Password', widget=forms.PasswordInput)
@@ -32,6 +35,44 @@ class StudentProfileForm(forms.ModelForm):
             'skills_wanted': forms.Textarea(attrs={'rows': 2, 'placeholder': 'e.g. Guitar, Spanish, Data Analysis'}),
         }
 
+class AvailabilityForm(forms.Form):
+    """One line of time ranges per weekday, stored as a WeeklyAvailability bitmap."""
+
+    def __init__(self, *args, user=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.instance = WeeklyAvailability.objects.filter(user=user).first() or WeeklyAvailability(user=user)
+        bitmap = self.instance.bitmap
+        for weekday, day in enumerate(availability.WEEKDAYS):
+            self.fields[day] = forms.CharField(
+                label=f"{day.capitalize()} availability",
+                required=False,
+                initial=availability.format_day(availability.day_mask(bitmap, weekday)),
+                help_text="e.g. 09:00-12:00, 14:00-17:30 in quarter hours. Leave every day blank to be offered any time." if weekday == 0 else '',
+                widget=forms.TextInput(attrs={'class': 'form-input', 'placeholder': '09:00-17:00'}),
+            )
+
+    def clean(self):
+        cleaned_data = super().clean()
+        masks = []
+        for day in availability.WEEKDAYS:
+            try:
+                masks.append(availability.parse_day(cleaned_data.get(day) or ''))
+            except ValueError as exc:
+                self.add_error(day, str(exc))
+        if len(masks) == len(availability.WEEKDAYS):
+            cleaned_data['bitmap'] = availability.week_bitmap(masks)
+        return cleaned_data
+
+    def save(self):
+        # An empty grid means "no preference", not "never free"
+        if not self.cleaned_data['bitmap']:
+            if not self.instance._state.adding:
+                self.instance.delete()
+            return None
+        self.instance.bitmap = self.cleaned_data['bitmap']
+        self.instance.save()
+        return self.instance
+
 class MeetingForm(forms.ModelForm):
     scheduled_date = forms.DateTimeField(
         widget=forms.DateTimeInput(attrs={
@@ -72,11 +113,37 @@ class MeetingForm(forms.ModelForm):
             'step': '15'
         })
     )
+
+    recurrence_interval = forms.IntegerField(
+        min_value=1,
+        max_value=52,
+        required=False,
+        widget=forms.NumberInput(attrs={'class': 'form-input', 'min': '1', 'max': '52'}),
+        help_text="Repeat every N days or weeks"
+    )
+
+    recurrence_until = forms.DateField(
+        required=False,
+        widget=forms.DateInput(attrs={'type': 'date', 'class': 'form-input'}),
+        help_text="Last day the meeting repeats on"
+    )
+
+    recurrence_count = forms.IntegerField(
+        min_value=1,
+        max_value=365,
+        required=False,
+        widget=forms.NumberInput(attrs={'class': 'form-input', 'min': '1', 'max': '365'}),
+        help_text="Or stop after this many meetings"
+    )
+
+    # How far ahead a new recurring meeting is checked for double bookings
+    RECURRENCE_CHECK_HORIZON = timezone.timedelta(days=365)
     
     class Meta:
         model = Meeting
         fields = ['title', 'description', 'meeting_type', 'scheduled_date', 
-                 'duration_minutes', 'location', 'participants', 'related_skill']
+                 'duration_minutes', 'location', 'participants', 'related_skill',
+                 'recurrence', 'recurrence_interval', 'recurrence_until', 'recurrence_count']
         widgets = {
             'title': forms.TextInput(attrs={
                 'class': 'form-input',
@@ -93,11 +160,15 @@ class MeetingForm(forms.ModelForm):
             'related_skill': forms.Select(attrs={
                 'class': 'form-select'
             }),
+            'recurrence': forms.Select(attrs={
+                'class': 'form-select'
+            }),
         }
     
     def __init__(self, *args, **kwargs):
         organizer = kwargs.pop('organizer', None)
         super().__init__(*args, **kwargs)
+        self.organizer = organizer
         
         # Only show users who are not the organizer
         if organizer:
@@ -106,6 +177,13 @@ class MeetingForm(forms.ModelForm):
         # Set initial duration if not provided
         if not self.initial.get('duration_minutes'):
             self.initial['duration_minutes'] = 60
+
+        # A single occurrence moved out of a series can't repeat on its own
+        if self.instance.series_id:
+            for name in Meeting.RULE_FIELDS:
+                del self.fields[name]
+        elif self.instance.recurrence_until:
+            self.initial['recurrence_until'] = timezone.localtime(self.instance.recurrence_until).date()
             
         # Set minimum datetime for scheduled_date
         now = timezone.now()
@@ -151,5 +229,67 @@ class MeetingForm(forms.ModelForm):
                 raise forms.ValidationError(
                     "The meeting would end in the past. Please adjust the date/time or duration."
                 )
+            self._clean_recurrence(cleaned_data)
+            self._check_conflicts(
+                self._occurrences(cleaned_data, scheduled_date, duration_minutes),
+                cleaned_data.get('participants') or [],
+            )
         
-        return cleaned_data
\ No newline at end of file
+        return cleaned_data
+
+    def _clean_recurrence(self, cleaned_data):
+        if 'recurrence' not in self.fields:
+            return
+        # Templates that don't render the repeat fields leave an existing rule alone
+        for name in Meeting.RULE_FIELDS:
+            widget = self.fields[name].widget
+            if widget.value_omitted_from_data(self.data, self.files, self.add_prefix(name)):
+                cleaned_data[name] = getattr(self.instance, name)
+        if cleaned_data.get('recurrence_interval') is None:
+            cleaned_data['recurrence_interval'] = 1
+
+        until = cleaned_data.get('recurrence_until')
+        if until is not None and not isinstance(until, datetime):
+            # The rule keeps the last moment an occurrence may start: the end of that day
+            until = timezone.make_aware(datetime.combine(until, time.max))
+            cleaned_data['recurrence_until'] = until
+        if not cleaned_data.get('recurrence'):
+            return
+        if until is not None and cleaned_data.get('recurrence_count'):
+            raise forms.ValidationError("Choose either an end date or a number of meetings, not both.")
+        scheduled_date = cleaned_data.get('scheduled_date')
+        if until is not None and scheduled_date and until < scheduled_date:
+            raise forms.ValidationError("A repeating meeting can't end before its first meeting.")
+
+    def _occurrences(self, cleaned_data, scheduled_date, duration_minutes):
+        """``(start, end)`` of the meetings this form would book, up to RECURRENCE_CHECK_HORIZON ahead."""
+        meeting = Meeting(
+            scheduled_date=scheduled_date,
+            duration_minutes=duration_minutes,
+            **{name: cleaned_data.get(name) for name in Meeting.RULE_FIELDS if name in self.fields},
+        )
+        length = timezone.timedelta(minutes=duration_minutes)
+        starts = meeting.occurrence_starts(end=scheduled_date + self.RECURRENCE_CHECK_HORIZON)
+        return [(start, start + length) for start in starts]
+
+    def _check_conflicts(self, occurrences, participants):
+        """Reject the meeting if the organizer or any participant is already booked for one of its occurrences."""
+        if self.instance.status not in availability.ACTIVE_STATUSES:
+            return
+        attendees = {participant.pk for participant in participants}
+        if self.organizer is not None:
+            attendees.add(self.organizer.pk)
+        clashes = availability.conflicts(attendees, occurrences, exclude=self.instance.pk)
+        if not clashes:
+            return
+
+        names = dict(User.objects.filter(pk__in=clashes).values_list('pk', 'username'))
+        errors = []
+        for user_id, meetings in clashes.items():
+            _, title, starts, ends = meetings[0]
+            starts, ends = timezone.localtime(starts), timezone.localtime(ends)
+            errors.append(forms.ValidationError(
+                f"{names.get(user_id, 'A participant')} is already booked for '{title}' "
+                f"from {starts:%a %d %b %H:%M} to {ends:%H:%M}."
+            ))
+        raise forms.ValidationError(errors)
\ No newline at end of file
@@ -0,0 +1,277 @@
+# core/fragments.py
+"""
+Cached template fragments with signal-bumped version keys.
+
+``{% cachefragment 'skill_card' skill=skill.pk %}...{% endcachefragment %}``
+(core.templatetags.fragments) stores the rendered block under a key built
+from the versions of the records it shows, e.g.
+``fragment:skill_card:skill:12:v7``. Nothing is ever deleted: the signal
+handlers below bump a version when its record changes, so the next render
+looks under a new key and the old entry ages out of the cache.
+
+Versions exist per SCOPE:
+
+* ``skill:<id>``: the skill, its reviews, requests and SkillStats;
+* ``profile:<user id>``: a public profile (StudentProfile, skills shared);
+* ``user:<user id>``: that user's dashboard (their skills and requests).
+
+Bumps run after the transaction commits, so a page rendered from the old
+rows can't be stored under the new version. Names are shown all over the
+site, so editing an account bumps GENERATION_KEY, which is part of every
+key, instead of tracking each place a name appears.
+
+Every lookup is timed. Hits, misses, the time spent rendering misses and
+the time spent fetching hits are counted per fragment, in memory, and
+added to cache counters every STATS_FLUSH_EVERY lookups or
+STATS_FLUSH_INTERVAL seconds; ``manage.py fragment_cache_stats`` reports
+hit rates and the render time the hits saved.
+
+Versions and counters live in the default cache, which every process
+shares (see CACHES), so bumps from run_worker jobs and management
+commands reach the web workers. That cache has to be Redis: a version
+read per fragment is only cheaper than rendering it when it's a network
+round trip rather than a query, and the counters rely on INCRBY being
+atomic (other backends' incr() is a get and a set, and concurrent flushes
+would lose counts). FRAGMENT_CACHE_ENABLED is therefore only on when
+REDIS_URL is set; otherwise every block is simply rendered.
+
+Views showing several fragments pass ``fragment_versions =
+fragments.prefetch([(scope, pk), ...])`` so the page reads all its
+versions in one get_many instead of one per block.
+"""
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Review, Skill, SkillRequest, StudentProfile
+
+SCOPES = ('skill', 'profile', 'user')
+TIMEOUT = getattr(settings, 'FRAGMENT_CACHE_TIMEOUT', 60 * 60 * 24)
+GENERATION_KEY = 'fragment:generation'
+STATS_NAMES_KEY = 'fragment_stats:names'
+STATS_FIELDS = ('hits', 'misses', 'hit_us', 'render_us')
+STATS_FLUSH_EVERY = 100
+STATS_FLUSH_INTERVAL = 60  # seconds
+
+
+# ------------------ VERSIONS ------------------
+def version_key(scope, pk):
+    return f'fragment:version:{scope}:{pk}'
+
+
+def _seed():
+    # A lost version can't restart at a number an old entry was stored under
+    return time.time_ns() // 1000
+
+
+def enabled():
+    return getattr(settings, 'FRAGMENT_CACHE_ENABLED', False)
+
+
+def _versions(scopes, known):
+    """Add the versions of GENERATION_KEY and ``scopes`` missing from ``known`` to it."""
+    missing = [
+        key for key in [GENERATION_KEY, *(version_key(scope, pk) for scope, pk in scopes)]
+        if key not in known
+    ]
+    if missing:
+        values = cache.get_many(missing)
+        for key in missing:
+            if key not in values:
+                seed = _seed()
+                # Another process may have seeded it first; theirs wins
+                values[key] = seed if cache.add(key, seed, None) else cache.get(key)
+        known.update(values)
+    return known
+
+
+def prefetch(scopes):
+    """The versions a page's fragments will look up, read at once, for its ``fragment_versions``."""
+    return _versions(scopes, {}) if enabled() else {}
+
+
+def _incr(keys):
+    for key in keys:
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, _seed(), None)
+
+
+def bump(scope, *pks):
+    """Move the given records of ``scope`` to a new version once the transaction commits."""
+    keys = [version_key(scope, pk) for pk in set(pks) if pk is not None]
+    if keys:
+        transaction.on_commit(lambda: _incr(keys))
+
+
+def invalidate_all():
+    """Start every fragment afresh."""
+    transaction.on_commit(lambda: _incr([GENERATION_KEY]))
+
+
+def fragment_key(name, scopes, vary_on=(), versions=None):
+    """
+    The cache key for fragment ``name`` showing ``scopes`` (``[(scope,
+    pk)]``), e.g. ``fragment:skill_card:skill:12:v7:g3``. ``vary_on``
+    values that aren't versioned records are hashed onto the end.
+    Versions already in ``versions`` aren't read again.
+    """
+    keys = [version_key(scope, pk) for scope, pk in scopes]
+    versions = _versions(scopes, {} if versions is None else versions)
+    parts = [f'{scope}:{pk}:v{versions[key]}' for (scope, pk), key in zip(scopes, keys)]
+    parts.append(f'g{versions[GENERATION_KEY]}')
+    if vary_on:
+        parts.append(hashlib.md5(':'.join(str(value) for value in vary_on).encode()).hexdigest())
+    return ':'.join(['fragment', name, *parts])
+
+
+def cached(name, scopes, vary_on, render, versions=None):
+    """The cached content of fragment ``name``, calling ``render()`` to fill it on a miss."""
+    if not enabled():
+        return render()
+    started = time.perf_counter()
+    key = fragment_key(name, scopes, vary_on, versions)
+    content = cache.get(key)
+    if content is not None:
+        record(name, hit=True, seconds=time.perf_counter() - started)
+        return content
+    content = render()
+    cache.set(key, content, TIMEOUT)
+    record(name, hit=False, seconds=time.perf_counter() - started)
+    return content
+
+
+# ------------------ STATISTICS ------------------
+_lock = threading.Lock()
+_pending = {}  # name -> {field: count}
+_pending_count = 0
+_flushed_at = time.monotonic()
+
+
+def record(name, hit, seconds):
+    global _pending_count
+    with _lock:
+        counts = _pending.setdefault(name, dict.fromkeys(STATS_FIELDS, 0))
+        if hit:
+            counts['hits'] += 1
+            counts['hit_us'] += int(seconds * 1e6)
+        else:
+            counts['misses'] += 1
+            counts['render_us'] += int(seconds * 1e6)
+        _pending_count += 1
+        if _pending_count < STATS_FLUSH_EVERY and time.monotonic() - _flushed_at < STATS_FLUSH_INTERVAL:
+            return
+    flush_stats()
+
+
+def flush_stats():
+    """Add this process's counts to the shared counters in the cache (atomic on Redis)."""
+    global _pending, _pending_count, _flushed_at
+    with _lock:
+        pending, _pending = _pending, {}
+        _pending_count = 0
+        _flushed_at = time.monotonic()
+    if not pending:
+        return
+    names = cache.get(STATS_NAMES_KEY, set())
+    if not names.issuperset(pending):
+        cache.set(STATS_NAMES_KEY, names | set(pending), None)
+    for name, counts in pending.items():
+        for field, value in counts.items():
+            if not value:
+                continue
+            key = f'fragment_stats:{name}:{field}'
+            try:
+                cache.incr(key, value)
+            except ValueError:
+                if not cache.add(key, value, None):
+                    cache.incr(key, value)
+
+
+@dataclass
+class FragmentStats:
+    name: str
+    hits: int
+    misses: int
+    hit_us: int  # total time spent fetching hits
+    render_us: int  # total time spent rendering (and storing) misses
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @property
+    def render_ms(self):
+        """Average cost of rendering the fragment."""
+        return self.render_us / self.misses / 1000 if self.misses else 0.0
+
+    @property
+    def hit_ms(self):
+        return self.hit_us / self.hits / 1000 if self.hits else 0.0
+
+    @property
+    def saved_seconds(self):
+        """Render time the hits would have cost, less what fetching them did."""
+        return max(self.render_ms - self.hit_ms, 0) * self.hits / 1000
+
+
+def report():
+    """FragmentStats for every fragment looked up since the last reset, most time saved first."""
+    flush_stats()
+    rows = []
+    for name in sorted(cache.get(STATS_NAMES_KEY, set())):
+        keys = {field: f'fragment_stats:{name}:{field}' for field in STATS_FIELDS}
+        values = cache.get_many(keys.values())
+        rows.append(FragmentStats(name, **{field: values.get(key, 0) for field, key in keys.items()}))
+    return sorted(rows, key=lambda row: row.saved_seconds, reverse=True)
+
+
+def reset_stats():
+    names = cache.get(STATS_NAMES_KEY, set())
+    cache.delete_many([f'fragment_stats:{name}:{field}' for name in names for field in STATS_FIELDS])
+    cache.delete(STATS_NAMES_KEY)
+
+
+# ------------------ SIGNAL HANDLERS ------------------
+@receiver([post_save, post_delete], sender=Skill)
+def skill_changed(sender, instance, created=True, **kwargs):
+    bump('skill', instance.pk)
+    bump('profile', instance.owner_id)
+    bump('user', instance.owner_id)
+    if not created:
+        # Requesters' dashboards show the skill's title
+        bump('user', *instance.requests.values_list('requester_id', flat=True))
+
+
+@receiver([post_save, post_delete], sender=Review)
+def review_changed(sender, instance, **kwargs):
+    bump('skill', instance.skill_id)
+
+
+@receiver([post_save, post_delete], sender=SkillRequest)
+def skill_request_changed(sender, instance, **kwargs):
+    bump('skill', instance.skill_id)
+    bump('user', instance.requester_id, instance.owner_id)
+
+
+@receiver([post_save, post_delete], sender=StudentProfile)
+def profile_changed(sender, instance, **kwargs):
+    bump('profile', instance.user_id)
+
+
+@receiver(post_save, sender=User)
+def account_changed(sender, instance, created, update_fields=None, **kwargs):
+    # Logging in only touches last_login; new accounts aren't in any fragment yet
+    if created or (update_fields and set(update_fields) <= {'last_login', 'is_active'}):
+        return
+    invalidate_all()
@@ -0,0 +1,207 @@
+# core/images.py
+"""
+Resized variants of uploaded images.
+
+Profile photos and image attachments are stored as uploaded, often
+multi-megabyte camera JPEGs with EXIF (and GPS) data. When one is saved,
+``generate_variants`` writes WebP and JPEG copies bounded to each of
+VARIANT_SIZES: rotated upright from the EXIF orientation, EXIF dropped,
+never upscaled. Their names and dimensions are kept in a JSON field next
+to the file (``StudentProfile.photo_variants``,
+``Message.attachment_variants``), so templates can pick a variant and
+write its width and height without opening any file.
+
+With ``IMAGE_VARIANTS_DEFERRED`` the work runs as a background job
+(core.jobs) instead of inside the upload request. ``manage.py
+generate_image_variants`` fills in files uploaded before this existed.
+"""
+import io
+import logging
+import os
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from . import fragments
+from .jobs import enqueue
+from .models import MediaBlob, Message, StudentProfile
+
+logger = logging.getLogger(__name__)
+
+VARIANT_SIZES = (48, 128, 512)  # longest side in pixels
+# extension -> (Pillow format, save options)
+FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp', '.gif', '.bmp', '.tif', '.tiff'}
+
+# (model, file field, variants field) for every image we make variants of
+SOURCES = {
+    'profile_photo': (StudentProfile, 'photo', 'photo_variants'),
+    'message_attachment': (Message, 'attachment', 'attachment_variants'),
+}
+
+
+# ------------------ GENERATING ------------------
+def _flatten(image):
+    """An RGB copy for JPEG, with any transparency composited onto white."""
+    if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def _variant_name(name, size, extension):
+    directory, filename = os.path.split(name)
+    stem = os.path.splitext(filename)[0]
+    return os.path.join(directory, 'variants', f'{stem}-{size}.{extension}')
+
+
+def generate_variants(name, storage):
+    """
+    Write the variants of the image ``name`` in ``storage`` and return the
+    variants record: ``{'source': name, 'sizes': {size: {'width', 'height',
+    'webp', 'jpeg'}}}``. Files that aren't images get no sizes.
+    """
+    record = {'source': name, 'sizes': {}}
+    try:
+        with storage.open(name, 'rb') as source:
+            image = Image.open(source)
+            # Let the JPEG decoder scale down while decoding; much cheaper than resizing full camera frames
+            image.draft('RGB', (max(VARIANT_SIZES), max(VARIANT_SIZES)))
+            image = ImageOps.exif_transpose(image)
+            image.load()
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as exc:
+        logger.warning("No variants for %s: %s", name, exc)
+        return record
+
+    icc_profile = image.info.get('icc_profile')
+    for size in VARIANT_SIZES:
+        variant = image.copy()
+        variant.thumbnail((size, size), Image.Resampling.LANCZOS)
+        entry = {'width': variant.width, 'height': variant.height}
+        for extension, (image_format, options) in FORMATS.items():
+            if image_format == 'JPEG':
+                variant_image = _flatten(variant)
+            else:
+                variant_image = variant if variant.mode in ('RGB', 'RGBA') else variant.convert('RGBA')
+            buffer = io.BytesIO()
+            # Saving a new image carries no EXIF; only the colour profile is kept
+            variant_image.save(buffer, image_format, icc_profile=icc_profile, **options)
+            entry[extension] = storage.save(_variant_name(name, size, extension), ContentFile(buffer.getvalue()))
+            # core.media serves a variant to whoever may see its source
+            MediaBlob.objects.filter(name=entry[extension]).update(variant_of=name)
+        record['sizes'][str(size)] = entry
+        if variant.size == image.size:
+            break  # the image is smaller than the remaining sizes; don't upscale
+    return record
+
+
+def delete_variants(record, storage):
+    for entry in record.get('sizes', {}).values():
+        for extension in FORMATS:
+            if entry.get(extension):
+                storage.delete(entry[extension])
+
+
+def process(source, pk):
+    """Bring the variants of one row's file up to date. Also runs as a job."""
+    model, file_field, variants_field = SOURCES[source]
+    row = model.objects.filter(pk=pk).only('pk', file_field, variants_field).first()
+    if row is None:
+        return
+    fieldfile, record = getattr(row, file_field), getattr(row, variants_field) or {}
+    if record.get('source') == (fieldfile.name or None):
+        return
+
+    new_record = generate_variants(fieldfile.name, fieldfile.storage) if fieldfile else {}
+    # Only store them if the file wasn't replaced again while we worked
+    if fieldfile:
+        unchanged = Q(**{file_field: fieldfile.name})
+    else:
+        unchanged = Q(**{file_field: ''}) | Q(**{f'{file_field}__isnull': True})
+    updated = model.objects.filter(unchanged, pk=pk).update(**{variants_field: new_record})
+    if updated:
+        delete_variants(record, fieldfile.storage)
+        if model is StudentProfile:
+            # update() sends no signal, and the profile fragments show the photo's variants
+            fragments.bump('profile', row.user_id)
+    else:
+        delete_variants(new_record, fieldfile.storage)
+
+
+def needs_variants(fieldfile, record):
+    if not fieldfile:
+        return bool(record)
+    if (record or {}).get('source') == fieldfile.name:
+        return False
+    return os.path.splitext(fieldfile.name)[1].lower() in IMAGE_EXTENSIONS
+
+
+def schedule(source, instance):
+    model, file_field, variants_field = SOURCES[source]
+    if not needs_variants(getattr(instance, file_field), getattr(instance, variants_field)):
+        return
+    if getattr(settings, 'IMAGE_VARIANTS_DEFERRED', False):
+        enqueue(process, args=[source, instance.pk], priority=5)
+    else:
+        transaction.on_commit(lambda: process(source, instance.pk))
+
+
+# ------------------ TEMPLATES ------------------
+def pick(record, size):
+    """The smallest variant entry at least ``size`` pixels on its longest side, else the largest; None if none."""
+    entries = sorted((record or {}).get('sizes', {}).values(), key=lambda entry: max(entry['width'], entry['height']))
+    for entry in entries:
+        if max(entry['width'], entry['height']) >= size:
+            return entry
+    return entries[-1] if entries else None
+
+
+def variant_url(fieldfile, record, size, extension='webp'):
+    """URL of the variant ``pick`` chooses, or of the original while there are no variants."""
+    if not fieldfile:
+        return None
+    entry = pick(record, size)
+    if entry is None:
+        return fieldfile.url
+    return fieldfile.storage.url(entry[extension])
+
+
+def srcset(fieldfile, record, extension):
+    return ', '.join(
+        f"{fieldfile.storage.url(entry[extension])} {entry['width']}w"
+        for entry in (record or {}).get('sizes', {}).values()
+    )
+
+
+# ------------------ SIGNAL HANDLERS ------------------
+@receiver(post_save, sender=StudentProfile)
+def profile_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        schedule('profile_photo', instance)
+
+
+@receiver(post_save, sender=Message)
+def message_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        schedule('message_attachment', instance)
+
+
+@receiver(post_delete, sender=StudentProfile)
+@receiver(post_delete, sender=Message)
+def image_owner_deleted(sender, instance, **kwargs):
+    for model, file_field, variants_field in SOURCES.values():
+        record = getattr(instance, variants_field) if model is sender else None
+        if record:
+            storage = getattr(instance, file_field).storage
+            # Bound now: the loop goes on to rebind record for the other sources
+            transaction.on_commit(lambda record=record, storage=storage: delete_variants(record, storage))
@@ -0,0 +1,219 @@
+# core/jobs.py
+"""
+Database-backed background jobs.
+
+``enqueue()`` stores a call to a module-level function as a Job row in the
+caller's transaction, so a job exists exactly when the data it works on
+does. ``manage.py run_worker`` claims due jobs in priority order, runs them
+in a thread or process pool and retries failures with exponential backoff.
+
+On PostgreSQL jobs are claimed with SELECT ... FOR UPDATE SKIP LOCKED, so
+concurrent workers never wait on each other. SQLite has no row locks; there
+the claiming UPDATE is guarded by ``status='queued'`` and each worker only
+takes the rows its own UPDATE flipped. A claimed job holds a lease that the
+worker renews while the job runs; jobs whose worker died are requeued once
+the lease runs out.
+"""
+import logging
+import multiprocessing
+import os
+import random
+import signal
+import socket
+import time
+import traceback
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import timedelta
+
+import django
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+LEASE_SECONDS = 300
+BACKOFF_BASE = 10  # seconds before the first retry, doubled per attempt
+BACKOFF_MAX = 60 * 60
+
+
+def _task_path(task):
+    if isinstance(task, str):
+        return task
+    return f"{task.__module__}.{task.__qualname__}"
+
+
+def enqueue(task, args=(), kwargs=None, priority=0, run_at=None, delay=None, max_attempts=5):
+    """
+    Queue ``task(*args, **kwargs)`` to run on a worker.
+
+    ``task`` is a module-level function or its dotted path; arguments must be
+    JSON-serializable. ``run_at`` or ``delay`` (seconds) postpone the job.
+    """
+    if run_at is None:
+        run_at = timezone.now() + timedelta(seconds=delay or 0)
+    return Job.objects.create(
+        task=_task_path(task),
+        args=list(args),
+        kwargs=kwargs or {},
+        priority=priority,
+        run_at=run_at,
+        max_attempts=max_attempts,
+    )
+
+
+def run_task(task, args, kwargs):
+    """Import and call one task. Module-level so process pools can pickle it."""
+    close_old_connections()
+    try:
+        import_string(task)(*args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+def backoff(attempts):
+    """Seconds to wait before retrying a job that has failed ``attempts`` times."""
+    delay = min(BACKOFF_BASE * 2 ** (attempts - 1), BACKOFF_MAX)
+    return delay + random.uniform(0, delay / 4)
+
+
+# ------------------ WORKER SIDE ------------------
+def claim(worker_id, limit, lease=LEASE_SECONDS, task=None):
+    """Lease up to ``limit`` due jobs (optionally only ``task`` ones) to ``worker_id`` and return them."""
+    now = timezone.now()
+    due = Job.objects.filter(status='queued', run_at__lte=now)
+    if task is not None:
+        due = due.filter(task=_task_path(task))
+    with transaction.atomic():
+        # FOR UPDATE SKIP LOCKED on PostgreSQL; ignored on SQLite
+        ids = list(
+            due.select_for_update(skip_locked=True)
+            .order_by('-priority', 'run_at', 'id')
+            .values_list('id', flat=True)[:limit]
+        )
+        if not ids:
+            return []
+        # Re-checking the status keeps two SQLite workers from sharing a job
+        Job.objects.filter(id__in=ids, status='queued').update(
+            status='running',
+            locked_by=worker_id,
+            locked_until=now + timedelta(seconds=lease),
+            attempts=F('attempts') + 1,
+        )
+        return list(
+            Job.objects.filter(id__in=ids, status='running', locked_by=worker_id).order_by('-priority', 'run_at', 'id')
+        )
+
+
+def complete(job):
+    """A finished job has nothing left to say; drop its row."""
+    Job.objects.filter(pk=job.pk, locked_by=job.locked_by).delete()
+
+
+def fail(job, error):
+    """Schedule a retry with backoff, or mark the job failed once it is out of attempts."""
+    changes = {'locked_by': '', 'locked_until': None, 'last_error': error}
+    if job.attempts >= job.max_attempts:
+        changes['status'] = 'failed'
+        logger.error("Job %s (%s) failed permanently after %d attempts", job.pk, job.task, job.attempts)
+    else:
+        changes['status'] = 'queued'
+        changes['run_at'] = timezone.now() + timedelta(seconds=backoff(job.attempts))
+    Job.objects.filter(pk=job.pk, locked_by=job.locked_by).update(**changes)
+
+
+def renew_leases(worker_id, job_ids, lease=LEASE_SECONDS):
+    """Extend the leases on jobs this worker is still running."""
+    if job_ids:
+        Job.objects.filter(pk__in=job_ids, locked_by=worker_id, status='running').update(
+            locked_until=timezone.now() + timedelta(seconds=lease)
+        )
+
+
+def requeue_expired():
+    """Hand jobs whose worker stopped renewing its lease back to the queue."""
+    now = timezone.now()
+    expired = Job.objects.filter(status='running', locked_until__lt=now)
+    error = 'Lease expired before the job finished'
+    failed = expired.filter(attempts__gte=F('max_attempts')).update(
+        status='failed', locked_by='', locked_until=None, last_error=error
+    )
+    requeued = expired.update(status='queued', locked_by='', locked_until=None, run_at=now, last_error=error)
+    return requeued + failed
+
+
+def format_error(exc):
+    return ''.join(traceback.format_exception(type(exc), exc, exc.__traceback__))
+
+
+class Worker:
+    """Claims jobs and runs them on a pool of ``concurrency`` threads or processes."""
+
+    def __init__(self, concurrency=4, pool='thread', lease=LEASE_SECONDS, poll_interval=1.0):
+        self.concurrency = concurrency
+        self.pool = pool
+        self.lease = lease
+        self.poll_interval = poll_interval
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.stopping = False
+
+    def stop(self, *args):
+        """Stop claiming new jobs; running ones are allowed to finish."""
+        self.stopping = True
+
+    def _executor(self):
+        if self.pool == 'process':
+            # Spawn rather than fork so children never share the parent's database sockets
+            return ProcessPoolExecutor(
+                max_workers=self.concurrency,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=django.setup,
+            )
+        return ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='job')
+
+    def run(self, burst=False):
+        """
+        Process jobs until stopped. With ``burst`` return once no due jobs
+        are left. Returns the number of jobs that completed successfully.
+        """
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        running = {}  # future -> Job
+        done = 0
+        last_renewal = last_reap = 0
+        with self._executor() as executor:
+            while True:
+                now = time.monotonic()
+                if now - last_reap > self.lease / 2:
+                    last_reap = now
+                    requeue_expired()
+                if running and now - last_renewal > self.lease / 3:
+                    last_renewal = now
+                    renew_leases(self.worker_id, [job.pk for job in running.values()], self.lease)
+
+                free = self.concurrency - len(running)
+                if free and not self.stopping:
+                    for job in claim(self.worker_id, free, self.lease):
+                        running[executor.submit(run_task, job.task, job.args, job.kwargs)] = job
+
+                if not running:
+                    if self.stopping or burst:
+                        return done
+                    time.sleep(self.poll_interval)
+                    continue
+
+                finished, _ = wait(running, timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    job = running.pop(future)
+                    exc = future.exception()
+                    if exc is None:
+                        complete(job)
+                        done += 1
+                    else:
+                        logger.warning("Job %s (%s) failed on attempt %d: %s", job.pk, job.task, job.attempts, exc)
+                        fail(job, format_error(exc))
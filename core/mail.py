@@ -0,0 +1,184 @@
+# core/mail.py
+"""
+Queued, pooled email delivery.
+
+``QueuedEmailBackend`` is the EMAIL_BACKEND for production: ``send_mail``,
+password reset and friends only serialize the message and enqueue a job
+(core.jobs), so no request waits on an SMTP handshake. A ``deliver`` job
+folds in whatever other mail is queued and sends up to EMAIL_BATCH_SIZE
+messages over one authenticated connection from Django's SMTP backend
+(same EMAIL_HOST/PORT/SSL/TLS settings), paced to EMAIL_MAX_PER_MINUTE.
+
+A transient failure (4xx reply, dropped connection, timeout) reconnects
+and retries the message once; a second one in a row requeues only the
+unsent messages with backoff. Permanent 5xx rejections drop that one
+message and log it.
+"""
+import base64
+import logging
+import os
+import smtplib
+import threading
+import time
+
+from django.conf import settings
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.mail.backends.smtp import EmailBackend as SMTPBackend
+from django.core.mail.message import sanitize_address
+
+from .jobs import backoff, claim, complete, enqueue, fail, format_error
+
+logger = logging.getLogger(__name__)
+
+MAX_DELIVERY_ATTEMPTS = 5
+
+
+def _batch_size():
+    return getattr(settings, 'EMAIL_BATCH_SIZE', 50)
+
+
+def serialize_message(message):
+    """Turn an EmailMessage into the JSON-safe [from, recipients, raw MIME] a job can carry."""
+    encoding = message.encoding or settings.DEFAULT_CHARSET
+    from_email = sanitize_address(message.from_email, encoding)
+    recipients = [sanitize_address(address, encoding) for address in message.recipients()]
+    raw = message.message().as_bytes(linesep='\r\n')
+    return [from_email, recipients, base64.b64encode(raw).decode('ascii')]
+
+
+class RateLimiter:
+    """Token bucket shared by every delivery thread in the process."""
+
+    def __init__(self, per_minute):
+        self.interval = 60.0 / per_minute if per_minute else 0
+        self.lock = threading.Lock()
+        self.next_slot = 0.0
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            slot = max(self.next_slot, now)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+_limiter = None
+
+
+def _get_limiter():
+    global _limiter
+    if _limiter is None:
+        _limiter = RateLimiter(getattr(settings, 'EMAIL_MAX_PER_MINUTE', 0))
+    return _limiter
+
+
+def _is_transient(exc):
+    if isinstance(exc, smtplib.SMTPResponseException):
+        return 400 <= exc.smtp_code < 500
+    # Dropped connections, refused connects and timeouts (SMTPException is an OSError too)
+    return isinstance(exc, OSError)
+
+
+def deliver(messages, attempt=1):
+    """
+    Job: send serialized messages in order over one SMTP connection.
+
+    Other queued ``deliver`` jobs are folded into the same connection, up to
+    EMAIL_BATCH_SIZE messages, so one-off mails (password resets) sent
+    around the same time still share a handshake.
+    """
+    worker_id = f"mail:{os.getpid()}:{threading.get_ident()}"
+    merged = claim(worker_id, max(0, _batch_size() - len(messages)), task=deliver)
+    pending = list(messages) + [message for job in merged for message in job.args[0]]
+    try:
+        _send(pending, attempt)
+    except Exception as exc:
+        # Give the folded-in jobs back to the queue with their own retries
+        for job in merged:
+            fail(job, format_error(exc))
+        raise
+    for job in merged:
+        complete(job)
+
+
+def _send(pending, attempt):
+    """
+    Send ``pending`` in order. Anything left unsent after a transient
+    failure is requeued as a new job, so messages that did go out are
+    never sent twice.
+    """
+    limiter = _get_limiter()
+    backend = SMTPBackend(fail_silently=False)
+    reconnected = False
+    try:
+        while pending:
+            from_email, recipients, raw = pending[0]
+            try:
+                if backend.connection is None:
+                    backend.open()
+            except Exception as exc:
+                # Bad credentials or settings are not worth retrying message by message
+                if not _is_transient(exc):
+                    raise
+                _requeue(pending, attempt, exc)
+                return
+
+            limiter.wait()
+            try:
+                refused = backend.connection.sendmail(from_email, recipients, base64.b64decode(raw))
+                if refused:
+                    logger.warning("SMTP server refused some recipients: %s", refused)
+            except smtplib.SMTPRecipientsRefused as exc:
+                logger.error("SMTP server refused every recipient of a message: %s", exc.recipients)
+            except Exception as exc:
+                if not _is_transient(exc):
+                    if not isinstance(exc, smtplib.SMTPResponseException):
+                        raise
+                    logger.error("SMTP server rejected a message to %s: %s", recipients, exc)
+                else:
+                    _close(backend)
+                    if reconnected:
+                        _requeue(pending, attempt, exc)
+                        return
+                    reconnected = True
+                    continue
+            pending.pop(0)
+            reconnected = False
+    finally:
+        _close(backend)
+
+
+def _close(backend):
+    try:
+        backend.close()
+    except Exception:
+        backend.connection = None
+
+
+def _requeue(pending, attempt, exc):
+    if attempt >= MAX_DELIVERY_ATTEMPTS:
+        logger.error("Giving up on %d email(s) after %d attempts: %s", len(pending), attempt, exc)
+        return
+    logger.warning("Email delivery interrupted (%s); retrying %d message(s)", exc, len(pending))
+    enqueue(deliver, args=[pending, attempt + 1], delay=backoff(attempt), priority=5)
+
+
+class QueuedEmailBackend(BaseEmailBackend):
+    """Hands messages to the job queue in batches; ``deliver`` does the sending."""
+
+    def send_messages(self, email_messages):
+        if not email_messages:
+            return 0
+        serialized = [serialize_message(message) for message in email_messages if message.recipients()]
+        batch_size = _batch_size()
+        try:
+            for start in range(0, len(serialized), batch_size):
+                enqueue(deliver, args=[serialized[start:start + batch_size]], priority=5)
+        except Exception:
+            if not self.fail_silently:
+                raise
+            return 0
+        return len(serialized)
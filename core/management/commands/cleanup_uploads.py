@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core.uploads import cleanup_uploads
+
+
+class Command(BaseCommand):
+    help = 'Delete chunked chat uploads that have been abandoned, and their temporary files'
+
+    def handle(self, *args, **kwargs):
+        removed = cleanup_uploads()
+        self.stdout.write(self.style.SUCCESS(f'Removed {removed} abandoned uploads.'))
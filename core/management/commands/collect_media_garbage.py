@@ -0,0 +1,23 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from core.storage import GC_GRACE, collect_garbage
+
+
+class Command(BaseCommand):
+    help = 'Delete stored media blobs that nothing has referred to for a while'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace', type=int, default=int(GC_GRACE.total_seconds() // 60),
+            help='Minutes a blob must have gone unreferenced (default: %(default)s)',
+        )
+        parser.add_argument(
+            '--orphans', action='store_true',
+            help='Also scan the blob directories for files with no MediaBlob row and stale temporary files',
+        )
+
+    def handle(self, *args, **options):
+        removed = collect_garbage(timedelta(minutes=options['grace']), orphans=options['orphans'])
+        self.stdout.write(self.style.SUCCESS(f'Removed {removed} files.'))
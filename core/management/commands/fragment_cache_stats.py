@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from core.fragments import report, reset_stats
+
+
+class Command(BaseCommand):
+    help = 'Report hit rates and render time saved for each cached template fragment'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help='Zero the counters after reporting')
+
+    def handle(self, *args, **options):
+        rows = report()
+        if not rows:
+            self.stdout.write('No fragment lookups recorded.')
+        else:
+            self.stdout.write(
+                f"{'fragment':<30} {'hits':>8} {'misses':>8} {'hit rate':>9} "
+                f"{'render ms':>10} {'hit ms':>8} {'saved s':>9}"
+            )
+            for row in rows:
+                self.stdout.write(
+                    f'{row.name:<30} {row.hits:>8} {row.misses:>8} {row.hit_rate:>9.1%} '
+                    f'{row.render_ms:>10.2f} {row.hit_ms:>8.2f} {row.saved_seconds:>9.3f}'
+                )
+        if options['reset']:
+            reset_stats()
+            self.stdout.write(self.style.SUCCESS('Counters reset.'))
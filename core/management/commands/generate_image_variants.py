@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from core.images import SOURCES, needs_variants, process
+
+
+class Command(BaseCommand):
+    help = 'Write the resized variants of profile photos and image attachments that have none yet'
+
+    def handle(self, *args, **kwargs):
+        processed = 0
+        for source, (model, file_field, variants_field) in SOURCES.items():
+            rows = model.objects.exclude(**{file_field: ''}).exclude(**{f'{file_field}__isnull': True})
+            for row in rows.only('pk', file_field, variants_field).iterator():
+                if needs_variants(getattr(row, file_field), getattr(row, variants_field)):
+                    process(source, row.pk)
+                    processed += 1
+        self.stdout.write(self.style.SUCCESS(f'Processed {processed} images.'))
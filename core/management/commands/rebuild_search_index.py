@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search documents for every skill'
+
+    def handle(self, *args, **kwargs):
+        with transaction.atomic():
+            rebuilt = rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f'Indexed {rebuilt} skills.'))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core import fragments
+from core.stats import rebuild_skill_stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute SkillStats rows from SkillRequest and Review (backfill / drift repair)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('skill_ids', nargs='*', type=int, help='Only rebuild these skills')
+
+    def handle(self, *args, **options):
+        skill_ids = options['skill_ids'] or None
+        with transaction.atomic():
+            rebuilt = rebuild_skill_stats(skill_ids)
+            # The bulk upsert sends no signals; drop the fragments showing the old counts
+            if skill_ids:
+                fragments.bump('skill', *skill_ids)
+            else:
+                fragments.invalidate_all()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt stats for {rebuilt} skills.'))
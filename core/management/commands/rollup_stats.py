@@ -0,0 +1,24 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from core.analytics import rollup_days
+
+
+class Command(BaseCommand):
+    help = 'Roll up daily platform activity into DailyStats, from the last rolled-up day through today'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', help='Recompute from this day (YYYY-MM-DD) instead of the last rolled-up day')
+
+    def handle(self, *args, **options):
+        start = None
+        if options['since']:
+            try:
+                start = date.fromisoformat(options['since'])
+            except ValueError:
+                raise CommandError('--since must be a date like 2025-01-31')
+        with transaction.atomic():
+            written = rollup_days(start)
+        self.stdout.write(self.style.SUCCESS(f'Rolled up {written} days.'))
@@ -0,0 +1,31 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from core.reminders import HORIZON, REMINDER_LEAD, ReminderScheduler
+
+
+class Command(BaseCommand):
+    help = 'Send meeting reminders as they fall due (see core.reminders)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lead', type=int, default=int(REMINDER_LEAD.total_seconds() // 60),
+            help='Minutes before a meeting to remind its participants',
+        )
+        parser.add_argument(
+            '--horizon', type=int, default=int(HORIZON.total_seconds() // 3600),
+            help='Hours of upcoming reminders kept in memory',
+        )
+        parser.add_argument('--poll-interval', type=float, default=5.0, help='Seconds between checks for changed meetings')
+        parser.add_argument('--once', action='store_true', help='Send the reminders due now and exit')
+
+    def handle(self, *args, **options):
+        scheduler = ReminderScheduler(
+            lead=timedelta(minutes=options['lead']),
+            horizon=timedelta(hours=options['horizon']),
+            poll_interval=options['poll_interval'],
+        )
+        self.stdout.write(f'Reminder scheduler started ({options["lead"]} min lead, {options["horizon"]}h horizon).')
+        sent = scheduler.run(once=options['once'])
+        self.stdout.write(self.style.SUCCESS(f'Reminder scheduler stopped after {sent} notifications.'))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from core.analytics import schedule_rollup
+from core.jobs import LEASE_SECONDS, Worker
+
+
+class Command(BaseCommand):
+    help = 'Run queued background jobs (see core.jobs)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=4, help='Jobs to run at once')
+        parser.add_argument('--pool', choices=['thread', 'process'], default='thread')
+        parser.add_argument('--lease', type=int, default=LEASE_SECONDS, help='Seconds a claimed job stays locked')
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='Seconds between queue checks when idle')
+        parser.add_argument('--burst', action='store_true', help='Exit once no due jobs are left')
+
+    def handle(self, *args, **options):
+        # Recurring jobs queue their own next run; start any chain that isn't running
+        schedule_rollup()
+        worker = Worker(
+            concurrency=options['concurrency'],
+            pool=options['pool'],
+            lease=options['lease'],
+            poll_interval=options['poll_interval'],
+        )
+        self.stdout.write(f'Worker {worker.worker_id} started ({options["pool"]} pool x{options["concurrency"]}).')
+        done = worker.run(burst=options['burst'])
+        self.stdout.write(self.style.SUCCESS(f'Worker stopped after {done} jobs.'))
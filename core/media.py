@@ -0,0 +1,170 @@
+# core/media.py
+"""
+Serving uploaded media.
+
+``serve_media`` answers every MEDIA_URL request in place of
+``django.conf.urls.static``:
+
+* Attachments, and the resized variants of image attachments, are only
+  served to the two people in their message (and staff). Profile photos
+  and their variants are served to any signed-in user; files nothing
+  refers to are served to no one.
+* ETag and Last-Modified come from one ``stat()``; a blob's ETag is its
+  hash and, since its content can never change, it is cached as
+  immutable. Revalidations get 304 without opening the file.
+* With ``MEDIA_OFFLOAD`` set, the front server sends the bytes:
+  ``'x-accel-redirect'`` (nginx, an internal location at
+  MEDIA_ACCEL_PREFIX mapped to MEDIA_ROOT) or ``'x-sendfile'`` (Apache,
+  lighttpd). It also answers Range requests itself.
+* Otherwise a FileResponse streams the file, or the requested single
+  byte range with 206. Under gunicorn it goes out through
+  ``wsgi.file_wrapper`` (sendfile), so the worker doesn't copy the bytes.
+"""
+import mimetypes
+import os
+import stat
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import default_storage
+from django.db.models import Q
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, parse_http_date_safe
+
+from .models import MediaBlob, Message, StudentProfile
+from .storage import TEMP_DIR, is_blob
+
+# Served inline; anything else is a download, so uploaded HTML or SVG never renders on our origin
+INLINE_TYPES = {'application/pdf', 'image/jpeg', 'image/png', 'image/gif', 'image/webp', 'video/mp4', 'audio/mpeg'}
+BLOB_MAX_AGE = 60 * 60 * 24 * 365
+FILE_MAX_AGE = 60 * 60
+
+
+def can_access(user, name):
+    """
+    Whether ``user`` (signed in) may download the stored file ``name``:
+    profile photos to anyone, attachments to their sender and recipient,
+    an image variant to whoever may see its source, and nothing else.
+    """
+    if name.startswith(TEMP_DIR + '/'):
+        return False
+    if user.is_staff:
+        return True
+    source = MediaBlob.objects.filter(name=name).values_list('variant_of', flat=True).first() or name
+    # The same bytes may be both someone's profile photo and an attachment
+    return (
+        StudentProfile.objects.filter(photo=source).exists()
+        or Message.objects.filter(Q(from_user=user) | Q(to_user=user), attachment=source).exists()
+    )
+
+
+def validators(name, file_stat):
+    """``(etag, last_modified)`` for a stored file."""
+    if is_blob(name):
+        etag = '"%s"' % os.path.splitext(os.path.basename(name))[0]
+    else:
+        etag = '"%x-%x"' % (file_stat.st_mtime_ns, file_stat.st_size)
+    return etag, int(file_stat.st_mtime)
+
+
+def requested_range(request, size, etag, last_modified):
+    """
+    ``None`` to send the whole file, ``(start, end)`` inclusive for one
+    satisfiable range, or ``False`` if the range can't be satisfied. Only
+    single ranges are served; other forms get the whole file, as the
+    Range header allows.
+    """
+    header = request.META.get('HTTP_RANGE', '')
+    if not header.startswith('bytes=') or ',' in header:
+        return None
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if if_range and if_range != etag and parse_http_date_safe(if_range) != last_modified:
+        return None  # the client's copy is out of date, so send all of it
+    first, _, last = header[6:].strip().partition('-')
+    try:
+        if first:
+            start, end = int(first), int(last) if last else size - 1
+        elif last:
+            start, end = max(size - int(last), 0), size - 1
+        else:
+            return None
+    except ValueError:
+        return None
+    if start >= size or start > end:
+        return False
+    return start, min(end, size - 1)
+
+
+class RangeFile:
+    """A file object that reads ``length`` bytes from ``start``; keeps fileno() for sendfile."""
+
+    def __init__(self, file, start, length):
+        file.seek(start)
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size) if size else b''
+        self.remaining -= len(data)
+        return data
+
+    def tell(self):
+        return self.file.tell()
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+def serve(request, name, storage=default_storage):
+    try:
+        path = storage.path(name)
+        file_stat = os.stat(path)
+    except (SuspiciousFileOperation, OSError):
+        raise Http404("No such file")
+    if not stat.S_ISREG(file_stat.st_mode):
+        raise Http404("No such file")
+
+    etag, last_modified = validators(name, file_stat)
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+        offload = getattr(settings, 'MEDIA_OFFLOAD', None)
+        if offload == 'x-accel-redirect':
+            response = HttpResponse(content_type=content_type)
+            response['X-Accel-Redirect'] = quote(getattr(settings, 'MEDIA_ACCEL_PREFIX', '/protected-media/') + name)
+        elif offload == 'x-sendfile':
+            response = HttpResponse(content_type=content_type)
+            response['X-Sendfile'] = path
+        else:
+            byte_range = requested_range(request, file_stat.st_size, etag, last_modified)
+            if byte_range is False:
+                response = HttpResponse(status=416)
+                response['Content-Range'] = f'bytes */{file_stat.st_size}'
+                return response
+            if byte_range:
+                start, end = byte_range
+                response = FileResponse(
+                    RangeFile(open(path, 'rb'), start, end - start + 1), status=206, content_type=content_type
+                )
+                response['Content-Range'] = f'bytes {start}-{end}/{file_stat.st_size}'
+                response['Content-Length'] = end - start + 1
+            else:
+                response = FileResponse(open(path, 'rb'), content_type=content_type)
+            response['Accept-Ranges'] = 'bytes'
+        if content_type not in INLINE_TYPES:
+            response['Content-Disposition'] = 'attachment'
+
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    if is_blob(name):
+        patch_cache_control(response, private=True, max_age=BLOB_MAX_AGE, immutable=True)
+    else:
+        patch_cache_control(response, private=True, max_age=FILE_MAX_AGE)
+    return response
@@ -0,0 +1,97 @@
+# core/message_writer.py
+"""
+Batched, asynchronous persistence for chat messages sent over WebSocket.
+
+Consumers hand messages to a per-event-loop MessageBatchWriter and await
+the result. A single background task drains the queue and writes whatever
+has accumulated with one ``bulk_create`` in a worker thread, so a quiet
+room pays no extra latency while a busy room coalesces many sends into
+few INSERTs (group commit).
+"""
+import asyncio
+import logging
+import weakref
+
+from channels.db import database_sync_to_async
+
+from .counters import invalidate_badge_counts
+from .models import Conversation, Message
+
+logger = logging.getLogger(__name__)
+
+MAX_BATCH_SIZE = 200
+
+_writers = weakref.WeakKeyDictionary()
+
+
+def _write_batch(messages):
+    Conversation.objects.bulk_add_messages(messages)
+    # bulk_create skips post_save, so refresh the recipients' badges here
+    invalidate_badge_counts(*{message.to_user_id for message in messages})
+    return messages
+
+
+class MessageBatchWriter:
+    def __init__(self, max_batch_size=MAX_BATCH_SIZE):
+        self.max_batch_size = max_batch_size
+        self.queue = asyncio.Queue()
+        self._task = None
+
+    async def submit(self, from_user_id, to_user_id, content):
+        """Queue a message for writing and wait until it has been committed."""
+        future = asyncio.get_running_loop().create_future()
+        message = Message(from_user_id=from_user_id, to_user_id=to_user_id, content=content)
+        self.queue.put_nowait((message, future))
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return await future
+
+    async def _run(self):
+        while True:
+            batch = [await self.queue.get()]
+            # Take everything that piled up while the previous batch was writing
+            while len(batch) < self.max_batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+
+            try:
+                await database_sync_to_async(_write_batch)([message for message, _ in batch])
+            except Exception:
+                if len(batch) == 1:
+                    logger.exception("Failed to write a chat message")
+                    self._resolve(batch, error=True)
+                    continue
+                # One bad row shouldn't fail the whole batch: retry individually
+                logger.warning("Batch of %d chat messages failed, retrying one by one", len(batch))
+                for item in batch:
+                    try:
+                        await database_sync_to_async(_write_batch)([item[0]])
+                    except Exception:
+                        logger.exception("Failed to write a chat message")
+                        self._resolve([item], error=True)
+                    else:
+                        self._resolve([item])
+                continue
+
+            self._resolve(batch)
+
+    @staticmethod
+    def _resolve(batch, error=False):
+        for message, future in batch:
+            if future.done():
+                continue
+            if error:
+                future.set_exception(RuntimeError("Message could not be saved"))
+            else:
+                future.set_result(message)
+
+
+def get_writer():
+    """Return the writer bound to the running event loop, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    writer = _writers.get(loop)
+    if writer is None:
+        writer = _writers[loop] = MessageBatchWriter()
+    return writer
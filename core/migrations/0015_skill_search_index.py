@@ -0,0 +1,64 @@
+from django.db import migrations
+
+# The search side table is backend specific, so it is created with raw SQL
+# instead of a model. See core/search.py for how it is queried.
+
+
+def create_search_table(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute(
+            """
+            CREATE TABLE core_skill_search (
+                skill_id bigint PRIMARY KEY REFERENCES core_skill (id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED,
+                document tsvector NOT NULL
+            )
+            """
+        )
+        schema_editor.execute(
+            "CREATE INDEX core_skill_search_document_gin ON core_skill_search USING GIN (document)"
+        )
+        schema_editor.execute(
+            """
+            INSERT INTO core_skill_search (skill_id, document)
+            SELECT s.id,
+                setweight(to_tsvector('english', s.title), 'A') ||
+                setweight(to_tsvector('english', s.category), 'B') ||
+                setweight(to_tsvector('english', concat_ws(' ', u.username, u.first_name, u.last_name)), 'B') ||
+                setweight(to_tsvector('english', s.description), 'C')
+            FROM core_skill s JOIN auth_user u ON u.id = s.owner_id
+            """
+        )
+    elif vendor == 'sqlite':
+        try:
+            schema_editor.execute(
+                "CREATE VIRTUAL TABLE core_skill_search USING fts5("
+                "title, category, description, owner_names, tokenize = 'porter unicode61')"
+            )
+        except Exception:
+            # SQLite built without FTS5: search falls back to LIKE matching
+            return
+        schema_editor.execute(
+            """
+            INSERT INTO core_skill_search (rowid, title, category, description, owner_names)
+            SELECT s.id, s.title, s.category, s.description,
+                u.username || ' ' || u.first_name || ' ' || u.last_name
+            FROM core_skill s JOIN auth_user u ON u.id = s.owner_id
+            """
+        )
+
+
+def drop_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor in ('postgresql', 'sqlite'):
+        schema_editor.execute("DROP TABLE IF EXISTS core_skill_search")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_skillrequest_completed_at_skillrequest_started_at_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_table, drop_search_table),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 5.2.7 on 2026-10-18 17:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+STATUS_FIELDS = {
+    'PENDING': 'pending_requests',
+    'ACCEPTED': 'accepted_requests',
+    'APPROVED': 'approved_requests',
+    'REJECTED': 'rejected_requests',
+    'IN_PROGRESS': 'in_progress_requests',
+    'COMPLETED': 'completed_requests',
+}
+
+
+def backfill_skill_stats(apps, schema_editor):
+    Skill = apps.get_model('core', 'Skill')
+    SkillRequest = apps.get_model('core', 'SkillRequest')
+    Review = apps.get_model('core', 'Review')
+    SkillStats = apps.get_model('core', 'SkillStats')
+
+    requests = {
+        row.pop('skill_id'): row
+        for row in SkillRequest.objects.values('skill_id').annotate(
+            total_requests=Count('pk'),
+            **{name: Count('pk', filter=Q(status=status)) for status, name in STATUS_FIELDS.items()}
+        ).order_by()
+    }
+    reviews = {
+        row.pop('skill_id'): row
+        for row in Review.objects.values('skill_id').annotate(
+            review_count=Count('pk'), rating_count=Count('rating'), rating_sum=Sum('rating'),
+        ).order_by()
+    }
+
+    rows = []
+    for skill_id in Skill.objects.values_list('pk', flat=True):
+        stats = SkillStats(skill_id=skill_id, **requests.get(skill_id, {}))
+        for field, value in reviews.get(skill_id, {}).items():
+            setattr(stats, field, value or 0)
+        stats.average_rating = stats.rating_sum / stats.rating_count if stats.rating_count else None
+        rows.append(stats)
+    SkillStats.objects.bulk_create(rows, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_skill_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SkillStats',
+            fields=[
+                ('skill', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='core.skill')),
+                ('total_requests', models.PositiveIntegerField(default=0)),
+                ('pending_requests', models.PositiveIntegerField(default=0)),
+                ('accepted_requests', models.PositiveIntegerField(default=0)),
+                ('approved_requests', models.PositiveIntegerField(default=0)),
+                ('rejected_requests', models.PositiveIntegerField(default=0)),
+                ('in_progress_requests', models.PositiveIntegerField(default=0)),
+                ('completed_requests', models.PositiveIntegerField(default=0)),
+                ('review_count', models.PositiveIntegerField(default=0)),
+                ('rating_count', models.PositiveIntegerField(default=0)),
+                ('rating_sum', models.PositiveIntegerField(default=0)),
+                ('average_rating', models.FloatField(blank=True, null=True)),
+                ('last_activity_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name_plural': 'skill stats',
+                'indexes': [models.Index(fields=['-total_requests'], name='skillstats_popular_idx'), models.Index(fields=['-average_rating'], name='skillstats_rating_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_skill_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,112 @@
+# Generated by Django 5.2.7 on 2026-10-18 17:55
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_conversations(apps, schema_editor):
+    """Build one Conversation per user pair and number the existing messages."""
+    Message = apps.get_model('core', 'Message')
+    Conversation = apps.get_model('core', 'Conversation')
+
+    def pair(a, b):
+        return (a, b) if a <= b else (b, a)
+
+    # Pass 1: per-pair totals, latest message and unread counters
+    state = {}
+    for msg in Message.objects.order_by('sent_at', 'id').values(
+        'id', 'from_user_id', 'to_user_id', 'sent_at', 'is_read'
+    ).iterator(chunk_size=2000):
+        key = pair(msg['from_user_id'], msg['to_user_id'])
+        conv = state.setdefault(key, {'count': 0, 'unread_a': 0, 'unread_b': 0})
+        conv['count'] += 1
+        conv['last_message_id'] = msg['id']
+        conv['last_message_at'] = msg['sent_at']
+        if not msg['is_read'] and msg['from_user_id'] != msg['to_user_id']:
+            conv['unread_a' if msg['to_user_id'] == key[0] else 'unread_b'] += 1
+
+    Conversation.objects.bulk_create([
+        Conversation(
+            user_a_id=key[0],
+            user_b_id=key[1],
+            last_message_id=conv['last_message_id'],
+            last_message_at=conv['last_message_at'],
+            last_sequence=conv['count'],
+            unread_a=conv['unread_a'],
+            unread_b=conv['unread_b'],
+        )
+        for key, conv in state.items()
+    ], batch_size=1000)
+    conversation_ids = {
+        (row['user_a_id'], row['user_b_id']): row['id']
+        for row in Conversation.objects.values('id', 'user_a_id', 'user_b_id')
+    }
+
+    # Pass 2: attach messages and assign sequence numbers in batches
+    sequences = {}
+    batch = []
+    for msg in Message.objects.order_by('sent_at', 'id').only(
+        'id', 'from_user_id', 'to_user_id'
+    ).iterator(chunk_size=2000):
+        key = pair(msg.from_user_id, msg.to_user_id)
+        sequences[key] = sequences.get(key, 0) + 1
+        msg.conversation_id = conversation_ids[key]
+        msg.sequence = sequences[key]
+        batch.append(msg)
+        if len(batch) >= 1000:
+            Message.objects.bulk_update(batch, ['conversation', 'sequence'])
+            batch = []
+    if batch:
+        Message.objects.bulk_update(batch, ['conversation', 'sequence'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_skillstats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='message',
+            name='sequence',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='Conversation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_message_at', models.DateTimeField(blank=True, null=True)),
+                ('last_sequence', models.PositiveIntegerField(default=0)),
+                ('unread_a', models.PositiveIntegerField(default=0)),
+                ('unread_b', models.PositiveIntegerField(default=0)),
+                ('last_message', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='core.message')),
+                ('user_a', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('user_b', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='message',
+            name='conversation',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='messages', to='core.conversation'),
+        ),
+        migrations.AddIndex(
+            model_name='conversation',
+            index=models.Index(fields=['user_a', '-last_message_at'], name='conversation_user_a_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='conversation',
+            index=models.Index(fields=['user_b', '-last_message_at'], name='conversation_user_b_recent_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='conversation',
+            constraint=models.UniqueConstraint(fields=('user_a', 'user_b'), name='conversation_unique_pair'),
+        ),
+        migrations.AddConstraint(
+            model_name='conversation',
+            constraint=models.CheckConstraint(condition=models.Q(('user_a__lte', models.F('user_b'))), name='conversation_ordered_pair'),
+        ),
+        migrations.RunPython(backfill_conversations, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 18:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0019_channel_layer'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='notification',
+            name='notification_type',
+            field=models.CharField(choices=[('message', 'New Message'), ('meeting_invite', 'Meeting Invitation'), ('meeting_update', 'Meeting Update'), ('skill_request', 'Skill Request'), ('skill_session', 'Skill Session Started'), ('skill_completed', 'Skill Session Completed'), ('review', 'New Review')], default='message', max_length=20),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.7 on 2026-10-18 18:14
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('core', '0021_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WeeklyAvailability',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='weekly_availability', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('slots', models.BinaryField(default=bytes, max_length=84)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
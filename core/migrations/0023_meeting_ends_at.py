@@ -0,0 +1,38 @@
+# Generated by Django 5.2.7 on 2026-10-18 18:31
+
+from datetime import timedelta
+
+from django.db import migrations, models
+
+
+def backfill_ends_at(apps, schema_editor):
+    Meeting = apps.get_model('core', 'Meeting')
+    meetings = list(Meeting.objects.only('scheduled_date', 'duration_minutes'))
+    for meeting in meetings:
+        meeting.ends_at = meeting.scheduled_date + timedelta(minutes=meeting.duration_minutes)
+    Meeting.objects.bulk_update(meetings, ['ends_at'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0022_weekly_availability'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='meeting',
+            name='ends_at',
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_ends_at, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='meeting',
+            name='ends_at',
+            field=models.DateTimeField(editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='meeting',
+            index=models.Index(fields=['scheduled_date', 'ends_at'], name='meeting_time_range_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-18 18:27
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0024_meeting_recurrence'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MeetingChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('meeting_id', models.BigIntegerField()),
+                ('series_id', models.BigIntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='notification',
+            name='notification_type',
+            field=models.CharField(choices=[('message', 'New Message'), ('meeting_invite', 'Meeting Invitation'), ('meeting_update', 'Meeting Update'), ('skill_request', 'Skill Request'), ('skill_session', 'Skill Session Started'), ('skill_completed', 'Skill Session Completed'), ('review', 'New Review'), ('meeting_reminder', 'Meeting Reminder')], default='message', max_length=20),
+        ),
+    ]
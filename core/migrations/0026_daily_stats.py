@@ -0,0 +1,40 @@
+# Generated by Django 5.2.7 on 2026-10-18 18:31
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0025_meeting_reminders'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyStats',
+            fields=[
+                ('date', models.DateField(primary_key=True, serialize=False)),
+                ('new_users', models.PositiveIntegerField(default=0)),
+                ('new_skills', models.PositiveIntegerField(default=0)),
+                ('new_requests', models.PositiveIntegerField(default=0)),
+                ('completed_swaps', models.PositiveIntegerField(default=0)),
+                ('new_reviews', models.PositiveIntegerField(default=0)),
+                ('rating_count', models.PositiveIntegerField(default=0)),
+                ('rating_sum', models.PositiveIntegerField(default=0)),
+                ('new_meetings', models.PositiveIntegerField(default=0)),
+                ('meetings_held', models.PositiveIntegerField(default=0)),
+                ('total_users', models.PositiveIntegerField(blank=True, null=True)),
+                ('total_skills', models.PositiveIntegerField(blank=True, null=True)),
+                ('total_meetings', models.PositiveIntegerField(blank=True, null=True)),
+                ('average_rating', models.FloatField(blank=True, null=True)),
+                ('requests_by_status', models.JSONField(blank=True, null=True)),
+                ('top_categories', models.JSONField(blank=True, null=True)),
+                ('rolled_up_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name_plural': 'daily stats',
+                'ordering': ['date'],
+            },
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.7 on 2026-10-18 18:33
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0026_daily_stats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='report',
+            index=models.Index(fields=['created_at', 'id'], name='report_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='report',
+            index=models.Index(fields=['resolved', 'created_at', 'id'], name='report_resolved_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['created_at', 'id'], name='review_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['rating', 'created_at', 'id'], name='review_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skill',
+            index=models.Index(fields=['created_at', 'id'], name='skill_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skill',
+            index=models.Index(fields=['title', 'id'], name='skill_title_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skill',
+            index=models.Index(fields=['category', 'created_at', 'id'], name='skill_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skillrequest',
+            index=models.Index(fields=['created_at', 'id'], name='request_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skillrequest',
+            index=models.Index(fields=['status', 'created_at', 'id'], name='request_status_idx'),
+        ),
+    ]
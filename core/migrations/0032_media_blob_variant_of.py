@@ -0,0 +1,31 @@
+# Generated by Django 5.2.7 on 2026-10-18 18:58
+
+from django.db import migrations, models
+
+
+def link_variants(apps, schema_editor):
+    """Point the blobs of variants written so far at their source image."""
+    MediaBlob = apps.get_model('core', 'MediaBlob')
+    for model_name, variants_field in [('StudentProfile', 'photo_variants'), ('Message', 'attachment_variants')]:
+        model = apps.get_model('core', model_name)
+        for record in model.objects.exclude(**{variants_field: {}}).values_list(variants_field, flat=True).iterator():
+            if not record or not record.get('source'):
+                continue
+            names = [name for entry in record.get('sizes', {}).values() for name in (entry.get('webp'), entry.get('jpeg'))]
+            MediaBlob.objects.filter(name__in=[name for name in names if name]).update(variant_of=record['source'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0031_chunked_uploads'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mediablob',
+            name='variant_of',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.RunPython(link_variants, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,12 @@
-from datetime import timedelta
-from django.db import models
+import copy
+import uuid
+from datetime import datetime, timedelta, timezone as dt_timezone
+from urllib.parse import urlencode
+from django.db import models, transaction
+from django.db.models import Case, Exists, F, OuterRef, Q, Value, When
+from django.db.models.functions import Coalesce, Round
 from django.contrib.auth.models import User
+from django.urls import reverse
 from django.utils import timezone
 from django.db.models.signals import post_save
 from django.dispatch import receiver
@@ -9,7 +15,8 @@ from django.dispatch import receiver
 # ------------------ PROFILE ------------------
 class StudentProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
-    photo = models.ImageField(upload_to='profile_photos/', blank=True, null=True)
+    photo = models.ImageField(upload_to='profile_photos/', blank=True, null=True, db_index=True)
+    photo_variants = models.JSONField(default=dict, blank=True, editable=False)  # resized copies, see core.images
     bio = models.TextField(blank=True)
     course = models.CharField(max_length=100, blank=True)
     year = models.CharField(max_length=20, blank=True)
@@ -17,6 +24,13 @@ class StudentProfile(models.Model):
     skills_offered = models.TextField(blank=True, help_text="Skills you can teach (comma-separated)")
     skills_wanted = models.TextField(blank=True, help_text="Skills you want to learn (comma-separated)")
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        # Remember the loaded photo so core.storage can release it when it is replaced
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
     def __str__(self):
         return f"{self.user.username}'s Profile"
 
@@ -31,6 +45,27 @@ def create_or_update_student_profile(sender, instance, created, **kwargs):
 
 
 # ------------------ SKILL ------------------
+class SkillQuerySet(models.QuerySet):
+    def with_card_stats(self):
+        """Annotate what a skill card needs: average_rating, request_count, is_new.
+
+        Counts come from the denormalized SkillStats row (a single LEFT JOIN),
+        so nothing is aggregated at read time.
+        """
+        # "New" means created within the last 7 days
+        new_since = timezone.now() - timedelta(days=8)
+
+        return self.select_related('owner').annotate(
+            average_rating=Round('stats__average_rating', 1),
+            request_count=Coalesce('stats__total_requests', 0),
+            is_new=Case(
+                When(created_at__gt=new_since, then=Value(True)),
+                default=Value(False),
+                output_field=models.BooleanField(),
+            ),
+        )
+
+
 class Skill(models.Model):
     owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='skills')
     title = models.CharField(max_length=200)
@@ -40,6 +75,16 @@ class Skill(models.Model):
     availability = models.CharField(max_length=50, blank=True)
     created_at = models.DateTimeField(default=timezone.now)
 
+    objects = SkillQuerySet.as_manager()
+
+    class Meta:
+        # Keyset sorts and filters for the management lists (core.admin_lists)
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='skill_created_idx'),
+            models.Index(fields=['title', 'id'], name='skill_title_idx'),
+            models.Index(fields=['category', 'created_at', 'id'], name='skill_category_idx'),
+        ]
+
     def __str__(self):
         return f"{self.title} by {self.owner.username}"
 
@@ -62,6 +107,19 @@ class SkillRequest(models.Model):
     started_at = models.DateTimeField(null=True, blank=True) 
     completed_at = models.DateTimeField(null=True, blank=True)  
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='request_created_idx'),
+            models.Index(fields=['status', 'created_at', 'id'], name='request_status_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        # Remember the loaded values so SkillStats can apply status transitions
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
     def __str__(self):
         return f"Request {self.id}: {self.requester.username} -> {self.skill.title} ({self.status})"
 
@@ -74,10 +132,110 @@ class Review(models.Model):
     comment = models.TextField(blank=True)
     created_at = models.DateTimeField(default=timezone.now)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='review_created_idx'),
+            models.Index(fields=['rating', 'created_at', 'id'], name='review_rating_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        # Remember the loaded values so SkillStats can apply rating edits
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
     def __str__(self):
         return f"Review for {self.skill.title} - {self.rating}/5"
 
 
+# ------------------ SKILL STATS ------------------
+class SkillStats(models.Model):
+    """
+    Denormalized per-skill counters, maintained incrementally by core.stats
+    and rebuilt from scratch with ``manage.py rebuild_skill_stats``.
+    """
+    # Maps SkillRequest.status to the counter column it feeds
+    STATUS_FIELDS = {
+        'PENDING': 'pending_requests',
+        'ACCEPTED': 'accepted_requests',
+        'APPROVED': 'approved_requests',
+        'REJECTED': 'rejected_requests',
+        'IN_PROGRESS': 'in_progress_requests',
+        'COMPLETED': 'completed_requests',
+    }
+
+    skill = models.OneToOneField(Skill, on_delete=models.CASCADE, primary_key=True, related_name='stats')
+    total_requests = models.PositiveIntegerField(default=0)
+    pending_requests = models.PositiveIntegerField(default=0)
+    accepted_requests = models.PositiveIntegerField(default=0)
+    approved_requests = models.PositiveIntegerField(default=0)
+    rejected_requests = models.PositiveIntegerField(default=0)
+    in_progress_requests = models.PositiveIntegerField(default=0)
+    completed_requests = models.PositiveIntegerField(default=0)
+    review_count = models.PositiveIntegerField(default=0)
+    rating_count = models.PositiveIntegerField(default=0)  # reviews that carry a rating
+    rating_sum = models.PositiveIntegerField(default=0)
+    average_rating = models.FloatField(null=True, blank=True)
+    last_activity_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name_plural = 'skill stats'
+        indexes = [
+            models.Index(fields=['-total_requests'], name='skillstats_popular_idx'),
+            models.Index(fields=['-average_rating'], name='skillstats_rating_idx'),
+        ]
+
+    def __str__(self):
+        return f"Stats for skill {self.skill_id}: {self.total_requests} requests"
+
+    @property
+    def approval_rate(self):
+        if not self.total_requests:
+            return 0
+        return round((self.approved_requests / self.total_requests) * 100)
+
+
+# ------------------ DAILY STATS ------------------
+class DailyStats(models.Model):
+    """
+    One row per day (TIME_ZONE) of platform activity, written by
+    ``manage.py rollup_stats`` (core.analytics) and read by the admin
+    dashboard. The counters are that day's activity; the ``total_*``,
+    status and category snapshot fields hold the platform totals as of the
+    row's last rollup, and stay empty for backfilled days.
+    """
+    date = models.DateField(primary_key=True)
+    new_users = models.PositiveIntegerField(default=0)
+    new_skills = models.PositiveIntegerField(default=0)
+    new_requests = models.PositiveIntegerField(default=0)
+    completed_swaps = models.PositiveIntegerField(default=0)  # requests completed that day
+    new_reviews = models.PositiveIntegerField(default=0)
+    rating_count = models.PositiveIntegerField(default=0)  # that day's reviews that carry a rating
+    rating_sum = models.PositiveIntegerField(default=0)
+    new_meetings = models.PositiveIntegerField(default=0)
+    meetings_held = models.PositiveIntegerField(default=0)  # not cancelled, starting that day
+
+    total_users = models.PositiveIntegerField(null=True, blank=True)
+    total_skills = models.PositiveIntegerField(null=True, blank=True)
+    total_meetings = models.PositiveIntegerField(null=True, blank=True)
+    average_rating = models.FloatField(null=True, blank=True)
+    requests_by_status = models.JSONField(null=True, blank=True)  # {status: count}
+    top_categories = models.JSONField(null=True, blank=True)  # [[category, skills], ...]
+    rolled_up_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['date']
+        verbose_name_plural = 'daily stats'
+
+    def __str__(self):
+        return f"Stats for {self.date}"
+
+    @property
+    def day_average_rating(self):
+        return self.rating_sum / self.rating_count if self.rating_count else None
+
+
 # ------------------ MESSAGE ------------------
 class Message(models.Model):
     from_user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='messages_sent')
@@ -85,12 +243,284 @@ class Message(models.Model):
     content = models.TextField(blank=True, null=True)
     sent_at = models.DateTimeField(auto_now_add=True)
     is_read = models.BooleanField(default=False)
-    attachment = models.FileField(upload_to='attachments/', blank=True, null=True)
+    attachment = models.FileField(upload_to='attachments/', blank=True, null=True, db_index=True)
+    attachment_variants = models.JSONField(default=dict, blank=True, editable=False)  # resized copies of an image, see core.images
     reply_to = models.ForeignKey('self', null=True, blank=True, on_delete=models.SET_NULL, related_name='replies')
+    conversation = models.ForeignKey('Conversation', null=True, blank=True, on_delete=models.CASCADE, related_name='messages')
+    sequence = models.PositiveIntegerField(null=True, blank=True)  # position within the conversation
+
+    class Meta:
+        indexes = [
+            # Keyset pagination of a conversation's history by (sent_at, id)
+            models.Index(fields=['conversation', 'sent_at', 'id'], name='message_conversation_time_idx'),
+        ]
 
     def __str__(self):
         return f"From {self.from_user} to {self.to_user} ({self.sent_at.strftime('%Y-%m-%d %H:%M')})"
 
+    def save(self, *args, **kwargs):
+        if not self._state.adding or self.conversation_id is not None:
+            return super().save(*args, **kwargs)
+
+        # New message: claim the next sequence number and update the
+        # conversation's last-message pointer and unread counter atomically.
+        with transaction.atomic():
+            conversation, self.sequence = Conversation.objects.next_sequence(self.from_user_id, self.to_user_id)
+            self.conversation = conversation
+            super().save(*args, **kwargs)
+            conversation.message_added(self)
+
+
+# ------------------ CONVERSATION ------------------
+class ConversationManager(models.Manager):
+    @staticmethod
+    def pair(user_id, other_id):
+        """Canonical (lower id, higher id) ordering for a user pair."""
+        return (user_id, other_id) if user_id <= other_id else (other_id, user_id)
+
+    def between(self, user, other):
+        user_a_id, user_b_id = self.pair(user.id, other.id)
+        return self.filter(user_a_id=user_a_id, user_b_id=user_b_id).first()
+
+    def for_user(self, user):
+        """Inbox sidebar: the user's conversations, most recent first."""
+        return self.filter(
+            Q(user_a=user) | Q(user_b=user)
+        ).select_related('user_a', 'user_b', 'last_message').order_by('-last_message_at')
+
+    def next_sequence(self, from_user_id, to_user_id):
+        """
+        Return (conversation, sequence) for a new message between two users.
+
+        Must be called inside a transaction: the UPDATE takes the row lock that
+        serializes concurrent senders until the message is committed.
+        """
+        user_a_id, user_b_id = self.pair(from_user_id, to_user_id)
+        conversation, _ = self.get_or_create(user_a_id=user_a_id, user_b_id=user_b_id)
+        self.filter(pk=conversation.pk).update(last_sequence=F('last_sequence') + 1)
+        conversation.last_sequence = self.filter(pk=conversation.pk).values_list('last_sequence', flat=True).get()
+        return conversation, conversation.last_sequence
+
+    def bulk_add_messages(self, messages):
+        """
+        Insert many new messages with one bulk_create, keeping conversations
+        consistent: each pair claims a contiguous block of sequence numbers
+        and gets a single last-message/unread UPDATE. Messages are returned
+        with ``pk``, ``sent_at`` and ``sequence`` populated.
+
+        bulk_create doesn't send post_save, so callers are responsible for
+        any side effects that normally hang off Message signals.
+        """
+        by_pair = {}
+        for message in messages:
+            by_pair.setdefault(self.pair(message.from_user_id, message.to_user_id), []).append(message)
+
+        with transaction.atomic():
+            conversations = {}
+            # Lock conversations in a fixed order so concurrent batches can't deadlock
+            for (user_a_id, user_b_id), pair_messages in sorted(by_pair.items()):
+                conversation, _ = self.get_or_create(user_a_id=user_a_id, user_b_id=user_b_id)
+                self.filter(pk=conversation.pk).update(last_sequence=F('last_sequence') + len(pair_messages))
+                last = self.filter(pk=conversation.pk).values_list('last_sequence', flat=True).get()
+                for offset, message in enumerate(pair_messages):
+                    message.conversation = conversation
+                    message.sequence = last - len(pair_messages) + 1 + offset
+                conversations[(user_a_id, user_b_id)] = conversation
+
+            Message.objects.bulk_create(messages)
+
+            for key, pair_messages in by_pair.items():
+                conversation = conversations[key]
+                latest = pair_messages[-1]
+                changes = {'last_message': latest, 'last_message_at': latest.sent_at}
+                for counter, user_id in (('unread_a', conversation.user_a_id), ('unread_b', conversation.user_b_id)):
+                    unread = sum(
+                        1 for m in pair_messages
+                        if m.to_user_id == user_id and m.from_user_id != m.to_user_id and not m.is_read
+                    )
+                    if unread:
+                        changes[counter] = F(counter) + unread
+                self.filter(pk=conversation.pk).update(**changes)
+        return messages
+
+    def mark_read(self, reader, other):
+        """Mark everything ``other`` sent to ``reader`` as read. Returns the number of messages updated."""
+        marked = Message.objects.filter(from_user=other, to_user=reader, is_read=False).update(is_read=True)
+        user_a_id, user_b_id = self.pair(reader.id, other.id)
+        counter = 'unread_a' if reader.id == user_a_id else 'unread_b'
+        self.filter(user_a_id=user_a_id, user_b_id=user_b_id).exclude(**{counter: 0}).update(**{counter: 0})
+        return marked
+
+
+class Conversation(models.Model):
+    """
+    One row per user pair (user_a has the lower id) with a denormalized
+    pointer to the latest message and an unread counter per participant.
+    """
+    user_a = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    user_b = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    last_message = models.ForeignKey(Message, null=True, blank=True, on_delete=models.SET_NULL, related_name='+')
+    last_message_at = models.DateTimeField(null=True, blank=True)
+    last_sequence = models.PositiveIntegerField(default=0)
+    unread_a = models.PositiveIntegerField(default=0)  # unread messages addressed to user_a
+    unread_b = models.PositiveIntegerField(default=0)  # unread messages addressed to user_b
+
+    objects = ConversationManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user_a', 'user_b'], name='conversation_unique_pair'),
+            models.CheckConstraint(condition=Q(user_a__lte=F('user_b')), name='conversation_ordered_pair'),
+        ]
+        indexes = [
+            models.Index(fields=['user_a', '-last_message_at'], name='conversation_user_a_recent_idx'),
+            models.Index(fields=['user_b', '-last_message_at'], name='conversation_user_b_recent_idx'),
+        ]
+
+    def __str__(self):
+        return f"Conversation {self.user_a_id} <-> {self.user_b_id}"
+
+    def other_user(self, user):
+        return self.user_b if user.id == self.user_a_id else self.user_a
+
+    def unread_for(self, user):
+        return self.unread_a if user.id == self.user_a_id else self.unread_b
+
+    def message_added(self, message):
+        """Advance the last-message pointer and bump the recipient's unread counter."""
+        changes = {'last_message': message, 'last_message_at': message.sent_at}
+        if not message.is_read and message.from_user_id != message.to_user_id:
+            counter = 'unread_a' if message.to_user_id == self.user_a_id else 'unread_b'
+            changes[counter] = F(counter) + 1
+        Conversation.objects.filter(pk=self.pk).update(**changes)
+
+
+# ------------------ CHANNEL LAYER ------------------
+class ChannelLayerMessage(models.Model):
+    """A queued channel layer message; see core.channel_layers."""
+    channel = models.CharField(max_length=100)
+    payload = models.TextField()  # JSON-encoded message dict
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['channel', 'id'], name='channelmessage_queue_idx'),
+        ]
+
+    def __str__(self):
+        return f"Message on {self.channel}"
+
+
+class ChannelLayerGroup(models.Model):
+    """Membership of a channel in a channel layer group, valid until expires_at."""
+    group = models.CharField(max_length=100)
+    channel = models.CharField(max_length=100, db_index=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['group', 'channel'], name='channelgroup_unique_member'),
+        ]
+
+    def __str__(self):
+        return f"{self.channel} in {self.group}"
+
+
+# ------------------ BACKGROUND JOBS ------------------
+class Job(models.Model):
+    """A queued call to a module-level function; see core.jobs."""
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('failed', 'Failed'),
+    ]
+
+    task = models.CharField(max_length=200)  # dotted path of the function
+    args = models.JSONField(default=list, blank=True)
+    kwargs = models.JSONField(default=dict, blank=True)
+    priority = models.SmallIntegerField(default=0)  # higher runs first
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    run_at = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    locked_by = models.CharField(max_length=64, blank=True)
+    locked_until = models.DateTimeField(null=True, blank=True)  # lease expiry while running
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', '-priority', 'run_at'], name='job_claim_idx'),
+            models.Index(fields=['status', 'locked_until'], name='job_lease_idx'),
+        ]
+
+    def __str__(self):
+        return f"Job {self.pk}: {self.task} ({self.status})"
+
+
+# ------------------ MEDIA ------------------
+class MediaBlob(models.Model):
+    """
+    One content-addressed file written by core.storage, with the number of
+    file fields and image variants that refer to it. Blobs left with no
+    references are deleted by the media garbage collector.
+    """
+    name = models.CharField(max_length=100, unique=True)  # blobs/ab/cd/<sha256><ext>
+    size = models.BigIntegerField()
+    references = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(default=timezone.now)
+    released_at = models.DateTimeField(null=True, blank=True)  # when the last reference went away
+    variant_of = models.CharField(max_length=100, blank=True)  # the image this is a resized copy of (core.images)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['references', 'released_at'], name='mediablob_unreferenced_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.references} references)"
+
+
+class ChunkedUpload(models.Model):
+    """A chat attachment being uploaded in numbered chunks; see core.uploads."""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='chunked_uploads')
+    filename = models.CharField(max_length=255)
+    size = models.BigIntegerField()  # declared total, in bytes
+    chunk_size = models.PositiveIntegerField()
+    sha256 = models.CharField(max_length=64)  # declared checksum, verified when the upload completes
+    received = models.BigIntegerField(default=0)  # bytes written so far
+    created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(default=timezone.now)  # when the last chunk arrived
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['updated_at'], name='chunkedupload_updated_idx'),
+        ]
+
+    def __str__(self):
+        return f"Upload {self.pk}: {self.filename} ({self.received}/{self.size} bytes)"
+
+    @property
+    def next_chunk(self):
+        # Every chunk but the last is chunk_size long, so this is the chunk count once all have arrived
+        return -(-self.received // self.chunk_size)
+
+
+# ------------------ REMINDERS ------------------
+class MeetingChange(models.Model):
+    """
+    A meeting was created, edited or deleted; core.reminders writes one row
+    per change and ``manage.py run_reminders`` consumes them in id order.
+    Plain ids rather than foreign keys so rows outlive deleted meetings.
+    """
+    meeting_id = models.BigIntegerField()
+    series_id = models.BigIntegerField(null=True, blank=True)  # set for exceptions of a recurring meeting
+    created_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"Change {self.pk}: meeting {self.meeting_id}"
+
 
 # ------------------ NOTIFICATION ------------------
 class Notification(models.Model):
@@ -109,6 +539,36 @@ def delete_old_notifications(days=30):
     cutoff = timezone.now() - timedelta(days=days)
     Notification.objects.filter(created_at__lt=cutoff).delete()
 
+class MeetingQuerySet(models.QuerySet):
+    ACTIVE_STATUSES = ['scheduled', 'confirmed']
+
+    def for_user(self, user):
+        """Meetings ``user`` organizes or attends. EXISTS rather than a join, so no DISTINCT is needed."""
+        attending = Meeting.participants.through.objects.filter(meeting_id=OuterRef('pk'), user_id=user.pk)
+        return self.filter(Q(organizer_id=user.pk) | Exists(attending))
+
+    def upcoming(self, now=None):
+        """Active meetings still to come, and recurring series with occurrences still to come."""
+        now = now or timezone.now()
+        return self.filter(
+            Q(scheduled_date__gte=now) | (Q(ends_at__gt=now) & ~Q(recurrence='')),
+            status__in=self.ACTIVE_STATUSES,
+        )
+
+    def past(self, now=None):
+        """
+        Single meetings (including materialized occurrences) that have
+        started or been completed, and recurring series whose first
+        occurrence has started; expand those for their past occurrences.
+        """
+        now = now or timezone.now()
+        return self.filter(Q(scheduled_date__lt=now) | Q(status='completed', recurrence=''))
+
+    def with_people(self):
+        """What meeting lists and pages show: organizer and skill joined, participants in one extra query."""
+        return self.select_related('organizer', 'related_skill').prefetch_related('participants')
+
+
 class Meeting(models.Model):
     MEETING_TYPES = [
         ('skill_swap', 'Skill Swap Session'),
@@ -124,6 +584,15 @@ class Meeting(models.Model):
         ('completed', 'Completed'),
     ]
 
+    RECURRENCE_CHOICES = [
+        ('', 'Does not repeat'),
+        ('daily', 'Daily'),
+        ('weekly', 'Weekly'),
+    ]
+
+    # ends_at of a series that has neither an end date nor a count
+    SERIES_OPEN_END = datetime(9000, 1, 1, tzinfo=dt_timezone.utc)
+
     title = models.CharField(max_length=200)
     description = models.TextField(blank=True)
     organizer = models.ForeignKey(User, on_delete=models.CASCADE, related_name='organized_meetings')
@@ -131,6 +600,8 @@ class Meeting(models.Model):
     meeting_type = models.CharField(max_length=20, choices=MEETING_TYPES, default='general')
     scheduled_date = models.DateTimeField()
     duration_minutes = models.PositiveIntegerField(default=30)  # Meeting duration in minutes
+    # End of the meeting, or of a series' last occurrence; kept in sync by save()
+    ends_at = models.DateTimeField(editable=False)
     location = models.CharField(max_length=300, blank=True, help_text="Physical location or meeting link")
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='scheduled')
     created_at = models.DateTimeField(auto_now_add=True)
@@ -138,27 +609,188 @@ class Meeting(models.Model):
     
     # For skill-related meetings
     related_skill = models.ForeignKey('Skill', on_delete=models.SET_NULL, null=True, blank=True)
+
+    objects = MeetingQuerySet.as_manager()
+
+    # Recurring series are one row, expanded per window by core.recurrence. A cancelled or
+    # moved occurrence is materialized as its own row pointing at the series.
+    recurrence = models.CharField(max_length=10, choices=RECURRENCE_CHOICES, blank=True, default='')
+    recurrence_interval = models.PositiveSmallIntegerField(default=1)  # every N days / weeks
+    recurrence_until = models.DateTimeField(null=True, blank=True)  # last possible occurrence start
+    recurrence_count = models.PositiveIntegerField(null=True, blank=True)
+    series = models.ForeignKey('self', on_delete=models.CASCADE, null=True, blank=True, related_name='exceptions')
+    original_start = models.DateTimeField(null=True, blank=True)  # the occurrence an exception replaces
     
     class Meta:
         ordering = ['scheduled_date']
+        indexes = [
+            # Overlap lookups: scheduled_date < window end AND ends_at > window start
+            models.Index(fields=['scheduled_date', 'ends_at'], name='meeting_time_range_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['series', 'original_start'], name='meeting_exception_unique'),
+        ]
     
     def __str__(self):
         return f"{self.title} - {self.scheduled_date.strftime('%Y-%m-%d %H:%M')}"
     
+    def save(self, *args, **kwargs):
+        self.ends_at = self.series_end() if self.recurrence else self.end_time
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'scheduled_date', 'duration_minutes', *self.RULE_FIELDS} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'ends_at'}
+        super().save(*args, **kwargs)
+
+    def get_absolute_url(self):
+        url = reverse('core:meeting_detail', args=[self.pk])
+        if self.occurrence_start is not None:
+            url += '?' + urlencode({'occurrence': self.occurrence_start.isoformat()})
+        return url
+
     @property
     def end_time(self):
         return self.scheduled_date + timedelta(minutes=self.duration_minutes)
     
     def is_upcoming(self):
         return self.scheduled_date > timezone.now() and self.status in ['scheduled', 'confirmed']
-    
+
+    def is_participant(self, user):
+        """Whether ``user`` organizes or attends this meeting; free when participants were prefetched."""
+        if user.pk is None:
+            return False
+        if self.organizer_id == user.pk:
+            return True
+        if 'participants' in getattr(self, '_prefetched_objects_cache', {}):
+            return any(participant.pk == user.pk for participant in self.participants.all())
+        return self.participants.filter(pk=user.pk).exists()
+
+    # ------------------ recurrence ------------------
+    RULE_FIELDS = ('recurrence', 'recurrence_interval', 'recurrence_until', 'recurrence_count')
+
+    occurrence_start = None  # set on the copies returned by occurrence()
+
+    @property
+    def is_recurring(self):
+        return bool(self.recurrence)
+
+    def _step(self):
+        days = 7 if self.recurrence == 'weekly' else 1
+        return timedelta(days=days * max(self.recurrence_interval or 1, 1))
+
+    def _nth_start(self, index):
+        # Step in wall-clock time so a weekly 10:00 session stays at 10:00 across DST changes
+        first = timezone.localtime(self.scheduled_date)
+        return timezone.make_aware(first.replace(tzinfo=None) + index * self._step(), first.tzinfo)
+
+    def occurrence_starts(self, start=None, end=None):
+        """Start times of the occurrences overlapping ``[start, end)``, in order."""
+        duration = timedelta(minutes=self.duration_minutes)
+        if not self.recurrence:
+            if (start is None or self.end_time > start) and (end is None or self.scheduled_date < end):
+                yield self.scheduled_date
+            return
+
+        index = 0
+        if start is not None:
+            # Jump to just before the window; the extra step absorbs DST shifts
+            index = max((start - duration - self.scheduled_date) // self._step() - 1, 0)
+        while self.recurrence_count is None or index < self.recurrence_count:
+            occurrence = self._nth_start(index)
+            if self.recurrence_until is not None and occurrence > self.recurrence_until:
+                return
+            if end is not None and occurrence >= end:
+                return
+            if start is None or occurrence + duration > start:
+                yield occurrence
+            index += 1
+
+    def series_end(self):
+        """When the last occurrence ends, or SERIES_OPEN_END for an open-ended series."""
+        last = None
+        if self.recurrence_count is not None:
+            last = self._nth_start(max(self.recurrence_count - 1, 0))
+        if self.recurrence_until is not None:
+            index = max((self.recurrence_until - self.scheduled_date) // self._step() + 1, 0)
+            while index and self._nth_start(index) > self.recurrence_until:
+                index -= 1
+            by_date = self._nth_start(index)
+            last = by_date if last is None else min(last, by_date)
+        if last is None:
+            return self.SERIES_OPEN_END
+        return last + timedelta(minutes=self.duration_minutes)
+
+    def occurrence(self, start):
+        """An unsaved copy of this series standing for the occurrence at ``start``."""
+        occurrence = copy.copy(self)
+        occurrence.scheduled_date = start
+        occurrence.ends_at = start + timedelta(minutes=self.duration_minutes)
+        occurrence.occurrence_start = start
+        return occurrence
+
+    def has_occurrence(self, start):
+        return any(s == start for s in self.occurrence_starts(start, start + timedelta(minutes=1)))
+
+    def materialize_occurrence(self, original_start, **changes):
+        """
+        Turn one occurrence of this series into its own row (creating it on
+        first use), apply ``changes`` and return it. Cancelling or moving a
+        single session goes through here; the series row is left alone.
+        """
+        with transaction.atomic():
+            exception, created = Meeting.objects.get_or_create(
+                series=self,
+                original_start=original_start,
+                defaults={
+                    'title': self.title,
+                    'description': self.description,
+                    'organizer_id': self.organizer_id,
+                    'meeting_type': self.meeting_type,
+                    'scheduled_date': original_start,
+                    'duration_minutes': self.duration_minutes,
+                    'location': self.location,
+                    'status': self.status,
+                    'related_skill_id': self.related_skill_id,
+                },
+            )
+            if created:
+                exception.participants.set(self.participants.all())
+            if changes:
+                for field, value in changes.items():
+                    setattr(exception, field, value)
+                exception.save()
+        return exception
+
+class WeeklyAvailability(models.Model):
+    """
+    A user's recurring free time as a bitmap of 15-minute slots, bit 0 being
+    Monday 00:00 in TIME_ZONE (see core.availability). Users without a row
+    are treated as free whenever they have no meetings.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='weekly_availability')
+    slots = models.BinaryField(max_length=84, default=bytes)  # 7 * 96 bits, little-endian
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Availability for {self.user.username}"
+
+    @property
+    def bitmap(self):
+        return int.from_bytes(self.slots, 'little')
+
+    @bitmap.setter
+    def bitmap(self, value):
+        self.slots = value.to_bytes(84, 'little')
+
 class Notification(models.Model):
     NOTIFICATION_TYPES = [
         ('message', 'New Message'),
         ('meeting_invite', 'Meeting Invitation'),
         ('meeting_update', 'Meeting Update'),
         ('skill_request', 'Skill Request'),
+        ('skill_session', 'Skill Session Started'),
+        ('skill_completed', 'Skill Session Completed'),
         ('review', 'New Review'),
+        ('meeting_reminder', 'Meeting Reminder'),
     ]
     
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notifications')
@@ -183,28 +815,10 @@ class Report(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='report_created_idx'),
+            models.Index(fields=['resolved', 'created_at', 'id'], name='report_resolved_idx'),
+        ]
 
     def __str__(self):
         return f"Report: {self.reporter.username} → {self.reported_user.username}"
-
-class Report(models.Model):
-    reporter = models.ForeignKey(User, on_delete=models.CASCADE, related_name='reports_made')
-    reported_user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='reports_received')
-    reason = models.TextField()
-    created_at = models.DateTimeField(auto_now_add=True)
-    resolved = models.BooleanField(default=False)
-
-    class Meta:
-        ordering = ['-created_at']
-
-    def __str__(self):
-        return f"Report: {self.reporter.username} → {self.reported_user.username}"
-
-# In core/models.py
-from django.db.models import Q
-
-class MeetingManager(models.Manager):
-    def for_user(self, user):
-        return self.filter(
-            Q(participants=user) | Q(organizer=user)
-        ).distinct()
\ No newline at end of file
@@ -0,0 +1,66 @@
+# core/notifications.py
+"""
+Notification fan-out.
+
+Views create notifications through ``notification_service.notify`` instead
+of calling ``Notification.objects.create`` per recipient: all rows for one
+event go out in a single ``bulk_create``, the type is checked against
+``Notification.NOTIFICATION_TYPES``, and with ``NOTIFICATIONS_DEFERRED``
+the write is queued as a background job (core.jobs), so the response
+doesn't wait for the fan-out.
+"""
+from django.conf import settings
+from django.db.models import QuerySet
+
+from . import realtime
+from .jobs import enqueue
+from .models import Notification
+
+
+def create_notifications(user_ids, message, notification_type, meeting_id=None):
+    """Write one notification per user and push the live events. Also runs as a job."""
+    created = Notification.objects.bulk_create([
+        Notification(
+            user_id=user_id,
+            message=message,
+            notification_type=notification_type,
+            related_meeting_id=meeting_id,
+        )
+        for user_id in user_ids
+    ])
+    # bulk_create skips post_save, so push the live events here
+    realtime.push(filter(None, (realtime.notification_event(n) for n in created)))
+    return len(created)
+
+
+class NotificationService:
+    TYPES = frozenset(value for value, _ in Notification.NOTIFICATION_TYPES)
+
+    def notify(self, recipients, message, notification_type, related_meeting=None, exclude=None, defer=None):
+        """
+        Notify every user in ``recipients`` (users, user ids or a User
+        queryset), skipping ``exclude``. Returns the number of recipients.
+        """
+        if notification_type not in self.TYPES:
+            raise ValueError(f"Unknown notification type: {notification_type!r}")
+
+        if isinstance(recipients, QuerySet):
+            recipients = recipients.values_list('pk', flat=True)
+        user_ids = {getattr(recipient, 'pk', recipient) for recipient in recipients}
+        if exclude is not None:
+            user_ids.discard(getattr(exclude, 'pk', exclude))
+        if not user_ids:
+            return 0
+
+        meeting_id = getattr(related_meeting, 'pk', related_meeting)
+        args = (sorted(user_ids), message, notification_type, meeting_id)
+        if defer is None:
+            defer = getattr(settings, 'NOTIFICATIONS_DEFERRED', False)
+        if defer:
+            enqueue(create_notifications, args=args, priority=10)
+        else:
+            create_notifications(*args)
+        return len(user_ids)
+
+
+notification_service = NotificationService()
@@ -0,0 +1,115 @@
+# core/pagination.py
+"""
+Keyset (cursor) pagination for message history.
+
+Pages are cut on the (sent_at, id) pair rather than with OFFSET, so loading
+an older page costs the same index range scan no matter how long the
+conversation is. Cursors are opaque url-safe strings.
+"""
+import base64
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from django.db.models import Q
+
+from . import images
+from .models import Conversation, Message
+
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+@dataclass
+class MessagePage:
+    messages: list = field(default_factory=list)  # oldest first, ready to render
+    has_older: bool = False
+    has_newer: bool = False
+
+    @property
+    def older_cursor(self):
+        return encode_cursor(self.messages[0]) if self.has_older and self.messages else None
+
+    @property
+    def newer_cursor(self):
+        return encode_cursor(self.messages[-1]) if self.has_newer and self.messages else None
+
+
+def encode_cursor(message):
+    raw = f"{message.sent_at.isoformat()}|{message.pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(value):
+    """Return (sent_at, id) for a cursor, or raise ValueError if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(value + '=' * (-len(value) % 4)).decode()
+        sent_at, pk = raw.rsplit('|', 1)
+        return datetime.fromisoformat(sent_at), int(pk)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"Invalid cursor: {value!r}") from exc
+
+
+def conversation_messages(user, other):
+    """All messages between two users, served by the (conversation, sent_at, id) index."""
+    user_a_id, user_b_id = Conversation.objects.pair(user.id, other.id)
+    return Message.objects.filter(
+        conversation__user_a_id=user_a_id, conversation__user_b_id=user_b_id
+    ).select_related('from_user', 'to_user')
+
+
+def paginate_messages(queryset, before=None, after=None, limit=PAGE_SIZE):
+    """
+    Return one MessagePage from ``queryset``.
+
+    With no cursor the newest ``limit`` messages are returned. ``before``
+    pages backwards from a cursor, ``after`` pages forwards.
+    """
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+
+    if after:
+        sent_at, pk = decode_cursor(after)
+        rows = list(
+            queryset.filter(Q(sent_at__gt=sent_at) | Q(sent_at=sent_at, pk__gt=pk))
+            .order_by('sent_at', 'pk')[:limit + 1]
+        )
+        has_more = len(rows) > limit
+        return MessagePage(rows[:limit], has_older=True, has_newer=has_more)
+
+    if before:
+        sent_at, pk = decode_cursor(before)
+        queryset = queryset.filter(Q(sent_at__lt=sent_at) | Q(sent_at=sent_at, pk__lt=pk))
+
+    rows = list(queryset.order_by('-sent_at', '-pk')[:limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    rows.reverse()
+    return MessagePage(rows, has_older=has_more, has_newer=bool(before))
+
+
+def page_from_request(queryset, request):
+    """Paginate using the ``before``/``after``/``limit`` query parameters, ignoring bad values."""
+    try:
+        return paginate_messages(
+            queryset,
+            before=request.GET.get('before'),
+            after=request.GET.get('after'),
+            limit=request.GET.get('limit', PAGE_SIZE),
+        )
+    except ValueError:
+        return paginate_messages(queryset)
+
+
+def serialize_message(message):
+    return {
+        'id': message.pk,
+        'sequence': message.sequence,
+        'from_user': message.from_user.username,
+        'to_user_id': message.to_user_id,
+        'content': message.content,
+        'sent_at': message.sent_at.isoformat(),
+        'is_read': message.is_read,
+        'attachment': message.attachment.url if message.attachment else None,
+        'attachment_preview': images.variant_url(message.attachment, message.attachment_variants, 128)
+        if message.attachment_variants.get('sizes') else None,
+        'reply_to': message.reply_to_id,
+    }
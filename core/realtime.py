@@ -0,0 +1,111 @@
+# core/realtime.py
+"""
+Per-user push events for NotificationConsumer (``ws/notifications/``).
+
+Every signed-in tab joins its user's group and receives small JSON deltas
+instead of polling:
+
+* ``message``        a new chat message (sender, content, time)
+* ``unread``         the unread count of one conversation changed
+* ``meeting_invite`` the user was invited to a meeting
+* ``skill_request``  someone requested one of the user's skills
+* ``notification``   any other Notification row
+
+Events are sent after the surrounding transaction commits, and a failing
+channel layer never breaks the request that triggered the event.
+"""
+import logging
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import Message, Notification, SkillRequest
+
+logger = logging.getLogger(__name__)
+
+def user_group(user_id):
+    return f"user_{user_id}"
+
+
+def _event(user_id, data):
+    return user_group(user_id), {'type': 'notify', 'data': data}
+
+
+async def apush(events):
+    """Send ``(user_id, data)`` events from async code."""
+    layer = get_channel_layer()
+    if layer is None:
+        return
+    for user_id, data in events:
+        group, message = _event(user_id, data)
+        try:
+            await layer.group_send(group, message)
+        except Exception:
+            logger.exception("Could not push %s event to user %s", data.get('type'), user_id)
+
+
+def push(events):
+    """Send ``(user_id, data)`` events from sync code once the current transaction commits."""
+    events = list(events)
+    if events:
+        transaction.on_commit(lambda: async_to_sync(apush)(events))
+
+
+def message_event(message, sender_name=None):
+    """The ``message`` event for the recipient of ``message``."""
+    return message.to_user_id, {
+        'type': 'message',
+        'id': message.pk,
+        'from': sender_name or message.from_user.username,
+        'content': message.content or '',
+        'sent_at': message.sent_at.isoformat(),
+        'unread_delta': 0 if message.is_read else 1,
+    }
+
+
+def notification_event(notification):
+    """The event for a new Notification, or None when another event already covers it."""
+    # New-message and skill-request notifications already have their own events
+    if notification.notification_type in ('message', 'skill_request'):
+        return None
+    event_type = 'meeting_invite' if notification.notification_type == 'meeting_invite' else 'notification'
+    return notification.user_id, {
+        'type': event_type,
+        'id': notification.pk,
+        'kind': notification.notification_type,
+        'message': notification.message,
+        'meeting_id': notification.related_meeting_id,
+    }
+
+
+def unread_event(reader, other, unread=0):
+    """Tell the reader's other tabs that their conversation with ``other`` was read."""
+    return reader.id, {'type': 'unread', 'with': other.username, 'unread': unread}
+
+
+# ------------------ SIGNAL HANDLERS ------------------
+@receiver(post_save, sender=Message)
+def message_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw and instance.from_user_id != instance.to_user_id:
+        push([message_event(instance)])
+
+
+@receiver(post_save, sender=Notification)
+def notification_created(sender, instance, created, raw=False, **kwargs):
+    event = notification_event(instance) if created and not raw else None
+    if event is not None:
+        push([event])
+
+
+@receiver(post_save, sender=SkillRequest)
+def skill_request_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        push([(instance.owner_id, {
+            'type': 'skill_request',
+            'id': instance.pk,
+            'skill': instance.skill.title,
+            'from': instance.requester.username,
+        })])
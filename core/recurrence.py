@@ -0,0 +1,105 @@
+# core/recurrence.py
+"""
+Lazy expansion of recurring meetings.
+
+A recurring Meeting is a single row holding the rule (daily or weekly,
+every N, until a date or for a count). ``Meeting.save()`` sets its
+``ends_at`` to the end of the last occurrence, so the usual window query
+on meeting_time_range_idx (``scheduled_date < end AND ends_at > start``)
+picks up every series that could have an occurrence in the window.
+The functions here turn those rows into the occurrences that actually
+fall inside it.
+
+Only exceptions are stored: cancelling or moving one occurrence creates a
+row with ``series`` and ``original_start`` set (``Meeting.materialize_occurrence``),
+and that row replaces the generated occurrence wherever the series is
+expanded.
+"""
+import heapq
+from datetime import timedelta
+
+from .models import Meeting
+
+# Appended to values_list() queries that expand_rows() understands
+ROW_FIELDS = ('id', 'scheduled_date', 'ends_at', 'duration_minutes', *Meeting.RULE_FIELDS)
+
+
+def replaced_starts(series_ids):
+    """``{(series_id, original_start)}`` for every materialized occurrence of these series."""
+    if not series_ids:
+        return set()
+    return set(Meeting.objects.filter(series_id__in=series_ids).values_list('series_id', 'original_start'))
+
+
+def expand(meetings, start, end):
+    """
+    Meeting instances from a window query, with each series replaced by
+    its occurrences in ``[start, end)`` (copies from ``Meeting.occurrence``),
+    sorted by start time.
+    """
+    meetings = list(meetings)
+    replaced = replaced_starts([meeting.pk for meeting in meetings if meeting.recurrence])
+    expanded = []
+    for meeting in meetings:
+        if not meeting.recurrence:
+            expanded.append(meeting)
+            continue
+        expanded.extend(
+            meeting.occurrence(occurrence)
+            for occurrence in meeting.occurrence_starts(start, end)
+            if (meeting.pk, occurrence) not in replaced
+        )
+    expanded.sort(key=lambda meeting: meeting.scheduled_date)
+    return expanded
+
+
+def expand_rows(rows, start, end):
+    """
+    The values_list() counterpart of ``expand``. Each row ends with the
+    ROW_FIELDS columns; each result is ``(*leading columns, meeting_id,
+    starts, ends, occurrence_start)`` where ``occurrence_start`` is None
+    for ordinary meetings.
+    """
+    rows = list(rows)
+    width = len(ROW_FIELDS)
+    replaced = replaced_starts([row[-width] for row in rows if row[-width + 4]])
+    for row in rows:
+        head = row[:-width]
+        meeting_id, scheduled_date, ends_at, duration, recurrence, interval, until, count = row[-width:]
+        if not recurrence:
+            yield (*head, meeting_id, scheduled_date, ends_at, None)
+            continue
+        series = Meeting(
+            pk=meeting_id, scheduled_date=scheduled_date, duration_minutes=duration, recurrence=recurrence,
+            recurrence_interval=interval, recurrence_until=until, recurrence_count=count,
+        )
+        length = timedelta(minutes=duration)
+        for occurrence in series.occurrence_starts(start, end):
+            if (meeting_id, occurrence) not in replaced:
+                yield (*head, meeting_id, occurrence, occurrence + length, occurrence)
+
+
+class NewestFirst:
+    """
+    Ordinary meetings from a queryset and occurrences from ``expand``,
+    merged newest first into one sequence Paginator can slice. A page only
+    reads the queryset up to its last row (one LIMIT query), since nothing
+    past it can sort ahead of the page.
+    """
+    def __init__(self, meetings, occurrences):
+        self.meetings = meetings.order_by('-scheduled_date')
+        self.occurrences = sorted(occurrences, key=lambda meeting: meeting.scheduled_date, reverse=True)
+
+    def count(self):
+        return self.meetings.count() + len(self.occurrences)
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        stop = index.stop if isinstance(index, slice) else index + 1
+        merged = list(heapq.merge(
+            self.meetings[:stop], self.occurrences[:stop],
+            key=lambda meeting: meeting.scheduled_date, reverse=True,
+        ))
+        return merged[index]
@@ -0,0 +1,221 @@
+# core/reminders.py
+"""
+Meeting reminders.
+
+``manage.py run_reminders`` keeps the reminders that fall due within the
+next ``horizon`` in an in-memory min-heap ordered by reminder time and
+sleeps until the earliest one. It never scans the Meeting table: at
+startup it reads the meetings starting in the horizon (one range query on
+meeting_time_range_idx, recurring series expanded by core.recurrence) and
+tops the heap up one slice at a time as the clock moves on.
+
+Edits reach the process through MeetingChange rows written by the signal
+handlers below in the same transaction as the meeting. Each poll reads the
+new rows, bumps the changed meetings' versions, which turns their heap
+entries stale, and reloads just those meetings. Reminders that fall due
+together are sent as one batch: one query for the recipients, one to skip
+reminders a previous run already sent, and one bulk insert.
+
+Saves that bypass signals (``QuerySet.update``, ``bulk_create``) are not
+seen until the meeting is next saved. Run a single reminder process.
+"""
+import heapq
+import logging
+import signal
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import Max
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import realtime
+from .availability import ACTIVE_STATUSES
+from .models import Meeting, MeetingChange, Notification
+from .recurrence import expand
+
+logger = logging.getLogger(__name__)
+
+REMINDER_LEAD = timedelta(minutes=getattr(settings, 'MEETING_REMINDER_MINUTES', 30))
+HORIZON = timedelta(hours=6)
+BATCH_SIZE = 500  # notifications per bulk insert
+CHANGES_PER_POLL = 1000
+
+
+# ------------------ LOADING ------------------
+def upcoming_reminders(start, end, lead=REMINDER_LEAD, meeting_ids=None):
+    """
+    ``(remind_at, meeting_id, starts)`` for every active meeting or
+    occurrence whose reminder falls in ``[start, end)``, optionally only
+    for ``meeting_ids``. Occurrences carry their series' id.
+    """
+    first, last = start + lead, end + lead
+    meetings = Meeting.objects.filter(status__in=ACTIVE_STATUSES, scheduled_date__lt=last, ends_at__gt=first)
+    if meeting_ids is not None:
+        meetings = meetings.filter(pk__in=meeting_ids)
+    meetings = meetings.only('id', 'scheduled_date', 'ends_at', 'duration_minutes', *Meeting.RULE_FIELDS)
+    return [
+        (meeting.scheduled_date - lead, meeting.pk, meeting.scheduled_date)
+        for meeting in expand(meetings, first, last)
+        if meeting.scheduled_date >= first
+    ]
+
+
+# ------------------ SENDING ------------------
+def _already_sent(batch):
+    """Entries of ``batch`` whose reminder exists from an earlier run (e.g. before a restart)."""
+    sent = {}
+    for meeting_id, created_at in Notification.objects.filter(
+        notification_type='meeting_reminder',
+        related_meeting_id__in={meeting_id for _, meeting_id, _ in batch},
+        created_at__gte=min(remind_at for remind_at, _, _ in batch),
+    ).values_list('related_meeting_id', 'created_at'):
+        sent[meeting_id] = max(created_at, sent.get(meeting_id, created_at))
+    return {entry for entry in batch if entry[1] in sent and sent[entry[1]] >= entry[0]}
+
+
+def send_reminders(batch):
+    """Notify the organizer and participants of each ``(remind_at, meeting_id, starts)``. Returns the count."""
+    batch = set(batch) - _already_sent(batch)
+    if not batch:
+        return 0
+    meeting_ids = {meeting_id for _, meeting_id, _ in batch}
+    meetings = {
+        meeting_id: (title, {organizer_id})
+        for meeting_id, title, organizer_id in Meeting.objects.filter(pk__in=meeting_ids).values_list(
+            'id', 'title', 'organizer_id'
+        )
+    }
+    for meeting_id, user_id in Meeting.participants.through.objects.filter(meeting_id__in=meeting_ids).values_list(
+        'meeting_id', 'user_id'
+    ):
+        if meeting_id in meetings:
+            meetings[meeting_id][1].add(user_id)
+
+    notifications = []
+    for _, meeting_id, starts in sorted(batch):
+        if meeting_id not in meetings:
+            continue  # deleted since it was loaded
+        title, user_ids = meetings[meeting_id]
+        message = f"Reminder: '{title}' starts at {timezone.localtime(starts):%H:%M}"
+        notifications.extend(
+            Notification(
+                user_id=user_id,
+                message=message,
+                notification_type='meeting_reminder',
+                related_meeting_id=meeting_id,
+            )
+            for user_id in user_ids
+        )
+    created = Notification.objects.bulk_create(notifications, batch_size=BATCH_SIZE)
+    # bulk_create skips post_save, so push the live events here
+    realtime.push(filter(None, (realtime.notification_event(n) for n in created)))
+    return len(created)
+
+
+# ------------------ SCHEDULER ------------------
+class ReminderScheduler:
+    """Min-heap of ``(remind_at, meeting_id, starts, version)``; entries older than a meeting's version are skipped."""
+
+    def __init__(self, lead=REMINDER_LEAD, horizon=HORIZON, poll_interval=5.0):
+        self.lead = lead
+        self.horizon = horizon
+        self.poll_interval = poll_interval
+        self.heap = []
+        self.versions = {}  # meeting id -> times it changed while loaded
+        self.loaded_until = None
+        self.last_change = 0
+        self.stopping = False
+
+    def stop(self, *args):
+        self.stopping = True
+
+    def _push(self, reminders):
+        for remind_at, meeting_id, starts in reminders:
+            heapq.heappush(self.heap, (remind_at, meeting_id, starts, self.versions.get(meeting_id, 0)))
+
+    def load(self, now):
+        """
+        Fill the heap up to ``now + horizon``. Reminders that fell due while
+        no process was running are included as long as the meeting hasn't
+        started; ``send_reminders`` skips the ones that already went out.
+        """
+        # Everything written before this point is reflected in the load below
+        self.last_change = MeetingChange.objects.aggregate(last=Max('id'))['last'] or 0
+        MeetingChange.objects.filter(id__lte=self.last_change).delete()
+        self.heap = []
+        self.versions = {}
+        self.loaded_until = now + self.horizon
+        self._push(upcoming_reminders(now - self.lead, self.loaded_until, self.lead))
+
+    def extend(self, now):
+        """Load the next slice once half the horizon has gone by."""
+        if now + self.horizon / 2 < self.loaded_until:
+            return
+        until = now + self.horizon
+        self._push(upcoming_reminders(self.loaded_until, until, self.lead))
+        self.loaded_until = until
+
+    def apply_changes(self, now):
+        """Reload the meetings changed since the last poll. Returns the number of changes read."""
+        changes = list(
+            MeetingChange.objects.filter(id__gt=self.last_change)
+            .order_by('id')
+            .values_list('id', 'meeting_id', 'series_id')[:CHANGES_PER_POLL]
+        )
+        if not changes:
+            return 0
+        changed = set()
+        for _, meeting_id, series_id in changes:
+            changed.add(meeting_id)
+            if series_id is not None:
+                changed.add(series_id)  # an exception hides or restores one of the series' occurrences
+        for meeting_id in changed:
+            self.versions[meeting_id] = self.versions.get(meeting_id, 0) + 1
+        self._push(upcoming_reminders(now - self.lead, self.loaded_until, self.lead, meeting_ids=changed))
+        self.last_change = changes[-1][0]
+        MeetingChange.objects.filter(id__lte=self.last_change).delete()
+        return len(changes)
+
+    def pop_due(self, now):
+        """Current (not stale) entries due by ``now``, removed from the heap."""
+        due = []
+        while self.heap and self.heap[0][0] <= now:
+            remind_at, meeting_id, starts, version = heapq.heappop(self.heap)
+            if version == self.versions.get(meeting_id, 0):
+                due.append((remind_at, meeting_id, starts))
+        return due
+
+    def run(self, once=False):
+        """Send reminders until stopped, or for one pass with ``once``. Returns the notifications sent."""
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        sent = 0
+        self.load(timezone.now())
+        while not self.stopping:
+            close_old_connections()
+            now = timezone.now()
+            self.apply_changes(now)
+            self.extend(now)
+            due = self.pop_due(now)
+            if due:
+                count = send_reminders(due)
+                sent += count
+                logger.info("Sent %d reminder notifications for %d meetings", count, len(due))
+            if once:
+                break
+            wait = self.poll_interval
+            if self.heap:
+                wait = min(wait, max((self.heap[0][0] - timezone.now()).total_seconds(), 0))
+            time.sleep(wait)
+        return sent
+
+
+# ------------------ SIGNAL HANDLERS ------------------
+@receiver([post_save, post_delete], sender=Meeting)
+def meeting_changed(sender, instance, **kwargs):
+    MeetingChange.objects.create(meeting_id=instance.pk, series_id=instance.series_id)
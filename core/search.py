@@ -0,0 +1,202 @@
+# core/search.py
+"""
+Ranked full-text search over skills.
+
+Every Skill has a search document (title, category, description and the
+owner's names) kept in a side table, ``core_skill_search``:
+
+* PostgreSQL: a weighted ``tsvector`` column with a GIN index, queried with
+  ``websearch_to_tsquery`` and ranked with ``ts_rank``.
+* SQLite: an FTS5 virtual table keyed by the skill id, ranked with ``bm25``.
+
+Any other backend (or a SQLite build without FTS5) falls back to the old
+``icontains`` matching. The table is created by migration 0015, kept in
+sync by the signal handlers below and can be rebuilt in bulk with
+``manage.py rebuild_search_index``.
+"""
+import re
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Skill
+
+SEARCH_TABLE = 'core_skill_search'
+SEARCH_CONFIG = 'english'
+
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+_sqlite_fts_available = None
+
+
+def _backend():
+    """Return 'postgresql', 'sqlite' or None when only LIKE matching is possible."""
+    global _sqlite_fts_available
+    if connection.vendor == 'postgresql':
+        return 'postgresql'
+    if connection.vendor == 'sqlite':
+        if _sqlite_fts_available is None:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [SEARCH_TABLE]
+                )
+                _sqlite_fts_available = cursor.fetchone() is not None
+        return 'sqlite' if _sqlite_fts_available else None
+    return None
+
+
+def _fts5_query(query):
+    """Turn free text into a safe FTS5 expression: every word must match (as a prefix)."""
+    words = _WORD_RE.findall(query)
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def _owner_names(user):
+    return ' '.join(filter(None, [user.username, user.first_name, user.last_name]))
+
+
+# ------------------ QUERYING ------------------
+def search_skills(queryset, query):
+    """
+    Filter a Skill queryset down to matches for ``query`` and annotate
+    ``search_rank`` (higher is better).
+    """
+    backend = _backend()
+    pk = f'"{Skill._meta.db_table}"."id"'
+
+    if backend == 'postgresql':
+        tsquery = f"websearch_to_tsquery('{SEARCH_CONFIG}', %s)"
+        return queryset.filter(
+            id__in=RawSQL(f"SELECT skill_id FROM {SEARCH_TABLE} WHERE document @@ {tsquery}", [query])
+        ).annotate(
+            search_rank=RawSQL(
+                f"SELECT ts_rank(document, {tsquery}) FROM {SEARCH_TABLE} WHERE skill_id = {pk}",
+                [query],
+                output_field=FloatField(),
+            )
+        )
+
+    if backend == 'sqlite':
+        match = _fts5_query(query)
+        if not match:
+            return queryset.none()
+        return queryset.filter(
+            id__in=RawSQL(f"SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s", [match])
+        ).annotate(
+            # bm25() is lower-is-better, flip it so both backends sort descending
+            search_rank=RawSQL(
+                f"SELECT -bm25({SEARCH_TABLE}, 10.0, 5.0, 1.0, 2.0) FROM {SEARCH_TABLE} "
+                f"WHERE {SEARCH_TABLE} MATCH %s AND rowid = {pk}",
+                [match],
+                output_field=FloatField(),
+            )
+        )
+
+    return queryset.filter(
+        Q(title__icontains=query) |
+        Q(description__icontains=query) |
+        Q(category__icontains=query) |
+        Q(owner__username__icontains=query) |
+        Q(owner__first_name__icontains=query) |
+        Q(owner__last_name__icontains=query)
+    ).annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+
+# ------------------ INDEXING ------------------
+def index_skill(skill):
+    """Insert or refresh the search document for one skill."""
+    backend = _backend()
+    if backend is None:
+        return
+
+    owner_names = _owner_names(skill.owner)
+    with connection.cursor() as cursor:
+        if backend == 'postgresql':
+            cursor.execute(
+                f"""
+                INSERT INTO {SEARCH_TABLE} (skill_id, document)
+                VALUES (%s,
+                    setweight(to_tsvector('{SEARCH_CONFIG}', %s), 'A') ||
+                    setweight(to_tsvector('{SEARCH_CONFIG}', %s), 'B') ||
+                    setweight(to_tsvector('{SEARCH_CONFIG}', %s), 'B') ||
+                    setweight(to_tsvector('{SEARCH_CONFIG}', %s), 'C'))
+                ON CONFLICT (skill_id) DO UPDATE SET document = EXCLUDED.document
+                """,
+                [skill.pk, skill.title, skill.category, owner_names, skill.description],
+            )
+        else:
+            cursor.execute(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s", [skill.pk])
+            cursor.execute(
+                f"INSERT INTO {SEARCH_TABLE} (rowid, title, category, description, owner_names) "
+                f"VALUES (%s, %s, %s, %s, %s)",
+                [skill.pk, skill.title, skill.category, skill.description, owner_names],
+            )
+
+
+def remove_skill(skill_id):
+    """Drop the search document for a deleted skill."""
+    backend = _backend()
+    if backend == 'sqlite':
+        # Virtual tables have no foreign keys, so nothing cascades for us
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s", [skill_id])
+    elif backend == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {SEARCH_TABLE} WHERE skill_id = %s", [skill_id])
+
+
+def rebuild_index():
+    """Rebuild every search document with one set-based INSERT ... SELECT."""
+    backend = _backend()
+    if backend is None:
+        return 0
+
+    skill_table = Skill._meta.db_table
+    user_table = User._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+        if backend == 'postgresql':
+            cursor.execute(
+                f"""
+                INSERT INTO {SEARCH_TABLE} (skill_id, document)
+                SELECT s.id,
+                    setweight(to_tsvector('{SEARCH_CONFIG}', s.title), 'A') ||
+                    setweight(to_tsvector('{SEARCH_CONFIG}', s.category), 'B') ||
+                    setweight(to_tsvector('{SEARCH_CONFIG}', concat_ws(' ', u.username, u.first_name, u.last_name)), 'B') ||
+                    setweight(to_tsvector('{SEARCH_CONFIG}', s.description), 'C')
+                FROM {skill_table} s JOIN {user_table} u ON u.id = s.owner_id
+                """
+            )
+        else:
+            cursor.execute(
+                f"""
+                INSERT INTO {SEARCH_TABLE} (rowid, title, category, description, owner_names)
+                SELECT s.id, s.title, s.category, s.description,
+                    u.username || ' ' || u.first_name || ' ' || u.last_name
+                FROM {skill_table} s JOIN {user_table} u ON u.id = s.owner_id
+                """
+            )
+        return cursor.rowcount
+
+
+# ------------------ SIGNAL HANDLERS ------------------
+@receiver(post_save, sender=Skill)
+def skill_saved(sender, instance, **kwargs):
+    index_skill(instance)
+
+
+@receiver(post_delete, sender=Skill)
+def skill_deleted(sender, instance, **kwargs):
+    remove_skill(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def owner_renamed(sender, instance, created, update_fields=None, **kwargs):
+    # Owner names are part of the document; skip saves that can't change them
+    if created or (update_fields and not {'username', 'first_name', 'last_name'} & set(update_fields)):
+        return
+    for skill in Skill.objects.filter(owner=instance).select_related('owner'):
+        index_skill(skill)
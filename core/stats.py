@@ -0,0 +1,189 @@
+# core/stats.py
+"""
+Incremental maintenance of SkillStats.
+
+Every change to a SkillRequest or Review turns into a single UPDATE of the
+skill's stats row using F() expressions, so concurrent writers never lose
+increments and no request ever has to aggregate SkillRequest/Review live.
+``rebuild_skill_stats`` recomputes rows from scratch for backfills and
+drift repair.
+"""
+from django.db.models import Count, F, FloatField, Max, Q, Sum
+from django.db.models.functions import Cast, NullIf
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Review, Skill, SkillRequest, SkillStats
+
+
+def _apply(skill_id, **deltas):
+    """
+    Add ``deltas`` (field -> int) to a skill's stats row in one UPDATE.
+
+    Returns False when the row doesn't exist yet.
+    """
+    changes = {field: F(field) + delta for field, delta in deltas.items() if delta}
+    rating_delta = deltas.get('rating_sum', 0)
+    count_delta = deltas.get('rating_count', 0)
+    if rating_delta or count_delta:
+        # SET expressions see the pre-update values, so derive the new average
+        # from the same deltas instead of reading the columns back.
+        changes['average_rating'] = Cast(F('rating_sum') + rating_delta, FloatField()) / NullIf(
+            F('rating_count') + count_delta, 0
+        )
+    changes['last_activity_at'] = timezone.now()
+    return SkillStats.objects.filter(skill_id=skill_id).update(**changes) > 0
+
+
+def _status_deltas(old_status, new_status):
+    deltas = {}
+    if old_status in SkillStats.STATUS_FIELDS:
+        deltas[SkillStats.STATUS_FIELDS[old_status]] = -1
+    if new_status in SkillStats.STATUS_FIELDS:
+        field = SkillStats.STATUS_FIELDS[new_status]
+        deltas[field] = deltas.get(field, 0) + 1
+    return deltas
+
+
+def _rating_deltas(rating, sign):
+    return {
+        'review_count': sign,
+        'rating_count': sign if rating is not None else 0,
+        'rating_sum': sign * (rating or 0),
+    }
+
+
+def _merge(*dicts):
+    merged = {}
+    for deltas in dicts:
+        for field, delta in deltas.items():
+            merged[field] = merged.get(field, 0) + delta
+    return merged
+
+
+def rebuild_skill_stats(skill_ids=None):
+    """
+    Recompute stats rows from SkillRequest and Review.
+
+    Two grouped aggregate queries cover every skill in ``skill_ids`` (or all
+    skills), followed by one bulk upsert. Returns the number of rows written.
+    """
+    skills = Skill.objects.all()
+    if skill_ids is not None:
+        skills = skills.filter(pk__in=skill_ids)
+
+    status_counts = {
+        name: Count('pk', filter=Q(status=status))
+        for status, name in SkillStats.STATUS_FIELDS.items()
+    }
+    # Newest request, start, completion and review: last_activity_at is the latest of them
+    activity = ('last_requested', 'last_started', 'last_completed', 'last_reviewed')
+    request_rows = SkillRequest.objects.filter(skill__in=skills).values('skill_id').annotate(
+        total_requests=Count('pk'),
+        last_requested=Max('created_at'),
+        last_started=Max('started_at'),
+        last_completed=Max('completed_at'),
+        **status_counts,
+    ).order_by()
+    review_rows = Review.objects.filter(skill__in=skills).values('skill_id').annotate(
+        review_count=Count('pk'),
+        rating_count=Count('rating'),
+        rating_sum=Sum('rating'),
+        last_reviewed=Max('created_at'),
+    ).order_by()
+
+    requests_by_skill = {row.pop('skill_id'): row for row in request_rows}
+    reviews_by_skill = {row.pop('skill_id'): row for row in review_rows}
+
+    rows = []
+    for skill_id in skills.values_list('pk', flat=True):
+        request_row = requests_by_skill.get(skill_id, {})
+        review_row = reviews_by_skill.get(skill_id, {})
+        moments = [row.pop(name) for row in (request_row, review_row) for name in activity if name in row]
+        stats = SkillStats(skill_id=skill_id, last_activity_at=max(filter(None, moments), default=None))
+        for field, value in request_row.items():
+            setattr(stats, field, value)
+        for field, value in review_row.items():
+            setattr(stats, field, value or 0)
+        stats.average_rating = stats.rating_sum / stats.rating_count if stats.rating_count else None
+        rows.append(stats)
+
+    update_fields = [
+        field.name for field in SkillStats._meta.concrete_fields if not field.primary_key
+    ]
+    SkillStats.objects.bulk_create(
+        rows,
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=['skill'],
+        update_fields=update_fields,
+    )
+    return len(rows)
+
+
+# ------------------ SIGNAL HANDLERS ------------------
+@receiver(post_save, sender=Skill)
+def skill_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        SkillStats.objects.get_or_create(skill=instance)
+
+
+@receiver(post_save, sender=SkillRequest)
+def skill_request_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    loaded = getattr(instance, '_loaded_values', None)
+
+    if created:
+        deltas = _merge({'total_requests': 1}, _status_deltas(None, instance.status))
+    elif loaded is None:
+        # Saved without being loaded first, so there's no old status to diff
+        rebuild_skill_stats([instance.skill_id])
+        deltas = None
+    elif loaded.get('skill_id', instance.skill_id) != instance.skill_id:
+        # Moved to another skill: take it off the old one entirely
+        _apply(loaded['skill_id'], total_requests=-1, **_status_deltas(loaded.get('status'), None))
+        deltas = _merge({'total_requests': 1}, _status_deltas(None, instance.status))
+    else:
+        deltas = _status_deltas(loaded.get('status', instance.status), instance.status)
+
+    if deltas and not _apply(instance.skill_id, **deltas):
+        rebuild_skill_stats([instance.skill_id])
+
+    instance._loaded_values = {'skill_id': instance.skill_id, 'status': instance.status}
+
+
+@receiver(post_delete, sender=SkillRequest)
+def skill_request_deleted(sender, instance, **kwargs):
+    # A missing row means the skill itself is being deleted; nothing to do
+    _apply(instance.skill_id, total_requests=-1, **_status_deltas(instance.status, None))
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    loaded = getattr(instance, '_loaded_values', None)
+
+    if created:
+        deltas = _rating_deltas(instance.rating, 1)
+    elif loaded is None:
+        # Saved without being loaded first, so there's no old rating to diff
+        rebuild_skill_stats([instance.skill_id])
+        deltas = None
+    elif loaded.get('skill_id', instance.skill_id) != instance.skill_id:
+        _apply(loaded['skill_id'], **_rating_deltas(loaded.get('rating'), -1))
+        deltas = _rating_deltas(instance.rating, 1)
+    else:
+        deltas = _merge(_rating_deltas(loaded.get('rating'), -1), _rating_deltas(instance.rating, 1))
+
+    if deltas is not None and not _apply(instance.skill_id, **deltas):
+        rebuild_skill_stats([instance.skill_id])
+
+    instance._loaded_values = {'skill_id': instance.skill_id, 'rating': instance.rating}
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    _apply(instance.skill_id, **_rating_deltas(instance.rating, -1))
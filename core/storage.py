@@ -0,0 +1,204 @@
+# core/storage.py
+"""
+Content-addressed media storage.
+
+ContentAddressedStorage (the default storage, see STORAGES) ignores the
+upload's name and stores the bytes under their SHA-256:
+``blobs/ab/cd/<sha256><ext>``, two levels of 256 directories so none of
+them grows large. The upload is hashed while it is copied to a temporary
+file, a chunk at a time, and then renamed into place; if that blob
+already exists the copy is dropped and the upload shares it.
+
+Sharing needs reference counts, kept in MediaBlob: every ``save()`` takes
+a reference and every ``delete()`` gives one back instead of removing the
+file. The signal handlers below give back the file of a deleted profile or
+message and the old photo of a replaced one, after the transaction
+commits; core.images does the same for image variants. A blob whose
+count drops to zero is removed by a background job GC_GRACE later, unless
+it was uploaded again in the meantime: an upload takes its reference
+before looking for the file, and the collector locks the row and checks
+the count again before removing anything. ``manage.py
+collect_media_garbage`` sweeps up whatever those jobs missed.
+
+Files stored before this backend (``attachments/...``,
+``profile_photos/...``) keep their names and are deleted outright.
+"""
+import hashlib
+import os
+import uuid
+from datetime import timedelta
+
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .jobs import enqueue
+from .models import MediaBlob, Message, StudentProfile
+
+BLOB_DIR = 'blobs'
+TEMP_DIR = f'{BLOB_DIR}/tmp'
+GC_GRACE = timedelta(hours=1)
+
+
+def blob_name(digest, original_name):
+    extension = os.path.splitext(original_name)[1].lower()
+    if not extension[1:].isalnum() or len(extension) > 10:
+        extension = ''
+    return f'{BLOB_DIR}/{digest[:2]}/{digest[2:4]}/{digest}{extension}'
+
+
+def is_blob(name):
+    return name.startswith(BLOB_DIR + '/') and not name.startswith(TEMP_DIR + '/')
+
+
+def take_reference(name, size):
+    """
+    Count one more reference to blob ``name``, creating its row if needed.
+    The update waits for a collector holding the row; if that collector
+    deleted it, the row is created again.
+    """
+    while not MediaBlob.objects.filter(name=name).update(references=F('references') + 1, released_at=None):
+        MediaBlob.objects.bulk_create([MediaBlob(name=name, size=size)], ignore_conflicts=True)
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    def get_available_name(self, name, max_length=None):
+        # Names come from the content, so there is nothing to make unique
+        return name
+
+    def _save(self, name, content):
+        os.makedirs(self.path(TEMP_DIR), exist_ok=True)
+        temp_path = self.path(f'{TEMP_DIR}/{uuid.uuid4().hex}.part')
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0), 0o666)
+            with os.fdopen(fd, 'wb') as temp:
+                for chunk in content.chunks():
+                    if isinstance(chunk, str):
+                        chunk = chunk.encode()
+                    digest.update(chunk)
+                    temp.write(chunk)
+                    size += len(chunk)
+            name = blob_name(digest.hexdigest(), name)
+            # Referenced before looking for the file, so the collector can't remove it in between
+            take_reference(name, size)
+            path = self.path(name)
+            if os.path.exists(path):
+                os.remove(temp_path)
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                if self.file_permissions_mode is not None:
+                    os.chmod(temp_path, self.file_permissions_mode)
+                os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return name
+
+    def delete(self, name):
+        """Give back one reference to a blob; other files are deleted as usual."""
+        if not is_blob(name):
+            return super().delete(name)
+        now = timezone.now()
+        MediaBlob.objects.filter(name=name, references__gt=0).update(references=F('references') - 1, released_at=now)
+        if MediaBlob.objects.filter(name=name, references=0).exists():
+            enqueue(collect_blob, args=[name], run_at=now + GC_GRACE)
+
+    def unlink(self, name):
+        """Remove the file itself."""
+        super().delete(name)
+
+
+# ------------------ GARBAGE COLLECTION ------------------
+def collect_blob(name):
+    """Remove a blob if it still has no references. Runs as a job."""
+    with transaction.atomic():
+        # Uploads taking a reference wait on this lock, and find the file gone once it's released
+        blob = MediaBlob.objects.select_for_update().filter(name=name, references=0).first()
+        if blob is None:
+            return False
+        blob.delete()
+        default_storage.unlink(name)
+    return True
+
+
+def collect_garbage(grace=GC_GRACE, orphans=False):
+    """
+    Remove every blob that has had no references for ``grace``. With
+    ``orphans``, also remove blob files that have no MediaBlob row (the
+    upload's transaction rolled back) and abandoned temporary files.
+    Returns the number of files removed.
+    """
+    cutoff = timezone.now() - grace
+    removed = 0
+    idle = (
+        MediaBlob.objects.annotate(idle_since=Coalesce('released_at', 'created_at'))
+        .filter(references=0, idle_since__lt=cutoff)
+        .values_list('name', flat=True)
+    )
+    for name in idle:
+        removed += collect_blob(name)
+
+    if orphans:
+        root = default_storage.path('')
+        for directory, _, files in os.walk(default_storage.path(BLOB_DIR)):
+            paths = [os.path.join(directory, file) for file in files]
+            old = {
+                os.path.relpath(path, root).replace(os.sep, '/')
+                for path in paths if os.path.getmtime(path) < cutoff.timestamp()
+            }
+            known = set(MediaBlob.objects.filter(name__in=old).values_list('name', flat=True))
+            for name in old - known:
+                if not is_blob(name):
+                    default_storage.unlink(name)  # an abandoned temporary file
+                    removed += 1
+                    continue
+                # An unreferenced row to collect. If an upload still in its
+                # transaction is sharing the file, this insert waits for it
+                # and the collector then finds the reference.
+                MediaBlob.objects.bulk_create(
+                    [MediaBlob(name=name, size=os.path.getsize(default_storage.path(name)))], ignore_conflicts=True
+                )
+                removed += collect_blob(name)
+    return removed
+
+
+# ------------------ SIGNAL HANDLERS ------------------
+def _release(storage, name):
+    if name:
+        transaction.on_commit(lambda: storage.delete(name))
+
+
+@receiver(pre_save, sender=StudentProfile)
+def profile_saving(sender, instance, raw=False, **kwargs):
+    # FileField.pre_save stores a new upload (taking a reference) after this runs
+    instance._photo_uploaded = bool(instance.photo) and not instance.photo._committed
+
+
+@receiver(post_save, sender=StudentProfile)
+def profile_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    # Profiles that weren't loaded from the database (just created) start tracking here
+    loaded = instance.__dict__.setdefault('_loaded_values', {})
+    old, new = loaded.get('photo') or '', instance.photo.name or ''
+    # Re-uploading the same bytes gives the same name but still took a reference
+    if old and (old != new or instance._photo_uploaded):
+        _release(instance.photo.storage, old)
+    loaded['photo'] = new
+
+
+@receiver(post_delete, sender=StudentProfile)
+def profile_deleted(sender, instance, **kwargs):
+    _release(instance.photo.storage, instance.photo.name)
+
+
+@receiver(post_delete, sender=Message)
+def message_deleted(sender, instance, **kwargs):
+    _release(instance.attachment.storage, instance.attachment.name)
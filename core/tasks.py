@@ -0,0 +1,8 @@
+# core/tasks.py
+"""Background job functions for core.jobs.enqueue that have no better home."""
+from django.contrib.auth.models import User
+
+
+def delete_user_account(user_id):
+    """Delete a user and everything that cascades from it (skills, messages, meetings...)."""
+    User.objects.filter(pk=user_id).delete()
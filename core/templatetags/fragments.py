@@ -0,0 +1,64 @@
+# core/templatetags/fragments.py
+"""
+``{% load fragments %}`` caches a block under signal-bumped version keys (core.fragments).
+
+    {% cachefragment 'skill_card' skill=skill.pk skill.is_new %}
+      ...
+    {% endcachefragment %}
+
+The first argument names the fragment (and its row in ``manage.py
+fragment_cache_stats``). ``scope=pk`` arguments name the records the block
+shows, one of core.fragments.SCOPES; any other arguments are plain values
+the block also depends on, such as the viewer's id when it shows
+viewer-specific links. Nothing that differs per request, like a CSRF token,
+belongs inside.
+
+Versions are read once per template: from the view's ``fragment_versions``
+(core.fragments.prefetch) when it passes one, and remembered for the
+blocks that follow.
+"""
+from django import template
+
+from .. import fragments
+
+register = template.Library()
+
+
+class CacheFragmentNode(template.Node):
+    def __init__(self, nodelist, name, scopes, vary_on):
+        self.nodelist = nodelist
+        self.name = name
+        self.scopes = scopes
+        self.vary_on = vary_on
+
+    def render(self, context):
+        scopes = [(scope, value.resolve(context)) for scope, value in self.scopes]
+        vary_on = [value.resolve(context) for value in self.vary_on]
+        versions = context.get('fragment_versions')
+        if versions is None:
+            versions = context.render_context.setdefault('fragment_versions', {})
+        return fragments.cached(
+            self.name.resolve(context), scopes, vary_on, lambda: self.nodelist.render(context), versions
+        )
+
+
+@register.tag
+def cachefragment(parser, token):
+    bits = token.split_contents()
+    if len(bits) < 2:
+        raise template.TemplateSyntaxError(f"'{bits[0]}' needs a fragment name")
+    nodelist = parser.parse(('endcachefragment',))
+    parser.delete_first_token()
+
+    scopes, vary_on = [], []
+    for bit in bits[2:]:
+        scope, equals, value = bit.partition('=')
+        if not equals:
+            vary_on.append(parser.compile_filter(bit))
+        elif scope in fragments.SCOPES:
+            scopes.append((scope, parser.compile_filter(value)))
+        else:
+            raise template.TemplateSyntaxError(
+                f"'{bits[0]}' scopes are {', '.join(fragments.SCOPES)}, not {scope!r}"
+            )
+    return CacheFragmentNode(nodelist, parser.compile_filter(bits[1]), scopes, vary_on)
@@ -0,0 +1,43 @@
+# core/templatetags/images.py
+"""
+``{% load images %}`` helpers for the resized variants written by core.images.
+
+    {% picture profile.photo profile.photo_variants 150 alt="Profile photo" css_class="profile-pic" %}
+
+renders a ``<picture>`` offering the WebP variants with a JPEG fallback,
+sized for a ``size`` pixel box and with the chosen variant's width and
+height set so the page doesn't shift when it loads. Until the variants
+exist it falls back to the original file.
+"""
+from django import template
+from django.utils.html import format_html
+
+from .. import images
+
+register = template.Library()
+
+
+@register.simple_tag
+def picture(fieldfile, variants, size, alt='', css_class=''):
+    if not fieldfile:
+        return ''
+    entry = images.pick(variants, size)
+    if entry is None:
+        return format_html(
+            '<img src="{}" alt="{}" class="{}" loading="lazy" decoding="async">', fieldfile.url, alt, css_class
+        )
+    return format_html(
+        '<picture>'
+        '<source type="image/webp" srcset="{}" sizes="{}px">'
+        '<img src="{}" srcset="{}" sizes="{}px" width="{}" height="{}" alt="{}" class="{}" loading="lazy" decoding="async">'
+        '</picture>',
+        images.srcset(fieldfile, variants, 'webp'), size,
+        fieldfile.storage.url(entry['jpeg']), images.srcset(fieldfile, variants, 'jpeg'), size,
+        entry['width'], entry['height'], alt, css_class,
+    )
+
+
+@register.simple_tag
+def variant_url(fieldfile, variants, size, extension='webp'):
+    """URL of the variant that fits a ``size`` pixel box, e.g. for a CSS background or a link preview."""
+    return images.variant_url(fieldfile, variants, size, extension) or ''
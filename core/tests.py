@@ -0,0 +1,55 @@
+import io
+import shutil
+import tempfile
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import transaction
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from .models import MediaBlob, StudentProfile
+
+
+def jpeg(size=(800, 600)):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, (200, 30, 30)).save(buffer, 'JPEG')
+    return SimpleUploadedFile('photo.jpg', buffer.getvalue(), content_type='image/jpeg')
+
+
+class ImageOwnerDeletedTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings = override_settings(MEDIA_ROOT=media_root, IMAGE_VARIANTS_DEFERRED=False)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        self.user = User.objects.create_user('ann', password='pw')
+        profile = StudentProfile.objects.get(user=self.user)
+        profile.photo = jpeg()
+        with self.captureOnCommitCallbacks(execute=True):
+            profile.save()
+        self.profile = StudentProfile.objects.get(pk=profile.pk)
+
+    def variant_blobs(self):
+        return MediaBlob.objects.filter(variant_of=self.profile.photo.name)
+
+    def test_deleting_profile_releases_variants(self):
+        self.assertTrue(self.profile.photo_variants['sizes'])
+        self.assertTrue(self.variant_blobs().filter(references__gt=0).exists())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                self.profile.delete()
+
+        self.assertFalse(self.variant_blobs().filter(references__gt=0).exists())
+        self.assertFalse(MediaBlob.objects.filter(name=self.profile.photo.name, references__gt=0).exists())
+
+    def test_deleting_user_cascades_to_profile_variants(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                self.user.delete()
+
+        self.assertFalse(StudentProfile.objects.filter(pk=self.profile.pk).exists())
+        self.assertFalse(self.variant_blobs().filter(references__gt=0).exists())
@@ -0,0 +1,206 @@
+# core/uploads.py
+"""
+Chunked, resumable chat attachment uploads.
+
+Instead of one multipart POST, a client
+
+1. starts an upload with the file's name, size and SHA-256
+   (``start_upload``) and gets an id and a chunk size back;
+2. PUTs the chunks in order (``write_chunk``). Each one is appended to a
+   temporary file in CHAT_UPLOAD_DIR, straight from the request stream,
+   so nothing is held in memory. A chunk the server already has is
+   acknowledged again, so a client that lost a response can retry it, and
+   after a dropped connection it asks for ``next_chunk`` and carries on
+   from there;
+3. completes it (``complete_upload``): the file is checked against the
+   declared size and checksum, stored as the attachment of a new Message
+   and the temporary file removed.
+
+Each user may have MAX_OPEN_UPLOADS unfinished uploads totalling at most
+CHAT_UPLOAD_QUOTA_BYTES, each at most CHAT_UPLOAD_MAX_BYTES. An upload that
+receives nothing for ABANDON_AFTER is deleted by a background job
+(core.jobs); ``manage.py cleanup_uploads`` sweeps up anything left over.
+"""
+import hashlib
+import os
+import re
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from .jobs import enqueue
+from .models import ChunkedUpload, Message
+
+CHUNK_SIZE = 1024 * 1024
+MIN_CHUNK_SIZE = 64 * 1024
+MAX_CHUNK_SIZE = 8 * 1024 * 1024
+READ_SIZE = 64 * 1024
+MAX_FILE_SIZE = getattr(settings, 'CHAT_UPLOAD_MAX_BYTES', 50 * 1024 * 1024)
+USER_QUOTA = getattr(settings, 'CHAT_UPLOAD_QUOTA_BYTES', 200 * 1024 * 1024)
+MAX_OPEN_UPLOADS = 5
+ABANDON_AFTER = timedelta(hours=24)
+
+SHA256_RE = re.compile(r'^[0-9a-f]{64}$')
+
+
+class UploadError(Exception):
+    """A request the upload can't accept; ``status`` is the HTTP status to answer with."""
+
+    def __init__(self, message, status=400, **details):
+        super().__init__(message)
+        self.status = status
+        self.details = details
+
+
+def upload_dir():
+    return str(getattr(settings, 'CHAT_UPLOAD_DIR', os.path.join(settings.BASE_DIR, 'upload_tmp')))
+
+
+def temp_path(upload):
+    return os.path.join(upload_dir(), f'{upload.pk.hex}.part')
+
+
+# ------------------ UPLOADING ------------------
+def start_upload(user, filename, size, sha256, chunk_size=None):
+    """Check the limits and open a new upload for ``user``."""
+    filename = os.path.basename(str(filename or '')).strip()
+    if not filename:
+        raise UploadError('A filename is required')
+    try:
+        size = int(size)
+        chunk_size = int(chunk_size or CHUNK_SIZE)
+    except (TypeError, ValueError):
+        raise UploadError('size and chunk_size must be integers')
+    sha256 = str(sha256 or '').lower()
+    if not SHA256_RE.match(sha256):
+        raise UploadError('sha256 must be the hex SHA-256 of the file')
+    if not 0 < size <= MAX_FILE_SIZE:
+        raise UploadError(f'Files must be between 1 byte and {MAX_FILE_SIZE} bytes', status=413)
+    if not MIN_CHUNK_SIZE <= chunk_size <= MAX_CHUNK_SIZE:
+        raise UploadError(f'chunk_size must be between {MIN_CHUNK_SIZE} and {MAX_CHUNK_SIZE} bytes')
+
+    with transaction.atomic():
+        open_uploads = ChunkedUpload.objects.filter(user=user).aggregate(count=Count('pk'), total=Sum('size'))
+        if open_uploads['count'] >= MAX_OPEN_UPLOADS:
+            raise UploadError(f'At most {MAX_OPEN_UPLOADS} uploads can be in progress', status=429)
+        if (open_uploads['total'] or 0) + size > USER_QUOTA:
+            raise UploadError('Unfinished uploads would exceed your upload quota', status=413)
+        upload = ChunkedUpload.objects.create(
+            user=user, filename=filename[:255], size=size, chunk_size=chunk_size, sha256=sha256
+        )
+        os.makedirs(upload_dir(), exist_ok=True)
+        open(temp_path(upload), 'xb').close()
+        enqueue(expire_upload, args=[str(upload.pk)], run_at=upload.created_at + ABANDON_AFTER)
+    return upload
+
+
+def write_chunk(upload, index, stream, length):
+    """
+    Append chunk ``index`` (``length`` bytes read from ``stream``) and
+    return the updated upload. Chunks before ``next_chunk`` are already
+    stored and are acknowledged without reading them again.
+    """
+    with transaction.atomic():
+        # Serializes writers of the same upload (a row lock on PostgreSQL)
+        upload = ChunkedUpload.objects.select_for_update().get(pk=upload.pk)
+        if index < upload.next_chunk:
+            return upload
+        if index > upload.next_chunk:
+            raise UploadError('Chunks must be sent in order', status=409, next_chunk=upload.next_chunk)
+        expected = min(upload.chunk_size, upload.size - upload.received)
+        if length != expected:
+            raise UploadError(f'Chunk {index} must be {expected} bytes', next_chunk=upload.next_chunk)
+
+        written = 0
+        with open(temp_path(upload), 'ab') as temp:
+            # Drop whatever a failed earlier attempt appended past the last acknowledged chunk
+            temp.truncate(upload.received)
+            while written < length:
+                piece = stream.read(min(READ_SIZE, length - written))
+                if not piece:
+                    break
+                temp.write(piece)
+                written += len(piece)
+            if written != length:
+                temp.truncate(upload.received)
+                raise UploadError(f'Chunk {index} was cut short', next_chunk=upload.next_chunk)
+
+        upload.received += length
+        upload.updated_at = timezone.now()
+        upload.save(update_fields=['received', 'updated_at'])
+    return upload
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for piece in iter(lambda: file.read(READ_SIZE), b''):
+            digest.update(piece)
+    return digest.hexdigest()
+
+
+def complete_upload(upload, to_user, content='', reply_to=None):
+    """Verify the finished file and send it as the attachment of a new message, which is returned."""
+    with transaction.atomic():
+        upload = ChunkedUpload.objects.select_for_update().filter(pk=upload.pk).first()
+        if upload is None:
+            raise UploadError('No such upload', status=404)
+        if upload.received != upload.size:
+            raise UploadError('The upload is not complete', status=409, next_chunk=upload.next_chunk)
+        path = temp_path(upload)
+        verified = file_sha256(path) == upload.sha256
+        if verified:
+            message = Message(from_user=upload.user, to_user=to_user, content=content, reply_to=reply_to)
+            with open(path, 'rb') as temp:
+                message.attachment.save(upload.filename, File(temp), save=False)
+            message.save()
+            upload.delete()
+
+    if not verified:
+        discard(upload)
+        raise UploadError('The file does not match its checksum; start the upload again')
+    os.remove(path)
+    return message
+
+
+# ------------------ CLEANUP ------------------
+def discard(upload):
+    path = temp_path(upload)
+    upload.delete()
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def expire_upload(upload_id):
+    """Delete an upload nothing was sent to for ABANDON_AFTER, or check again later. Runs as a job."""
+    upload = ChunkedUpload.objects.filter(pk=upload_id).first()
+    if upload is None:
+        return
+    expires_at = upload.updated_at + ABANDON_AFTER
+    if expires_at <= timezone.now():
+        discard(upload)
+    else:
+        enqueue(expire_upload, args=[upload_id], run_at=expires_at)
+
+
+def cleanup_uploads(older_than=ABANDON_AFTER):
+    """Delete idle uploads and temporary files without an upload. Returns the number of files removed."""
+    cutoff = timezone.now() - older_than
+    removed = 0
+    for upload in ChunkedUpload.objects.filter(updated_at__lt=cutoff):
+        discard(upload)
+        removed += 1
+    if os.path.isdir(upload_dir()):
+        known = {upload.pk.hex for upload in ChunkedUpload.objects.only('pk')}
+        for entry in os.scandir(upload_dir()):
+            stem = entry.name.removesuffix('.part')
+            if stem not in known and entry.is_file() and entry.stat().st_mtime < cutoff.timestamp():
+                os.remove(entry.path)
+                removed += 1
+    return removed
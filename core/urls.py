@@ -1,7 +1,6 @@
-from django.urls import path
+from django.urls import path, re_path
 from . import views
 from django.conf import settings
-from django.conf.urls.static import static
 from django.contrib.auth import views as auth_views
 
 app_name = 'core'
@@ -72,18 +71,28 @@ urlpatterns = [
     path('messages/send/', views.send_message, name='send_message'),
     path('reply_message/', views.reply_message, name='reply_message'),
     path('conversation/<str:username>/', views.conversation, name='conversation'),
+    path('inbox/messages/', views.message_history, name='inbox_history'),
     
     # Modern Chat URLs
     path('chat/', views.chat_dashboard, name='chat_dashboard'),
     path('quick-schedule/<str:username>/', views.quick_schedule, name='quick_schedule'),
     path('chat/send/', views.send_chat_message, name='send_chat_message'),
+    path('chat/uploads/', views.start_chat_upload, name='start_chat_upload'),
+    path('chat/uploads/<uuid:upload_id>/', views.chat_upload, name='chat_upload'),
+    path('chat/uploads/<uuid:upload_id>/chunks/<int:index>/', views.put_chat_upload_chunk, name='chat_upload_chunk'),
+    path('chat/uploads/<uuid:upload_id>/complete/', views.complete_chat_upload, name='complete_chat_upload'),
     path('chat/mark-read/<str:username>/', views.mark_messages_read, name='mark_messages_read'),
     path('chat/search-users/', views.search_users, name='search_users'),
+    path('chat/<str:username>/messages/', views.message_history, name='message_history'),
     path('chat/<str:username>/', views.chat_room, name='chat_room'),
     
     # Meeting URLs
     path('meetings/', views.my_meetings, name='my_meetings'),
     path('meetings/schedule/', views.schedule_meeting, name='schedule_meeting'),
+    path('meetings/free-slots/', views.free_slots, name='free_slots'),
+    path('meetings/busy/', views.busy_times, name='busy_times'),
+    path('meetings/events.json', views.calendar_events, name='calendar_events'),
+    path('meetings/feed/<str:token>.ics', views.meeting_feed, name='meeting_feed'),
     path('meetings/quick/<str:username>/', views.quick_schedule, name='quick_schedule'),
     path('meetings/<int:meeting_id>/', views.meeting_detail, name='meeting_detail'),
     path('meetings/<int:meeting_id>/<str:status>/', views.update_meeting_status, name='update_meeting_status'),
@@ -103,6 +112,7 @@ urlpatterns = [
     path('management/skills/', views.manage_skills, name='manage_skills'),
     path('management/requests/', views.manage_requests, name='manage_requests'),
     path('management/reviews/', views.manage_reviews, name='manage_reviews'),
+    path('management/reports/', views.manage_reports, name='manage_reports'),
     path('management/meetings/', views.manage_meetings, name='manage_meetings'),
      
     # User Management Actions
@@ -127,5 +137,7 @@ urlpatterns = [
     
     # Report Management Actions
     path('management/reports/<int:report_id>/resolve/', views.resolve_report, name='resolve_report'),
-    
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+
+    # Uploaded media (access checks, conditional GET, ranges; see core.media)
+    re_path(r'^%s(?P<name>.+)$' % settings.MEDIA_URL.lstrip('/'), views.serve_media, name='media'),
+]
\ No newline at end of file
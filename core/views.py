@@ -1,5 +1,6 @@
+import json
 from gettext import translation
-from django.http import HttpResponse, JsonResponse, HttpResponseRedirect
+from django.http import Http404, HttpResponse, JsonResponse, HttpResponseRedirect, StreamingHttpResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
@@ -10,47 +11,52 @@ from .forms import UserRegistrationForm, SkillForm
 from .models import StudentProfile, Skill, SkillRequest, Review, Message
 from django.contrib.auth.models import User
 from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 from .models import Message, Notification
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render, redirect, get_object_or_404
-from .forms import StudentProfileForm
+from .forms import AvailabilityForm, StudentProfileForm
 from core import models
 from django.contrib.admin.views.decorators import staff_member_required
 from django.db.models import Count, Avg
 from django.shortcuts import render
 from django.contrib.auth.models import User
-from .models import Skill, SkillRequest, Review, Meeting
+from .models import ChunkedUpload, Skill, SkillRequest, SkillStats, Review, Meeting, Conversation, DailyStats
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
-from django.db.models import Count, Avg, Q
+from django.db.models import Count, Avg, F, Prefetch, Q
 from django.utils import timezone
 from datetime import timedelta, datetime
 from .models import Meeting
 from .forms import MeetingForm
+from .counters import invalidate_badge_counts
+from .jobs import enqueue
+from . import analytics, availability, calendar_feed, fragments, media, realtime, recurrence, search, uploads
+from .notifications import notification_service
+from .pagination import PAGE_SIZE, conversation_messages, page_from_request, paginate_messages, serialize_message
+from .tasks import delete_user_account
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import condition, require_http_methods, require_POST
 
 @staff_member_required
 def admin_dashboard(request):
-    total_users = User.objects.count()
-    total_skills = Skill.objects.count()
-    total_requests = SkillRequest.objects.count()
-    completed_swaps = SkillRequest.objects.filter(status='COMPLETED').count()
-    avg_rating = Review.objects.aggregate(Avg('rating'))['rating__avg'] or 0
-    total_meetings = Meeting.objects.count()
-
-    popular_categories = (
-        Skill.objects.values('category')
-        .annotate(total=Count('id'))
-        .order_by('-total')[:5]
-    )
+    # Two small DailyStats queries; manage.py rollup_stats keeps them current
+    stats = analytics.dashboard()
+    latest = stats['latest'] or DailyStats()
+    requests_by_status = latest.requests_by_status or {}
 
     return render(request, 'core/admin_dashboard.html', {
-        'total_users': total_users,
-        'total_skills': total_skills,
-        'total_requests': total_requests,
-        'completed_swaps': completed_swaps,
-        'avg_rating': round(avg_rating, 2),
-        'total_meetings': total_meetings,
-        'popular_categories': popular_categories,
+        'total_users': latest.total_users or 0,
+        'total_skills': latest.total_skills or 0,
+        'total_requests': sum(requests_by_status.values()),
+        'completed_swaps': requests_by_status.get('COMPLETED', 0),
+        'avg_rating': round(latest.average_rating or 0, 2),
+        'total_meetings': latest.total_meetings or 0,
+        'popular_categories': [
+            {'category': category, 'total': total} for category, total in latest.top_categories or []
+        ],
+        'charts': stats['charts'],
+        'series_since': stats['since'],
+        'stats_as_of': stats['latest'].rolled_up_at if stats['latest'] else None,
     })
 
 
@@ -66,7 +72,10 @@ def view_profile(request, username):
     return render(
         request,
         'core/view_profile.html',
-        {'profile_user': profile_user, 'profile': profile, 'reviews': reviews}
+        {
+            'profile_user': profile_user, 'profile': profile, 'reviews': reviews,
+            'fragment_versions': fragments.prefetch([('profile', profile_user.pk)]),
+        }
     )
 
 def edit_profile(request):
@@ -76,13 +85,16 @@ def edit_profile(request):
     
     if request.method == 'POST':
         form = StudentProfileForm(request.POST, request.FILES, instance=profile)
-        if form.is_valid():
+        availability_form = AvailabilityForm(request.POST, user=request.user, prefix='availability')
+        if form.is_valid() and availability_form.is_valid():
             form.save()
+            availability_form.save()
             return redirect('core:view_profile', username=request.user.username)
     else:
         form = StudentProfileForm(instance=profile)
+        availability_form = AvailabilityForm(user=request.user, prefix='availability')
     
-    return render(request, 'core/edit_profile.html', {'form': form})
+    return render(request, 'core/edit_profile.html', {'form': form, 'availability_form': availability_form})
 
 def welcome(request):
       # If user is logged in, redirect to dashboard instead of index
@@ -142,25 +154,23 @@ def user_logout(request):
 
 
 def dashboard(request):
-    my_skills = request.user.skills.all()
-    my_requests = request.user.requests_made.all()
-    received = request.user.requests_received.all()
-
-    # Add these for enhanced statistics
-    skills_with_stats = []
-    for skill in my_skills:
-        skills_with_stats.append({
-            'skill': skill,
-            'total_requests': skill.requests.count(),
-            'approved_requests': skill.requests.filter(status='APPROVED').count(),
-            'in_progress_requests': skill.requests.filter(status='IN_PROGRESS').count(),
-        })
+    my_skills = request.user.skills.select_related('stats').prefetch_related(
+        # Only the requests the skill cards list by name
+        Prefetch(
+            'requests',
+            queryset=SkillRequest.objects.filter(status__in=['IN_PROGRESS', 'APPROVED']).select_related('requester'),
+            to_attr='active_requests',
+        )
+    )
+    my_requests = request.user.requests_made.select_related('skill', 'owner')
+    received = request.user.requests_received.select_related('skill', 'requester')
 
+    # The querysets stay lazy: sections served from the fragment cache never run them
     return render(request, 'core/dashboard.html', {
         'my_skills': my_skills,
         'my_requests': my_requests,
         'received': received,
-        'skills_with_stats': skills_with_stats,  
+        'fragment_versions': fragments.prefetch([('user', request.user.pk)]),
     })
 
 
@@ -184,25 +194,19 @@ from datetime import timedelta
 
 
 def skill_list(request):
-    # Start with all skills
-    skills = Skill.objects.all()
+    # Start with all skills; card stats are annotations evaluated per page row
+    skills = Skill.objects.with_card_stats()
     
     # Get filter parameters from request
-    sort_by = request.GET.get('sort', 'recent')
     category_filter = request.GET.get('category', '')
     search_query = request.GET.get('q', '')
     level_filter = request.GET.get('level', '')
+    # Searches are ordered by relevance unless a sort was picked explicitly
+    sort_by = request.GET.get('sort', 'relevance' if search_query else 'recent')
     
-    # Apply search filter
+    # Apply full-text search (annotates search_rank)
     if search_query:
-        skills = skills.filter(
-            Q(title__icontains=search_query) |
-            Q(description__icontains=search_query) |
-            Q(category__icontains=search_query) |
-            Q(owner__username__icontains=search_query) |
-            Q(owner__first_name__icontains=search_query) |
-            Q(owner__last_name__icontains=search_query)
-        )
+        skills = search.search_skills(skills, search_query)
     
     # Apply category filter
     if category_filter:
@@ -213,17 +217,15 @@ def skill_list(request):
         skills = skills.filter(level__iexact=level_filter)
     
     # Apply sorting
-    if sort_by == 'popular':
+    if sort_by == 'relevance' and search_query:
+        # Best full-text matches first
+        skills = skills.order_by('-search_rank', '-created_at')
+    elif sort_by == 'popular':
         # Sort by number of requests (most popular first)
-        skills = skills.annotate(request_count=Count('requests')).order_by('-request_count', '-created_at')
+        skills = skills.order_by(F('stats__total_requests').desc(nulls_last=True), '-created_at')
     elif sort_by == 'rating':
-        # Sort by average rating (highest rated first)
-        skills = skills.annotate(
-            avg_rating=Avg('reviews__rating')
-        ).order_by('-avg_rating', '-created_at')
-    elif sort_by == 'recent':
-        # Sort by most recently created
-        skills = skills.order_by('-created_at')
+        # Sort by average rating (highest rated first, unrated last)
+        skills = skills.order_by(F('stats__average_rating').desc(nulls_last=True), '-created_at')
     elif sort_by == 'name':
         # Sort alphabetically by title
         skills = skills.order_by('title')
@@ -231,17 +233,7 @@ def skill_list(request):
         # Default sorting (most recent)
         skills = skills.order_by('-created_at')
     
-    # Add additional context for each skill
-    for skill in skills:
-        # Mark as new if created in last 7 days
-        skill.is_new = (timezone.now() - skill.created_at).days <= 7
-        # Calculate average rating
-        avg_rating = skill.reviews.aggregate(Avg('rating'))['rating__avg']
-        skill.average_rating = round(avg_rating, 1) if avg_rating else None
-        # Get request count
-        skill.request_count = skill.requests.count()
-    
-    # Pagination
+    # Pagination: COUNT(*) plus one LIMIT/OFFSET query for the visible cards
     page = request.GET.get('page', 1)
     paginator = Paginator(skills, 12)  # Show 12 skills per page
     
@@ -267,6 +259,8 @@ def skill_list(request):
         'current_level': level_filter,
         'search_query': search_query,
         'paginator': paginator,
+        # One cache read for every card on the page
+        'fragment_versions': fragments.prefetch([('skill', skill.pk) for skill in skills_page]),
     }
     
     return render(request, 'core/skill_list.html', context)
@@ -288,34 +282,26 @@ def create_skill(request):
 
 
 def skill_detail(request, skill_id):
-    skill = get_object_or_404(Skill, id=skill_id)
-    reviews = Review.objects.filter(skill=skill).order_by('-created_at')
+    skill = get_object_or_404(Skill.objects.select_related('owner', 'stats'), id=skill_id)
+    reviews = Review.objects.filter(skill=skill).select_related('reviewer').order_by('-created_at')
     
-    # Calculate request statistics
-    total_requests = SkillRequest.objects.filter(skill=skill).count()
-    approved_requests = SkillRequest.objects.filter(skill=skill, status='APPROVED').count()
-    pending_requests = SkillRequest.objects.filter(skill=skill, status='PENDING').count()
-    in_progress_requests = SkillRequest.objects.filter(skill=skill, status='IN_PROGRESS').count()
-    completed_requests = SkillRequest.objects.filter(skill=skill, status='COMPLETED').count()
+    # Request statistics are read from the materialized SkillStats row
+    stats = getattr(skill, 'stats', None) or SkillStats(skill=skill)
     
     # Get active sessions (in progress)
-    active_sessions = SkillRequest.objects.filter(skill=skill, status='IN_PROGRESS')
-    
-    # Calculate approval rate (avoid division by zero)
-    approval_rate = 0
-    if total_requests > 0:
-        approval_rate = round((approved_requests / total_requests) * 100)
+    active_sessions = SkillRequest.objects.filter(skill=skill, status='IN_PROGRESS').select_related('requester')
     
     return render(request, 'core/skill_detail.html', {
         'skill': skill,
         'reviews': reviews,
-        'total_requests': total_requests,
-        'approved_requests': approved_requests,
-        'pending_requests': pending_requests,
-        'in_progress_requests': in_progress_requests,
-        'completed_requests': completed_requests,
-        'approval_rate': approval_rate,
+        'total_requests': stats.total_requests,
+        'approved_requests': stats.approved_requests,
+        'pending_requests': stats.pending_requests,
+        'in_progress_requests': stats.in_progress_requests,
+        'completed_requests': stats.completed_requests,
+        'approval_rate': stats.approval_rate,
         'active_sessions': active_sessions,
+        'fragment_versions': fragments.prefetch([('skill', skill.pk)]),
     })
 
 
@@ -378,10 +364,10 @@ def start_skill_session(request, request_id):
     skill_request.save()
     
     # Send notification to requester
-    Notification.objects.create(
-        user=skill_request.requester,
-        message=f"Your skill session for '{skill_request.skill.title}' has started!",
-        notification_type='skill_session'
+    notification_service.notify(
+        [skill_request.requester],
+        f"Your skill session for '{skill_request.skill.title}' has started!",
+        'skill_session',
     )
     
     messages.success(request, f"Skill session with {skill_request.requester.username} started!")
@@ -409,10 +395,10 @@ def complete_skill_session(request, request_id):
     
     # Send notification to the other user
     other_user = skill_request.requester if request.user == skill_request.owner else skill_request.owner
-    Notification.objects.create(
-        user=other_user,
-        message=f"Skill session for '{skill_request.skill.title}' has been completed!",
-        notification_type='skill_completed'
+    notification_service.notify(
+        [other_user],
+        f"Skill session for '{skill_request.skill.title}' has been completed!",
+        'skill_completed',
     )
     
     messages.success(request, f"Skill session completed successfully!")
@@ -463,9 +449,10 @@ def send_message(request):
         )
 
         # Optional: notification
-        Notification.objects.create(
-            user=recipient,
-            message=f"You have a new message from {request.user.username}"
+        notification_service.notify(
+            [recipient],
+            f"You have a new message from {request.user.username}",
+            'message',
         )
 
         messages.success(request, f"Message sent to {recipient.username}.")
@@ -533,12 +520,16 @@ from django.db.models import Q
 
 
 def inbox(request):
-    # Identify all messages where the user is either sender or receiver
-    messages = Message.objects.filter(
-        Q(to_user=request.user) | Q(from_user=request.user)
-    ).order_by('sent_at')
+    # Identify all messages where the user is either sender or receiver,
+    # newest page first (older pages via ?before=<cursor>)
+    page = page_from_request(
+        Message.objects.filter(
+            Q(to_user=request.user) | Q(from_user=request.user)
+        ).select_related('from_user', 'to_user'),
+        request,
+    )
 
-    return render(request, 'core/inbox.html', {'messages': messages})
+    return render(request, 'core/inbox.html', {'messages': page.messages, 'page': page})
 
 def reply_message(request):
     if request.method == 'POST':
@@ -565,16 +556,14 @@ def chat_room(request, username):
     other_user = get_object_or_404(User, username=username)
     room_name = f"chat_{min(request.user.id, other_user.id)}_{max(request.user.id, other_user.id)}"
 
-    # Messages between users
-    chat_messages = Message.objects.filter(
-        from_user__in=[request.user, other_user],
-        to_user__in=[request.user, other_user]
-    ).order_by('sent_at')
+    # Latest page of messages between users
+    page = page_from_request(conversation_messages(request.user, other_user), request)
 
     return render(request, 'core/chat_room.html', {
         'room_name': room_name,
         'other_user': other_user,
-        'messages': chat_messages,
+        'messages': page.messages,
+        'page': page,
     })
 
 def user_profile(request, user_id):
@@ -585,7 +574,9 @@ def user_profile(request, user_id):
 def search_skills(request):
     query = request.GET.get('q')
     if query:
-        results = Skill.objects.filter(title__icontains=query)
+        results = search.search_skills(
+            Skill.objects.select_related('owner'), query
+        ).order_by('-search_rank', '-created_at')
     else:
         results = Skill.objects.none()
     return render(request, 'core/search_results.html', {'results': results, 'query': query})
@@ -598,77 +589,76 @@ def notifications(request):
 
 def conversation(request, username):
     other_user = get_object_or_404(User, username=username)
-    messages = Message.objects.filter(
-        Q(from_user=request.user, to_user=other_user) |
-        Q(from_user=other_user, to_user=request.user)
-    ).order_by('sent_at')
-    return render(request, 'core/conversation.html', {'messages': messages, 'other_user': other_user})
+    page = page_from_request(conversation_messages(request.user, other_user), request)
+    return render(request, 'core/conversation.html', {'messages': page.messages, 'page': page, 'other_user': other_user})
+
+
+@login_required
+def message_history(request, username=None):
+    """JSON pages of message history for infinite scroll (?before= / ?after= cursors)."""
+    if username:
+        other_user = get_object_or_404(User, username=username)
+        queryset = conversation_messages(request.user, other_user)
+    else:
+        queryset = Message.objects.filter(
+            Q(to_user=request.user) | Q(from_user=request.user)
+        ).select_related('from_user', 'to_user')
+
+    try:
+        page = paginate_messages(
+            queryset,
+            before=request.GET.get('before'),
+            after=request.GET.get('after'),
+            limit=request.GET.get('limit', PAGE_SIZE),
+        )
+    except ValueError:
+        return JsonResponse({'status': 'error', 'error': 'Invalid cursor or limit.'}, status=400)
+
+    return JsonResponse({
+        'messages': [serialize_message(message) for message in page.messages],
+        'has_older': page.has_older,
+        'has_newer': page.has_newer,
+        'older_cursor': page.older_cursor,
+        'newer_cursor': page.newer_cursor,
+    })
 
 
 
 def chat_dashboard(request):
     """Main chat dashboard with conversation list and active chat"""
     
-    # Get all unique users that the current user has conversed with
-    # Messages where current user is sender
-    sent_to_users = Message.objects.filter(
-        from_user=request.user
-    ).values_list('to_user', flat=True).distinct()
-    
-    # Messages where current user is receiver  
-    received_from_users = Message.objects.filter(
-        to_user=request.user
-    ).values_list('from_user', flat=True).distinct()
-    
-    # Combine and get unique user IDs
-    all_user_ids = set(sent_to_users) | set(received_from_users)
-    chat_users = User.objects.filter(id__in=all_user_ids)
-    
-    # Get last message and unread count for each user
-    user_data = []
-    for user in chat_users:
-        # Get the last message in this conversation
-        last_message = Message.objects.filter(
-            Q(from_user=request.user, to_user=user) |
-            Q(from_user=user, to_user=request.user)
-        ).order_by('-sent_at').first()
-        
-        # Get unread message count from this user
-        unread_count = Message.objects.filter(
-            from_user=user, to_user=request.user, is_read=False
-        ).count()
-        
-        user_data.append({
-            'user': user,
-            'last_message': last_message,
-            'unread_count': unread_count
-        })
-    
-    # Sort by last message timestamp (most recent first)
-    user_data.sort(key=lambda x: x['last_message'].sent_at if x['last_message'] else timezone.make_aware(datetime.min), reverse=True)
+    # One indexed query over Conversation, already ordered by last activity
+    user_data = [
+        {
+            'user': conversation.other_user(request.user),
+            'last_message': conversation.last_message,
+            'unread_count': conversation.unread_for(request.user),
+        }
+        for conversation in Conversation.objects.for_user(request.user)
+    ]
     
     # Get messages for active conversation if user is selected
     active_user = None
     active_messages = []
+    active_page = None
     selected_user = request.GET.get('user')
     
     if selected_user:
         active_user = get_object_or_404(User, username=selected_user)
-        active_messages = Message.objects.filter(
-            Q(from_user=request.user, to_user=active_user) |
-            Q(from_user=active_user, to_user=request.user)
-        ).order_by('sent_at')
+        # Only the latest page; older history is fetched on scroll via message_history
+        active_page = page_from_request(conversation_messages(request.user, active_user), request)
+        active_messages = active_page.messages
         
         # Mark messages from active user as read when opening conversation
         if active_user:
-            Message.objects.filter(
-                from_user=active_user, to_user=request.user, is_read=False
-            ).update(is_read=True)
+            marked = Conversation.objects.mark_read(request.user, active_user)
+            if marked:
+                invalidate_badge_counts(request.user.id)
+                realtime.push([realtime.unread_event(request.user, active_user)])
     
     # Get upcoming meetings
     now = timezone.now()
-    upcoming_meetings = Meeting.objects.filter(
-        Q(organizer=request.user) | Q(participants=request.user),
+    upcoming_meetings = Meeting.objects.for_user(request.user).with_people().filter(
         scheduled_date__gte=now,
         status__in=['scheduled', 'confirmed']
     ).order_by('scheduled_date')[:5]
@@ -677,6 +667,7 @@ def chat_dashboard(request):
         'user_data': user_data,  # Pass the structured data instead of raw users
         'active_user': active_user,
         'active_messages': active_messages,
+        'active_page': active_page,
         'upcoming_meetings': upcoming_meetings,
         'users': User.objects.exclude(id=request.user.id)
     })
@@ -706,13 +697,105 @@ def send_chat_message(request):
     return redirect('core:chat_dashboard')
 
 
+# ---------- Chunked attachment uploads (see core.uploads) ----------
+def _upload_state(upload):
+    return {
+        'upload_id': str(upload.pk),
+        'size': upload.size,
+        'chunk_size': upload.chunk_size,
+        'received': upload.received,
+        'next_chunk': upload.next_chunk,
+    }
+
+
+def _upload_error(exc):
+    return JsonResponse({'error': str(exc), **exc.details}, status=exc.status)
+
+
+def _json_body(request):
+    try:
+        data = json.loads(request.body or b'{}')
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+@login_required
+@require_POST
+def start_chat_upload(request):
+    """Open an upload: JSON ``{filename, size, sha256[, chunk_size]}``."""
+    data = _json_body(request)
+    if data is None:
+        return JsonResponse({'error': 'Expected a JSON object'}, status=400)
+    try:
+        upload = uploads.start_upload(
+            request.user, data.get('filename'), data.get('size'), data.get('sha256'), data.get('chunk_size')
+        )
+    except uploads.UploadError as exc:
+        return _upload_error(exc)
+    return JsonResponse(_upload_state(upload), status=201)
+
+
+@login_required
+@require_http_methods(['GET', 'DELETE'])
+def chat_upload(request, upload_id):
+    """Where an upload stands (to resume it), or DELETE to abandon it."""
+    upload = get_object_or_404(ChunkedUpload, pk=upload_id, user=request.user)
+    if request.method == 'DELETE':
+        uploads.discard(upload)
+        return HttpResponse(status=204)
+    return JsonResponse(_upload_state(upload))
+
+
+@login_required
+@require_http_methods(['PUT'])
+def put_chat_upload_chunk(request, upload_id, index):
+    """The raw bytes of chunk ``index``, streamed to disk rather than read into memory."""
+    upload = get_object_or_404(ChunkedUpload, pk=upload_id, user=request.user)
+    try:
+        length = int(request.META.get('CONTENT_LENGTH') or 0)
+        upload = uploads.write_chunk(upload, index, request, length)
+    except ValueError:
+        return JsonResponse({'error': 'Content-Length is required'}, status=411)
+    except uploads.UploadError as exc:
+        return _upload_error(exc)
+    return JsonResponse(_upload_state(upload))
+
+
+@login_required
+@require_POST
+def complete_chat_upload(request, upload_id):
+    """Send the finished upload: JSON ``{to_user, content[, reply_to]}``; returns the new message."""
+    upload = get_object_or_404(ChunkedUpload, pk=upload_id, user=request.user)
+    data = _json_body(request)
+    if data is None:
+        return JsonResponse({'error': 'Expected a JSON object'}, status=400)
+    try:
+        to_user_id = int(data.get('to_user'))
+        reply_to_id = int(data['reply_to']) if data.get('reply_to') else None
+    except (TypeError, ValueError):
+        return JsonResponse({'error': 'to_user and reply_to must be integer ids'}, status=400)
+    to_user = get_object_or_404(User, pk=to_user_id)
+    reply_to = None
+    if reply_to_id:
+        reply_to = Message.objects.filter(
+            Q(from_user=request.user) | Q(to_user=request.user), pk=reply_to_id
+        ).first()
+    try:
+        message = uploads.complete_upload(upload, to_user, data.get('content') or '', reply_to)
+    except uploads.UploadError as exc:
+        return _upload_error(exc)
+    return JsonResponse(serialize_message(message), status=201)
+
+
 
 def mark_messages_read(request, username):
     """Mark messages from a user as read"""
     other_user = get_object_or_404(User, username=username)
-    Message.objects.filter(
-        from_user=other_user, to_user=request.user, is_read=False
-    ).update(is_read=True)
+    marked = Conversation.objects.mark_read(request.user, other_user)
+    if marked:
+        invalidate_badge_counts(request.user.id)
+        realtime.push([realtime.unread_event(request.user, other_user)])
     
     return JsonResponse({'status': 'success'})
 
@@ -761,13 +844,13 @@ def schedule_meeting(request):
             form.save_m2m()  # Save participants
             
             # Send notifications to participants
-            for participant in meeting.participants.all():
-                if participant != request.user:
-                    Notification.objects.create(
-                        user=participant,
-                        message=f"{request.user.username} invited you to a meeting: {meeting.title}",
-                        notification_type='meeting_invite'
-                    )
+            notification_service.notify(
+                meeting.participants.all(),
+                f"{request.user.username} invited you to a meeting: {meeting.title}",
+                'meeting_invite',
+                related_meeting=meeting,
+                exclude=request.user,
+            )
             
             messages.success(request, f"Meeting '{meeting.title}' scheduled successfully!")
             return redirect('core:meeting_detail', meeting_id=meeting.id)
@@ -781,96 +864,227 @@ def schedule_meeting(request):
             'duration_minutes': 60
         }, organizer=request.user)
     
-    return render(request, 'core/schedule_meeting.html', {'form': form})
+    return render(request, 'core/schedule_meeting.html', {
+        'form': form,
+        'suggested_slots': _suggested_slots([request.user]),
+    })
+
+
+SUGGESTED_SLOTS = 5
+SUGGESTION_WINDOW_DAYS = 28
+MEETING_LIST_WINDOW = timedelta(days=90)  # how far recurring meetings are expanded in lists
+SCHEDULE_FORBIDDEN = "You can only look up the schedules of people you meet, swap skills or chat with"
 
 
+def _suggested_slots(users, duration_minutes=60, days=SUGGESTION_WINDOW_DAYS):
+    """The next common free slots for ``users``, in local time."""
+    now = timezone.now()
+    slots = availability.free_slots(users, now, now + timedelta(days=days), duration_minutes, limit=SUGGESTED_SLOTS)
+    return [timezone.localtime(slot) for slot in slots]
+
+
+@login_required
+def free_slots(request):
+    """JSON: common free slots for the current user plus ?users=1,2 (&duration=60&days=28)."""
+    try:
+        user_ids = {int(user_id) for user_id in request.GET.get('users', '').split(',') if user_id}
+        duration = int(request.GET.get('duration') or 60)
+        days = int(request.GET.get('days') or SUGGESTION_WINDOW_DAYS)
+    except ValueError:
+        return JsonResponse({'error': 'Invalid parameters'}, status=400)
+    if not 15 <= duration <= 480 or not 1 <= days <= 92 or len(user_ids) > 100:
+        return JsonResponse({'error': 'Invalid parameters'}, status=400)
+    if not availability.schedule_contacts(request.user, user_ids) >= user_ids:
+        return JsonResponse({'error': SCHEDULE_FORBIDDEN}, status=403)
+
+    user_ids.add(request.user.pk)
+    return JsonResponse({'slots': [
+        {'value': slot.strftime('%Y-%m-%dT%H:%M'), 'label': slot.strftime('%a %d %b, %H:%M')}
+        for slot in _suggested_slots(user_ids, duration, days)
+    ]})
+
+
+def _parse_moment(value):
+    """An ISO date or datetime from the query string as an aware datetime, or None."""
+    try:
+        moment = parse_datetime(value)
+        if moment is None:
+            day = parse_date(value)
+            if day is None:
+                return None
+            moment = datetime.combine(day, datetime.min.time())
+    except ValueError:
+        # Well formed but impossible, like 2024-02-30
+        return None
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+@login_required
+def busy_times(request):
+    """JSON: merged busy blocks per user for ?users=1,2&start=&end= (ISO dates or datetimes, a week by default)."""
+    try:
+        user_ids = {int(user_id) for user_id in request.GET.get('users', '').split(',') if user_id}
+    except ValueError:
+        return JsonResponse({'error': 'Invalid parameters'}, status=400)
+    start = _parse_moment(request.GET['start']) if request.GET.get('start') else timezone.now()
+    if not user_ids or len(user_ids) > 100 or start is None:
+        return JsonResponse({'error': 'Invalid parameters'}, status=400)
+    end = _parse_moment(request.GET['end']) if request.GET.get('end') else start + timedelta(days=7)
+    if end is None:
+        return JsonResponse({'error': 'Invalid parameters'}, status=400)
+    if not start < end <= start + timedelta(days=92):
+        return JsonResponse({'error': 'The window must be between 0 and 92 days'}, status=400)
+    if not availability.schedule_contacts(request.user, user_ids) >= user_ids:
+        return JsonResponse({'error': SCHEDULE_FORBIDDEN}, status=403)
+
+    return JsonResponse({'busy': {
+        user_id: [[block_start.isoformat(), block_end.isoformat()] for block_start, block_end in blocks]
+        for user_id, blocks in availability.busy_intervals(user_ids, start, end).items()
+    }})
+
+
+@login_required
 def calendar(request):
-    # Get meetings where user is either organizer or participant
-    meetings = Meeting.objects.filter(
-        Q(organizer=request.user) | Q(participants=request.user)
-    ).distinct().select_related('organizer', 'related_skill')
+    # The month grid fetches its meetings from calendar_events; the list only shows what's coming up
+    now = timezone.now()
+    meetings = recurrence.expand(
+        Meeting.objects.for_user(request.user)
+        .filter(ends_at__gte=now, scheduled_date__lt=now + MEETING_LIST_WINDOW)
+        .with_people(),
+        now,
+        now + MEETING_LIST_WINDOW,
+    )
     
     context = {
         'meetings': meetings,
+        'feed_url': request.build_absolute_uri(
+            reverse('core:meeting_feed', args=[calendar_feed.feed_token(request.user)])
+        ),
     }
     return render(request, 'core/calendar.html', context)
 
-def quick_schedule(request, username):
-    """Quick schedule a meeting with a specific user"""
-    try:
-        other_user = User.objects.get(username=username)
-    except User.DoesNotExist:
-        messages.error(request, "User not found.")
-        return redirect('core:chat_dashboard')
-    
-    if request.method == 'POST':
-        form = MeetingForm(request.POST, request.FILES, organizer=request.user)
-        if form.is_valid():
-            meeting = form.save(commit=False)
-            meeting.organizer = request.user
-            meeting.save()
-            form.save_m2m()  # Save participants
-            
-            # Ensure the target user is added as participant
-            meeting.participants.add(other_user)
-            
-            # Send notification to the participant
-            if other_user != request.user:
-                Notification.objects.create(
-                    user=other_user,
-                    message=f"{request.user.get_full_name() or request.user.username} invited you to a meeting: {meeting.title}",
-                    notification_type='meeting_invite'
-                )
-            
-            messages.success(request, f"Meeting scheduled successfully with {other_user.get_full_name() or other_user.username}!")
-            return redirect('core:chat_dashboard')  # Redirect back to chat
-            
-    else:
-        # Pre-fill with default values and the target user as participant
-        default_time = timezone.now() + timedelta(hours=24)  # Tomorrow same time
-        form = MeetingForm(
-            initial={
-                'scheduled_date': default_time.strftime('%Y-%m-%dT%H:%M'),
-                'title': f"Meeting with {other_user.get_full_name() or other_user.username}",
-                'organizer': request.user
-            },
-            organizer=request.user
-        )
-    
-    return render(request, 'core/quick_schedule.html', {
-        'form': form,
-        'other_user': other_user
-    })
+
+@login_required
+def calendar_events(request):
+    """JSON list of the user's meetings overlapping ?start=&end= (ISO dates or datetimes)."""
+    start = _parse_moment(request.GET.get('start', ''))
+    end = _parse_moment(request.GET.get('end', ''))
+    if start is None or end is None or not start < end <= start + timedelta(days=100):
+        return JsonResponse({'error': 'start and end must span at most 100 days'}, status=400)
+    return JsonResponse(calendar_feed.events_between(request.user, start, end), safe=False)
+
+
+def _feed_owner_state(request, token):
+    """(user, (etag, last_modified)) for a feed token, computed once per request."""
+    if not hasattr(request, '_feed_owner_state'):
+        user_id = calendar_feed.user_id_for_token(token)
+        user = User.objects.filter(pk=user_id, is_active=True).first() if user_id else None
+        request._feed_owner_state = (user, calendar_feed.feed_state(user) if user else (None, None))
+    return request._feed_owner_state
+
+
+@login_required
+def serve_media(request, name):
+    """Uploaded files under MEDIA_URL; attachments only for the people in their message."""
+    if not media.can_access(request.user, name):
+        raise Http404("No such file")
+    return media.serve(request, name)
+
+
+@condition(
+    etag_func=lambda request, token: _feed_owner_state(request, token)[1][0],
+    last_modified_func=lambda request, token: _feed_owner_state(request, token)[1][1],
+)
+def meeting_feed(request, token):
+    """ICS subscription feed; calendar apps revalidate with If-None-Match / If-Modified-Since."""
+    user, _ = _feed_owner_state(request, token)
+    if user is None:
+        raise Http404("Unknown calendar feed")
+    response = StreamingHttpResponse(
+        calendar_feed.ics_feed(user, request.get_host()), content_type='text/calendar; charset=utf-8'
+    )
+    response['Content-Disposition'] = 'inline; filename="skillswap-meetings.ics"'
+    return response
+
+
+def _requested_occurrence(request, meeting):
+    """The occurrence of a series named by ?occurrence=, or the meeting itself. Unknown starts 404."""
+    value = request.GET.get('occurrence')
+    if not value or not meeting.recurrence:
+        return meeting
+    start = parse_datetime(value)
+    if start is None or timezone.is_naive(start) or not meeting.has_occurrence(start):
+        raise Http404("No such occurrence")
+    exception = meeting.exceptions.filter(original_start=start).first()
+    return exception or meeting.occurrence(start)
 
 
 def meeting_detail(request, meeting_id):
-    """View meeting details"""
-    meeting = get_object_or_404(Meeting, id=meeting_id)
+    """
+    View meeting details.
+
+    Queries: 2 (the meeting with organizer and skill, its participants),
+    plus 1 for an occurrence of a recurring meeting.
+    """
+    meeting = get_object_or_404(Meeting.objects.with_people(), id=meeting_id)
     
     # Check if user is organizer or participant
-    if request.user != meeting.organizer and request.user not in meeting.participants.all():
+    if not meeting.is_participant(request.user):
         messages.error(request, "You don't have permission to view this meeting.")
         return redirect('core:my_meetings')
+
+    meeting = _requested_occurrence(request, meeting)
+    if meeting.pk != meeting_id:
+        return redirect(meeting)
     
     return render(request, 'core/meeting_detail.html', {
         'meeting': meeting,
+        'occurrence_query': meeting.get_absolute_url().partition('?')[2],
         'now': timezone.now()  # Pass current time to template
     })
 
 
+PAST_MEETINGS_PER_PAGE = 20
+
+
 def my_meetings(request):
-    """View user's meetings"""
+    """
+    View user's meetings.
+
+    Queries: 9 however many meetings there are. Upcoming: the meetings,
+    their participants, and the exceptions of any recurring series among
+    them. Past, newest first and paginated: the recurring series, their
+    participants and exceptions, then COUNT(*), one page and its
+    participants for the other meetings.
+    """
     now = timezone.now()
-    
-    # Get meetings where user is organizer or participant
-    organized = request.user.organized_meetings.all()
-    participating = request.user.meetings.all()
-    
-    # Combine and remove duplicates
-    all_meetings = (organized | participating).distinct()
-    
-    upcoming_meetings = all_meetings.filter(scheduled_date__gte=now, status__in=['scheduled', 'confirmed'])
-    past_meetings = all_meetings.filter(scheduled_date__lt=now) | all_meetings.filter(status='completed')
+    window_end = now + MEETING_LIST_WINDOW
+    meetings = Meeting.objects.for_user(request.user).with_people()
+
+    # Recurring series are expanded to their occurrences within MEETING_LIST_WINDOW
+    upcoming_meetings = [
+        meeting
+        for meeting in recurrence.expand(meetings.upcoming(now).filter(scheduled_date__lt=window_end), now, window_end)
+        if meeting.scheduled_date >= now
+    ]
+
+    # Past occurrences of a series within MEETING_LIST_WINDOW, merged with the other meetings by start
+    past = meetings.past(now)
+    window_start = now - MEETING_LIST_WINDOW
+    occurrences = recurrence.expand(past.exclude(recurrence='').filter(ends_at__gt=window_start), window_start, now)
+    paginator = Paginator(
+        recurrence.NewestFirst(past.filter(recurrence=''), occurrences),
+        PAST_MEETINGS_PER_PAGE,
+    )
+    page = request.GET.get('page', 1)
+    try:
+        past_meetings = paginator.page(page)
+    except PageNotAnInteger:
+        past_meetings = paginator.page(1)
+    except EmptyPage:
+        past_meetings = paginator.page(paginator.num_pages)
     
     return render(request, 'core/my_meetings.html', {
         'upcoming_meetings': upcoming_meetings,
@@ -879,55 +1093,46 @@ def my_meetings(request):
 
 
 def update_meeting_status(request, meeting_id, status):
-    """Update meeting status (confirm, cancel, etc.)"""
+    """
+    Update meeting status (confirm, cancel, etc.)
+
+    Queries: the meeting, a membership EXISTS unless the user organizes
+    it, the update and its MeetingChange row, then the participant lookup
+    and notification job. A single occurrence of a series adds the
+    exception lookup and its creation.
+    """
     meeting = get_object_or_404(Meeting, id=meeting_id)
     
     # Check permissions
-    if request.user != meeting.organizer and request.user not in meeting.participants.all():
+    if not meeting.is_participant(request.user):
         messages.error(request, "You don't have permission to update this meeting.")
         return redirect('core:my_meetings')
     
     valid_statuses = [choice[0] for choice in Meeting.STATUS_CHOICES]
     if status in valid_statuses:
-        meeting.status = status
-        meeting.save()
+        occurrence = _requested_occurrence(request, meeting)
+        if occurrence.occurrence_start is not None:
+            # One session of a series: give it its own row rather than changing the whole series
+            meeting = meeting.materialize_occurrence(occurrence.occurrence_start, status=status)
+        else:
+            meeting = occurrence
+            meeting.status = status
+            meeting.save()
         
         # Notify other participants
-        participants = meeting.participants.exclude(id=request.user.id)
-        for participant in participants:
-            Notification.objects.create(
-                user=participant,
-                message=f"Meeting '{meeting.title}' status updated to {status} by {request.user.username}",
-                notification_type='meeting_update'
-            )
+        notification_service.notify(
+            meeting.participants.all(),
+            f"Meeting '{meeting.title}' status updated to {status} by {request.user.username}",
+            'meeting_update',
+            related_meeting=meeting,
+            exclude=request.user,
+        )
         
         messages.success(request, f"Meeting status updated to {status}.")
     
     return redirect('core:meeting_detail', meeting_id=meeting.id)
 
 
-def meeting_calendar(request):
-    """Calendar view of meetings"""
-    meetings = Meeting.objects.filter(
-        models.Q(organizer=request.user) | models.Q(participants=request.user)
-    ).distinct()
-    
-    # Format for fullcalendar
-    events = []
-    for meeting in meetings:
-        events.append({
-            'id': meeting.id,
-            'title': meeting.title,
-            'start': meeting.scheduled_date.isoformat(),
-            'end': meeting.end_time.isoformat(),
-            'url': f"/meetings/{meeting.id}/",
-            'color': '#6366f1' if meeting.organizer == request.user else '#10b981',
-            'textColor': 'white'
-        })
-    
-    return render(request, 'core/meeting_calendar.html', {'events': events})
-
-
 def quick_schedule(request, username):
     """Quick schedule with a specific user"""
     other_user = get_object_or_404(User, username=username)
@@ -938,10 +1143,19 @@ def quick_schedule(request, username):
             meeting = form.save(commit=False)
             meeting.organizer = request.user
             meeting.save()
+            form.save_m2m()  # Save participants
             meeting.participants.add(other_user)  # Add the specific user
             
+            notification_service.notify(
+                [other_user],
+                f"{request.user.get_full_name() or request.user.username} invited you to a meeting: {meeting.title}",
+                'meeting_invite',
+                related_meeting=meeting,
+                exclude=request.user,
+            )
+            
             messages.success(request, f"Meeting scheduled with {other_user.username}!")
-            return redirect('core:chat_dashboard') + f'?user={username}'
+            return redirect(reverse('core:chat_dashboard') + f'?user={username}')
     else:
         default_time = timezone.now() + timedelta(hours=24)
         form = MeetingForm(initial={
@@ -950,10 +1164,13 @@ def quick_schedule(request, username):
             'participants': [other_user]
         }, organizer=request.user)
     
-    return render(request, 'core/quick_schedule.html', {
-        'form': form,
-        'other_user': other_user
-    })
+    context = {'form': form, 'other_user': other_user, 'suggested_slots': []}
+    # Suggestions show when the other user is free, so only for people already in touch
+    if availability.schedule_contacts(request.user, [other_user.pk]):
+        context['suggested_slots'] = _suggested_slots([request.user, other_user])
+    else:
+        context['slots_error'] = SCHEDULE_FORBIDDEN
+    return render(request, 'core/quick_schedule.html', context)
 
 
 from django.contrib.auth.models import User
@@ -962,6 +1179,7 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from .models import Skill, SkillRequest, Review, Report
 from .forms import SkillForm
+from .admin_lists import Filter, ManagementList
 
 # ---------- Admin Portal ----------
 @staff_member_required
@@ -969,10 +1187,29 @@ def admin_portal(request):
     return render(request, 'core/admin_portal.html')
 
 # ---------- Manage Users ----------
+def _search_users(queryset, text):
+    return queryset.filter(Q(username__istartswith=text) | Q(email__istartswith=text))
+
+
+USER_LIST = ManagementList(
+    User.objects.select_related('profile'),
+    sorts={
+        'username': ('Username', 'username'),
+        'newest': ('Newest', '-id'),
+        'oldest': ('Oldest', 'id'),
+    },
+    default_sort='username',
+    filters=[Filter('staff', 'Role', 'is_staff', [('true', 'Staff'), ('false', 'Students')])],
+    search=_search_users,
+    only=['id', 'username', 'email', 'profile__course', 'profile__year'],
+)
+
+
 @staff_member_required
 def manage_users(request):
-    users = User.objects.all()
-    return render(request, 'core/manage_users.html', {'users': users})
+    """Two queries per page: the estimated count and the rows (profiles joined in)."""
+    page = USER_LIST.page(request)
+    return render(request, 'core/manage_users.html', {'users': page.rows, 'page': page})
 
 @staff_member_required
 def delete_user(request, user_id):
@@ -982,10 +1219,30 @@ def delete_user(request, user_id):
     return redirect('core:manage_users')
 
 # ---------- Manage Skills ----------
+SKILL_LIST = ManagementList(
+    Skill.objects.select_related('owner'),
+    sorts={
+        'newest': ('Newest', '-created_at'),
+        'oldest': ('Oldest', 'created_at'),
+        'title': ('Title', 'title'),
+    },
+    default_sort='newest',
+    filters=[
+        Filter('category', 'Category', 'category'),
+        Filter('level', 'Level', 'level__iexact', [
+            ('beginner', 'Beginner'), ('intermediate', 'Intermediate'), ('advanced', 'Advanced'), ('expert', 'Expert'),
+        ]),
+    ],
+    search=search.search_skills,
+    only=['id', 'title', 'category', 'level', 'created_at', 'owner__id', 'owner__username'],
+)
+
+
 @staff_member_required
 def manage_skills(request):
-    skills = Skill.objects.all()
-    return render(request, 'core/manage_skills.html', {'skills': skills})
+    """Two queries per page: the estimated count and the rows (owners joined in)."""
+    page = SKILL_LIST.page(request)
+    return render(request, 'core/manage_skills.html', {'skills': page.rows, 'page': page})
 
 @staff_member_required
 def delete_skill(request, skill_id):
@@ -1018,23 +1275,64 @@ def delete_request(request, req_id):
     messages.success(request, 'Skill request deleted successfully.')
     return redirect('core:manage_requests')
 
+def _search_requests(queryset, text):
+    """``#12``/``12`` finds a request by id; anything else matches the skill or either username by prefix."""
+    number = text.lstrip('#')
+    if number.isdigit():
+        return queryset.filter(pk=int(number))
+    return queryset.filter(
+        Q(skill__title__istartswith=text)
+        | Q(requester__username__istartswith=text)
+        | Q(owner__username__istartswith=text)
+    )
+
+
+REQUEST_LIST = ManagementList(
+    SkillRequest.objects.select_related('skill', 'requester', 'owner'),
+    sorts={
+        'newest': ('Newest', '-created_at'),
+        'oldest': ('Oldest', 'created_at'),
+    },
+    default_sort='newest',
+    # approve_request sets APPROVED, which isn't one of STATUS_CHOICES
+    filters=[Filter('status', 'Status', 'status', [*SkillRequest.STATUS_CHOICES, ('APPROVED', 'Approved')])],
+    search=_search_requests,
+    only=[
+        'id', 'status', 'created_at', 'scheduled_for',
+        'skill__id', 'skill__title', 'requester__id', 'requester__username', 'owner__id', 'owner__username',
+    ],
+)
+
+
 @staff_member_required
 def manage_requests(request):
-    status_filter = request.GET.get('status', '')
-    if status_filter:
-        requests = SkillRequest.objects.filter(status=status_filter)
-    else:
-        requests = SkillRequest.objects.all()
-    
-    return render(request, 'core/manage_requests.html', {
-        'requests': requests,  # Make sure this is 'requests' (plural)
-        'current_status': status_filter
-    })
+    """Two queries per page: the estimated count and the rows (skill and both users joined in)."""
+    page = REQUEST_LIST.page(request)
+    return render(request, 'core/manage_requests.html', {'requests': page.rows, 'page': page})
+
 # ---------- Manage Reviews ----------
+def _search_reviews(queryset, text):
+    return queryset.filter(Q(skill__title__istartswith=text) | Q(reviewer__username__istartswith=text))
+
+
+REVIEW_LIST = ManagementList(
+    Review.objects.select_related('skill', 'reviewer'),
+    sorts={
+        'newest': ('Newest', '-created_at'),
+        'oldest': ('Oldest', 'created_at'),
+    },
+    default_sort='newest',
+    filters=[Filter('rating', 'Rating', 'rating', [(str(n), f'{n}/5') for n in range(5, 0, -1)])],
+    search=_search_reviews,
+    only=['id', 'rating', 'comment', 'created_at', 'skill__id', 'skill__title', 'reviewer__id', 'reviewer__username'],
+)
+
+
 @staff_member_required
 def manage_reviews(request):
-    reviews = Review.objects.all()
-    return render(request, 'core/manage_reviews.html', {'reviews': reviews})
+    """Two queries per page: the estimated count and the rows (skill and reviewer joined in)."""
+    page = REVIEW_LIST.page(request)
+    return render(request, 'core/manage_reviews.html', {'reviews': page.rows, 'page': page})
 
 @staff_member_required
 def delete_review(request, review_id):
@@ -1044,10 +1342,31 @@ def delete_review(request, review_id):
     return redirect('core:manage_reviews')
 
 # ---------- Manage Reports ----------
+def _search_reports(queryset, text):
+    return queryset.filter(Q(reporter__username__istartswith=text) | Q(reported_user__username__istartswith=text))
+
+
+REPORT_LIST = ManagementList(
+    Report.objects.select_related('reporter', 'reported_user'),
+    sorts={
+        'newest': ('Newest', '-created_at'),
+        'oldest': ('Oldest', 'created_at'),
+    },
+    default_sort='newest',
+    filters=[Filter('resolved', 'State', 'resolved', [('false', 'Open'), ('true', 'Resolved')])],
+    search=_search_reports,
+    only=[
+        'id', 'reason', 'created_at', 'resolved',
+        'reporter__id', 'reporter__username', 'reported_user__id', 'reported_user__username',
+    ],
+)
+
+
 @staff_member_required
 def manage_reports(request):
-    reports = Report.objects.all()
-    return render(request, 'core/manage_reports.html', {'reports': reports})
+    """Two queries per page: the estimated count and the rows (both users joined in)."""
+    page = REPORT_LIST.page(request)
+    return render(request, 'core/manage_reports.html', {'reports': page.rows, 'page': page})
 
 @staff_member_required
 def resolve_report(request, report_id):
@@ -1079,7 +1398,10 @@ def edit_user(request, user_id):
 @staff_member_required
 def delete_user(request, user_id):
     user = get_object_or_404(User, id=user_id)
-    user.delete()
+    # The cascade touches every table, so lock the account now and delete in the background
+    user.is_active = False
+    user.save(update_fields=['is_active'])
+    enqueue(delete_user_account, args=[user.id])
     messages.success(request, 'User deleted successfully.')
     return redirect('core:manage_users')
 
@@ -1122,7 +1444,8 @@ def delete_review(request, review_id):
 # ---------- Manage Meetings ----------
 @staff_member_required
 def manage_meetings(request):
-    meetings = Meeting.objects.select_related('organizer').prefetch_related('participants')
+    # Queries: 2 (meetings with organizers and skills, their participants)
+    meetings = Meeting.objects.with_people()
     return render(request, 'core/manage_meetings.html', {'meetings': meetings})
 
 @staff_member_required
@@ -1218,7 +1541,7 @@ def debug_email_test(request):
             [request.user.email] if request.user.is_authenticated else ['test@example.com'],
             fail_silently=False,
         )
-        results.append("✓ Test email sent successfully")
+        results.append("✓ Test email queued for delivery (run_worker sends it)")
     except Exception as e:
         results.append(f"✗ Email Sending Failed: {str(e)}")
     
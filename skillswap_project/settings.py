@@ -2,6 +2,8 @@ import dj_database_url
 import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 # Security - Use environment variable in production
@@ -71,13 +73,65 @@ INSTALLED_APPS = [
 # ASGI Application
 ASGI_APPLICATION = 'skillswap_django_project.asgi.application'
 
-# Channel layer for local dev (use Redis in production)
+# Channel layer: queues and groups live in the database, so group_send
+# reaches sockets in every worker process (LISTEN/NOTIFY on PostgreSQL,
+# short polling on SQLite). See core/channel_layers.py.
 CHANNEL_LAYERS = {
     'default': {
-        'BACKEND': 'channels.layers.InMemoryChannelLayer',
+        'BACKEND': 'core.channel_layers.DatabaseChannelLayer',
+        'CONFIG': {
+            'expiry': 60,
+            'group_expiry': 86400,
+            'capacity': 100,
+        },
     },
 }
 
+# Cache for badge counters, fragment versions and other shared data. It must
+# be one Redis that every process sees (REDIS_URL): the web workers,
+# run_worker and run_reminders all invalidate entries, and pages read it on
+# every render, so neither a per-process cache nor a database table will do.
+# Without REDIS_URL, DEBUG runs get a per-process memory cache (fine for a
+# single runserver; changes made by a separate run_worker show up when
+# entries expire) and fragment caching is switched off
+REDIS_URL = os.getenv('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        },
+    }
+elif DEBUG:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'skillswap',
+        },
+    }
+else:
+    raise ImproperlyConfigured('Set REDIS_URL: production needs a cache shared by every process')
+
+# Queue notification fan-out as a background job (manage.py run_worker)
+# instead of writing it inside the request
+NOTIFICATIONS_DEFERRED = True
+
+# Resize uploaded profile photos and image attachments (core.images) in a
+# background job instead of inside the upload request
+IMAGE_VARIANTS_DEFERRED = True
+
+# Seconds a cached template fragment (core.fragments) is kept. Changes bump
+# version keys rather than deleting entries, so this only bounds how long
+# superseded entries take up room
+FRAGMENT_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Cache template fragments at all. Only worth it, and only counted
+# correctly, on the shared Redis cache
+FRAGMENT_CACHE_ENABLED = bool(REDIS_URL)
+
+# Minutes before a meeting that manage.py run_reminders notifies its participants
+MEETING_REMINDER_MINUTES = 30
+
 # Middleware
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',  # Must be first
@@ -169,6 +223,25 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Uploads are stored once per distinct content and shared (core.storage)
+STORAGES = {
+    'default': {'BACKEND': 'core.storage.ContentAddressedStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+
+# Let the front server send media files once core.media has checked access:
+# 'x-accel-redirect' (nginx; an internal location at MEDIA_ACCEL_PREFIX
+# aliased to MEDIA_ROOT), 'x-sendfile' (Apache/lighttpd) or None to stream
+# them from Django
+MEDIA_OFFLOAD = os.getenv('MEDIA_OFFLOAD') or None
+MEDIA_ACCEL_PREFIX = '/protected-media/'
+
+# Chunked chat attachment uploads (core.uploads): where unfinished files are
+# kept, the largest attachment, and the bytes of unfinished uploads per user
+CHAT_UPLOAD_DIR = BASE_DIR / 'upload_tmp'
+CHAT_UPLOAD_MAX_BYTES = 50 * 1024 * 1024
+CHAT_UPLOAD_QUOTA_BYTES = 200 * 1024 * 1024
+
 # Security settings for production
 if not DEBUG:
     SECURE_SSL_REDIRECT = True
@@ -187,7 +260,12 @@ SECURE_SSL_REDIRECT = False
 
 
 # Email Configuration
-EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+# Mail is queued as background jobs and sent in batches over one SMTP
+# connection (core/mail.py); the SMTP settings below are used by the worker.
+EMAIL_BACKEND = 'core.mail.QueuedEmailBackend'
+EMAIL_BATCH_SIZE = 50  # messages per SMTP connection
+EMAIL_MAX_PER_MINUTE = 120  # provider sending limit
+EMAIL_TIMEOUT = 30
 EMAIL_HOST = 'da16.domains.co.za'
 EMAIL_PORT = 465
 EMAIL_USE_SSL = True  # Use SSL for port 465